@@ -1,12 +1,20 @@
+import time
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from app.utils.jwt_utils import decode_access_token
 from app.models.user_model import User
+from app.services.auth_cache import auth_cache
 from bson import ObjectId
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/users/login")
 
 async def get_current_user(token: str = Depends(oauth2_scheme)):
+    # Tokens verified recently skip the signature check and the user lookup
+    user = auth_cache.get(token)
+    if user is not None:
+        return user
+
+    started = time.perf_counter()
     payload = decode_access_token(token)
     if payload is None: 
         raise HTTPException(
@@ -23,6 +31,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
             detail="Invalid token",
         )
     
+    generation = auth_cache.generation(user_id)
     user = await User.get(ObjectId(user_id))
     if not user:
         raise HTTPException(
@@ -30,4 +39,5 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
             detail="User not found",
         )
     
-    return user
\ No newline at end of file
+    auth_cache.put(token, user, generation, payload.get("exp"), time.perf_counter() - started)
+    return user
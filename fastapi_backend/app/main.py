@@ -1,32 +1,32 @@
 import os
 from contextlib import asynccontextmanager
-from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
-from beanie import init_beanie
-from app.models.user_model import User
-from app.models.incident_model import Incident
-from app.models.region_model import Region
 from app.routes.user_route import router as user_router
 from app.routes.incident_route import router as incident_router
-from typing import cast
-
-load_dotenv()
-
-MONGODB_URI = os.getenv("MONGODB_URI")
-DB_NAME = os.getenv("DB_NAME")
+from app.routes.metrics_route import router as metrics_router
+from app.routes.tile_route import router as tile_router
+from app.routes.events_route import router as events_router
+from app.services.database import init_database
+from app.services.region_index import region_index
+from app.services.recalc_queue import recalc_queue
+from app.services.image_store import UPLOAD_DIR, UploadStaticFiles
+from app.services.image_pipeline import image_pipeline
+from app.services.password_hasher import password_hasher
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    client = AsyncIOMotorClient(MONGODB_URI)
-    db = client[cast(str, DB_NAME)]
-    await init_beanie(database=db, document_models=[User, Incident, Region])
+    client = await init_database()
+    await region_index.build()
+    recalc_queue.start()
     
     yield  # app is ready
 
-    client.close()
+    await recalc_queue.stop()
+    password_hasher.shutdown()
+    await image_pipeline.stop()
+    await client.close()
 
 # Only one FastAPI instance with lifespan
 app = FastAPI(title="Hackathon Backend", lifespan=lifespan)
@@ -40,11 +40,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-from fastapi.staticfiles import StaticFiles
-
 # Include routers
 app.include_router(user_router, prefix="/api/users", tags=["users"])
+app.include_router(events_router, prefix="/api/events", tags=["events"])
 app.include_router(incident_router, prefix="/api", tags=["incidents"])
+app.include_router(metrics_router, prefix="/api/metrics", tags=["metrics"])
+app.include_router(tile_router, prefix="/api/tiles", tags=["tiles"])
 
-# Mount static files for uploads
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+# Mount static files for uploads (content-addressed ones are served as immutable)
+os.makedirs(UPLOAD_DIR, exist_ok=True)
+app.mount("/uploads", UploadStaticFiles(directory=UPLOAD_DIR), name="uploads")
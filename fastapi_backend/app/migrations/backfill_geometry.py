@@ -0,0 +1,105 @@
+"""
+Backfill the 2dsphere-indexed `geometry` field on existing regions and
+incidents, and the `geometry_hash` that keys the prepared geometry cache on
+existing regions.
+
+Usage:
+    python -m app.migrations.backfill_geometry
+"""
+
+import asyncio
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.models.incident_model import Incident
+from app.models.region_model import Region
+from app.services.database import init_database
+from app.utils.geometry import footprint_geojson, geometry_digest
+
+BATCH_SIZE = 500
+
+
+async def backfill_collection(model) -> dict:
+    """Set `geometry` on every document of the model that doesn't have one yet"""
+    collection = model.get_pymongo_collection()
+    cursor = collection.find(
+        {"geometry": {"$exists": False}}, {"coordinates": 1}
+    )
+
+    updated = 0
+    skipped = 0
+    batch = []
+
+    async for doc in cursor:
+        geometry = footprint_geojson(doc.get("coordinates") or {})
+        if geometry is None:
+            skipped += 1
+            continue
+
+        batch.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"geometry": geometry}}))
+        if len(batch) >= BATCH_SIZE:
+            written, rejected = await write_batch(collection, batch)
+            updated += written
+            skipped += rejected
+            batch = []
+
+    if batch:
+        written, rejected = await write_batch(collection, batch)
+        updated += written
+        skipped += rejected
+
+    return {"updated": updated, "skipped": skipped}
+
+
+async def backfill_geometry_hash() -> int:
+    """Set `geometry_hash` on every region that doesn't have one yet"""
+    collection = Region.get_pymongo_collection()
+    cursor = collection.find({"geometry_hash": {"$exists": False}}, {"coordinates": 1})
+
+    updated = 0
+    batch = []
+    async for doc in cursor:
+        digest = geometry_digest(doc.get("coordinates") or {})
+        batch.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"geometry_hash": digest}}))
+        if len(batch) >= BATCH_SIZE:
+            await collection.bulk_write(batch, ordered=False)
+            updated += len(batch)
+            batch = []
+
+    if batch:
+        await collection.bulk_write(batch, ordered=False)
+        updated += len(batch)
+    return updated
+
+
+async def write_batch(collection, batch) -> tuple:
+    """
+    Apply a batch of updates. Returns (written, rejected); documents the
+    2dsphere index rejects (e.g. edges crossing on the sphere) are rejected.
+    """
+    try:
+        await collection.bulk_write(batch, ordered=False)
+        return len(batch), 0
+    except BulkWriteError as e:
+        errors = e.details.get("writeErrors", [])
+        if not errors:
+            raise
+        return len(batch) - len(errors), len(errors)
+
+
+async def main():
+    client = await init_database()
+    try:
+        for model in (Region, Incident):
+            result = await backfill_collection(model)
+            print(
+                f"{model.get_collection_name()}: {result['updated']} updated, "
+                f"{result['skipped']} skipped (unusable coordinates)"
+            )
+        print(f"regions: {await backfill_geometry_hash()} geometry hashes set")
+    finally:
+        await client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
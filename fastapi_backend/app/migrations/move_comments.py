@@ -0,0 +1,57 @@
+"""
+Move embedded incident and region comments into the `comments` collection.
+
+Each comment is upserted under a stable _id (its ObjectId id, or one derived
+from the parent and the legacy id), then the parent's `comments` array is cut
+down to the latest COMMENT_PREVIEW_SIZE, `comment_count` set from the
+collection and the parent marked as moved. Parents that get a comment before
+this runs are moved then, so it only matters for reading older threads. Safe
+to re-run, and safe to run while the API is serving.
+
+Usage:
+    python -m app.migrations.move_comments
+"""
+
+import asyncio
+
+from app.models.incident_model import Incident
+from app.models.region_model import Region
+from app.services.comments import COMMENTS_MOVED, move_embedded_comments
+from app.services.database import init_database
+
+BATCH_SIZE = 200
+
+
+async def move_comments(model, subject_type: str) -> dict:
+    cursor = model.get_pymongo_collection().find(
+        {COMMENTS_MOVED: {"$ne": True}}, {"comments": 1}
+    )
+
+    parents = 0
+    moved = 0
+    batch = []
+    async for doc in cursor:
+        batch.append(doc)
+        if len(batch) >= BATCH_SIZE:
+            moved += await move_embedded_comments(model, subject_type, batch)
+            parents += len(batch)
+            batch = []
+    if batch:
+        moved += await move_embedded_comments(model, subject_type, batch)
+        parents += len(batch)
+
+    return {"parents": parents, "comments": moved}
+
+
+async def main():
+    client = await init_database()
+    try:
+        for model, subject_type in ((Incident, "incident"), (Region, "region")):
+            result = await move_comments(model, subject_type)
+            print(f"{subject_type}s: {result['parents']} updated, {result['comments']} comments moved")
+    finally:
+        await client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,27 @@
+"""
+Recompute every region's aggregates from its incidents (repair operation).
+
+Incident writes maintain region aggregates incrementally; run this after
+upgrading (to fill the new counter fields) or to repair drift.
+
+Usage:
+    python -m app.migrations.recalculate_region_stats
+"""
+
+import asyncio
+
+from app.models.region_model import Region
+from app.services.database import init_database
+
+
+async def main():
+    client = await init_database()
+    try:
+        count = await Region.recalculate_all_stats()
+        print(f"regions: {count} recalculated")
+    finally:
+        await client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
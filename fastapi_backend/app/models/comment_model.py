@@ -0,0 +1,46 @@
+from beanie import Document
+from pydantic import Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from datetime import datetime
+import os
+
+# How many of the latest comments incidents and regions keep embedded
+COMMENT_PREVIEW_SIZE = int(os.getenv("COMMENT_PREVIEW_SIZE", "3"))
+
+
+class CommentEntry(Document):
+    """
+    A comment on an incident or a region. The full thread lives here;
+    the parent keeps only `comment_count` and the latest few comments.
+    """
+    subject_type: str  # "incident" or "region"
+    subject_id: str
+    user_id: str
+    user_email: str
+    text: str
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "comments"
+        indexes = [
+            # Thread pages, newest first (keyset on created_at, _id)
+            IndexModel(
+                [
+                    ("subject_type", ASCENDING),
+                    ("subject_id", ASCENDING),
+                    ("created_at", DESCENDING),
+                    ("_id", DESCENDING),
+                ],
+                name="subject_type_1_subject_id_1_created_at_-1__id_-1",
+            ),
+        ]
+
+    def preview(self) -> dict:
+        """Embedded form kept on the parent (Comment / RegionComment shape)"""
+        return {
+            "id": str(self.id),
+            "user_id": self.user_id,
+            "user_email": self.user_email,
+            "text": self.text,
+            "created_at": self.created_at,
+        }
@@ -1,8 +1,12 @@
-from beanie import Document
+from beanie import Document, Insert, PydanticObjectId, Replace, Save, before_event
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from pymongo import ASCENDING, DESCENDING, GEOSPHERE, IndexModel, ReturnDocument
+from typing import List, Optional, Tuple
 from datetime import datetime
 from bson import ObjectId
+from app.services.revisions import next_revision
+from app.utils.geometry import footprint_geojson
+from app.utils.incident_weight import apply_incident_weights, incident_weight_stages
 
 
 class GeoJSONCoordinates(BaseModel):
@@ -30,18 +34,28 @@ class Audit(BaseModel):
     multiplier: float = 1.0 # The calculated multiplier for this audit
 
 
+class ImageVariants(BaseModel):
+    """Downscaled copies of an image in `images`"""
+    original: str  # URL as listed in `images`
+    thumb: str
+    medium: str
+
+
 class Incident(Document):
     """Main incident/report model"""
     user_id: str  # User who reported
     user_email: str  # For display purposes
     area_type: str  # "polygon", "point", "circle"
     coordinates: dict  # GeoJSON format
+    geometry: Optional[dict] = None  # Normalized GeoJSON footprint (2dsphere indexed)
     incident_type: str  # "gbv", "unsafe_area", "no_lights", "other"
     description: str
     severity: Optional[str] = "medium"  # "low", "medium", "high", "critical"
     status: str = "pending"  # "pending", "verified", "resolved", "invalid"
     images: Optional[List[str]] = []  # URLs to uploaded images
-    comments: Optional[List[Comment]] = []
+    image_variants: List[ImageVariants] = []  # Added once rendered (see services/image_pipeline.py)
+    comments: Optional[List[Comment]] = []  # Latest few only; the thread is in the comments collection
+    comments_moved: Optional[bool] = None  # Thread is in the comments collection; unset on legacy documents
     verified_by: Optional[str] = None  # Admin/reviewer ID who verified
     resolved_by: Optional[str] = None  # Admin/reviewer ID who resolved
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -75,5 +89,132 @@ class Incident(Document):
     validation_score: float = 0.0
     validation_notes: Optional[str] = None
 
+    revision: int = 0  # Taken from the collection counter on every write, for ETags
+
     class Settings:
         name = "incidents"
+        indexes = [
+            IndexModel([("geometry", GEOSPHERE)], name="geometry_2dsphere"),
+            IndexModel([("region_id", ASCENDING)], name="region_id_1"),
+            # Incidents showing an image, when its variants are recorded
+            IndexModel([("images", ASCENDING)], name="images_1"),
+            # Keyset pagination of GET /incidents, newest first, per filter
+            IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_-1__id_-1"),
+            IndexModel(
+                [("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+                name="status_1_created_at_-1__id_-1",
+            ),
+            IndexModel(
+                [("incident_type", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+                name="incident_type_1_created_at_-1__id_-1",
+            ),
+            IndexModel(
+                [("alert_level", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+                name="alert_level_1_created_at_-1__id_-1",
+            ),
+        ]
+
+    @before_event(Insert, Replace, Save)
+    def sync_geometry(self):
+        """Fill the indexed geometry field from coordinates"""
+        if self.geometry is None:
+            self.geometry = footprint_geojson(self.coordinates)
+
+    @before_event(Insert, Replace, Save)
+    async def bump_revision(self):
+        """Take the next collection revision for this write"""
+        self.revision = await next_revision(type(self))
+
+    @before_event(Insert)
+    def mark_comments_moved(self):
+        """New incidents have no embedded thread to move"""
+        self.comments_moved = True
+
+    @classmethod
+    async def apply_update(
+        cls, incident_id, fields: dict, audit: Optional[Audit] = None
+    ) -> Optional[Tuple["Incident", "Incident"]]:
+        """
+        Set fields (and append an audit) in one atomic update; the weight
+        fields are recomputed server-side in the same pipeline, so
+        concurrent audits never lose updates. Returns the incident before
+        and after the write, or None if it doesn't exist.
+        """
+        now = datetime.utcnow()
+        # $literal: user-supplied strings starting with "$" aren't field paths
+        changes = {name: {"$literal": value} for name, value in fields.items()}
+        changes["updated_at"] = now
+        changes["revision"] = await next_revision(cls)
+        if audit is not None:
+            changes["audits"] = {
+                "$concatArrays": [{"$ifNull": ["$audits", []]}, {"$literal": [audit.model_dump()]}]
+            }
+
+        before = await cls.get_pymongo_collection().find_one_and_update(
+            {"_id": ObjectId(incident_id)},
+            [{"$set": changes}, *incident_weight_stages(now)],
+            return_document=ReturnDocument.BEFORE,
+        )
+        if before is None:
+            return None
+
+        # Replay the same change locally rather than reading the result back
+        before = cls.model_validate(before)
+        after = before.model_copy(deep=True)
+        for name, value in fields.items():
+            setattr(after, name, value)
+        if audit is not None:
+            after.audits.append(audit)
+        after.updated_at = now
+        after.revision = changes["revision"]
+        apply_incident_weights(after, now)
+        return before, after
+
+
+class IncidentSummary(BaseModel):
+    """
+    Read model with only the fields incident responses use.
+    Leaves out the indexed geometry and write-side bookkeeping.
+    """
+    id: PydanticObjectId = Field(alias="_id")
+    user_id: str
+    user_email: str
+    area_type: str
+    coordinates: dict
+    incident_type: str
+    description: str
+    severity: Optional[str] = "medium"
+    status: str = "pending"
+    images: Optional[List[str]] = []
+    image_variants: List[ImageVariants] = []
+    comments: Optional[List[Comment]] = []
+    alert_level: Optional[str] = "normal"
+    region_id: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    initial_weight: float = 1.0
+    effective_multiplier: float = 1.0
+    audits: List[Audit] = []
+    comment_count: int = 0
+    has_sufficient_description: bool = False
+    image_count: int = 0
+    engagement_score: float = 0.0
+    admin_validated: bool = False
+    admin_validated_by: Optional[str] = None
+    ngo_validated: bool = False
+    ngo_validated_by: Optional[str] = None
+    validation_score: float = 0.0
+    validation_notes: Optional[str] = None
+
+
+class IncidentScoring(BaseModel):
+    """Read model with the fields an incident's share of its region's aggregates depends on, and its footprint"""
+    id: PydanticObjectId = Field(alias="_id")
+    user_id: str
+    region_id: Optional[str] = None
+    geometry: Optional[dict] = None
+    severity: Optional[str] = "medium"
+    incident_type: str
+    initial_weight: float = 1.0
+    effective_multiplier: float = 1.0
+    created_at: datetime
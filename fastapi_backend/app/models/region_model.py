@@ -1,8 +1,30 @@
-from beanie import Document
+from beanie import Document, Insert, PydanticObjectId, Replace, Save, before_event
+from bson import ObjectId
 from pydantic import Field, BaseModel
-from typing import Optional, Dict, List
+from pymongo import ASCENDING, GEOSPHERE, IndexModel, UpdateOne
+from typing import Optional, Dict, List, Tuple
 from datetime import datetime
-from shapely.geometry import shape
+from app.utils.geometry import (
+    SIMPLIFY_ZOOMS,
+    build_footprint,
+    footprint_geojson,
+    geometry_digest,
+    overlap_percentage,
+    simplified_variants,
+)
+from app.services.revisions import next_revision
+from app.utils.incident_weight import (
+    DECAY_RATE,
+    MAX_SCORE_CEILING,
+    SECONDS_PER_DAY,
+    calculate_incident_contribution,
+    decay_between,
+    normalize_region_score,
+    region_scores_at,
+)
+
+SEVERITY_SCORES = {"low": 1, "medium": 2, "high": 3, "critical": 4}
+HIGH_SEVERITIES = ("high", "critical")
 
 class RegionComment(BaseModel):
     """Comment on a region"""
@@ -12,6 +34,126 @@ class RegionComment(BaseModel):
     text: str
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
+class RegionShape(BaseModel):
+    """Read model for spatial matching: id, footprint source and its digest"""
+    id: PydanticObjectId = Field(alias="_id")
+    coordinates: dict
+    geometry_hash: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
+class RegionStatsDelta(BaseModel):
+    """
+    Change to a region's aggregate counters caused by incident writes.
+    Take removing(incident) before mutating an incident, then add_incident()
+    after, and apply the difference with Region.apply_stats_delta.
+    contribution_sum is the change in decayed contributions as of reference_time.
+    """
+    incident_count: int = 0
+    severity_score_sum: int = 0
+    high_severity_count: int = 0
+    contribution_sum: float = 0.0
+    incident_types: Dict[str, int] = {}
+    reference_time: datetime = Field(default_factory=datetime.utcnow)
+
+    @classmethod
+    def removing(cls, incident) -> "RegionStatsDelta":
+        delta = cls()
+        delta.add_incident(incident, sign=-1)
+        return delta
+
+    def add_incident(self, incident, sign: int = 1):
+        """Add (sign=1) or remove (sign=-1) one incident's share of the aggregates"""
+        self.incident_count += sign
+        self.severity_score_sum += sign * SEVERITY_SCORES.get(incident.severity, 2)
+        if incident.severity in HIGH_SEVERITIES:
+            self.high_severity_count += sign
+        self.contribution_sum += sign * calculate_incident_contribution(
+            incident, self.reference_time
+        )
+
+        count = self.incident_types.get(incident.incident_type, 0) + sign
+        if count:
+            self.incident_types[incident.incident_type] = count
+        else:
+            self.incident_types.pop(incident.incident_type, None)
+
+    def merge(self, other: "RegionStatsDelta"):
+        self.incident_count += other.incident_count
+        self.severity_score_sum += other.severity_score_sum
+        self.high_severity_count += other.high_severity_count
+        self.contribution_sum += other.contribution_sum * decay_between(
+            other.reference_time, self.reference_time
+        )
+        for incident_type, count in other.incident_types.items():
+            total = self.incident_types.get(incident_type, 0) + count
+            if total:
+                self.incident_types[incident_type] = total
+            else:
+                self.incident_types.pop(incident_type, None)
+
+    def is_empty(self) -> bool:
+        return (
+            not self.incident_count
+            and not self.severity_score_sum
+            and not self.high_severity_count
+            and not self.contribution_sum
+            and not self.incident_types
+        )
+
+
+def merged_histogram(field: str, counts: Dict[str, int]) -> dict:
+    """
+    Pipeline expression adding counts to a stored {key: count} object.
+    Keys are client-supplied (incident types), so they go in as $literal
+    values rather than field paths: "." or "$" in a key can't reshape the
+    document or break the update.
+    """
+    stored = {"$objectToArray": {"$ifNull": [field, {}]}}
+    # Count added to a stored key (keys are $literal, never field paths)
+    added_to_entry = {
+        "$switch": {
+            "branches": [
+                {"case": {"$eq": ["$$entry.k", {"$literal": k}]}, "then": v} for k, v in counts.items()
+            ],
+            "default": 0,
+        }
+    }
+    return {
+        "$let": {
+            "vars": {"stored": stored},
+            "in": {
+                "$arrayToObject": {
+                    "$concatArrays": [
+                        # Stored keys, plus their added counts
+                        {
+                            "$map": {
+                                "input": "$$stored",
+                                "as": "entry",
+                                "in": {
+                                    "k": "$$entry.k",
+                                    "v": {"$add": ["$$entry.v", added_to_entry]},
+                                },
+                            }
+                        },
+                        # Keys not stored yet
+                        *(
+                            {
+                                "$cond": [
+                                    {"$in": [{"$literal": k}, "$$stored.k"]},
+                                    [],
+                                    {"$literal": [{"k": k, "v": v}]},
+                                ]
+                            }
+                            for k, v in counts.items()
+                        ),
+                    ]
+                }
+            },
+        }
+    }
+
+
 class Region(Document):
     """
     Region parent model.
@@ -20,6 +162,9 @@ class Region(Document):
     name: Optional[str] = "Unnamed Region"
     area_type: str # "polygon", "point", "circle"
     coordinates: dict # GeoJSON
+    geometry: Optional[dict] = None # Normalized GeoJSON footprint (2dsphere indexed)
+    geometry_hash: Optional[str] = None # Digest of coordinates, keys the prepared geometry cache
+    simplified: Dict[str, dict] = {} # Coordinates simplified per zoom bucket ("z4", ...), for map views
     
     # Aggregated Stats
     incident_count: int = 0
@@ -27,9 +172,16 @@ class Region(Document):
     average_severity: Optional[str] = None  # "low", "medium", "high", "critical"
     high_severity_count: int = 0  # Count of high/critical incidents
     incident_types: Dict[str, int] = {}  # {"gbv": 2, "unsafe_area": 1}
+    severity_score_sum: int = 0  # Sum of SEVERITY_SCORES, for average_severity
     
     # New Scoring System
     cluster_factor: float = 1.0
+    # Scores decay exponentially, so the sum of decayed incident contributions
+    # is stored once as of score_reference_time and scaled on read
+    # (see current_raw_score). raw/normalized/safety scores are stored as of
+    # score_reference_time too.
+    contribution_sum: float = 0.0
+    score_reference_time: datetime = Field(default_factory=datetime.utcnow)
     raw_score: float = 0.0
     normalized_score: float = 0.0 # 0-100, shown in UI
     
@@ -42,15 +194,88 @@ class Region(Document):
     incident_weightage_percent: float = 30.0
     validation_weightage_percent: float = 70.0
     
-    # Discussion
+    # Discussion: latest few comments; the thread is in the comments collection
     comments: List[RegionComment] = []
+    comment_count: int = 0
+    comments_moved: Optional[bool] = None  # Thread is in the comments collection; unset on legacy documents
     
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    revision: int = 0  # Taken from the collection counter on every write, for ETags
 
     class Settings:
         name = "regions"
+        indexes = [
+            IndexModel([("geometry", GEOSPHERE)], name="geometry_2dsphere"),
+            # Spatial index refresh (regions created recently)
+            IndexModel([("created_at", ASCENDING)], name="created_at_1"),
+        ]
+
+    @before_event(Insert, Replace, Save)
+    def sync_geometry(self):
+        """Fill the indexed geometry field, its digest and the simplified variants from coordinates"""
+        if self.geometry is None:
+            self.geometry = footprint_geojson(self.coordinates)
+        if self.geometry_hash is None:
+            self.geometry_hash = geometry_digest(self.coordinates)
+        if not self.simplified:
+            self.simplified = simplified_variants(self.coordinates)
+
+    @before_event(Insert, Replace, Save)
+    async def bump_revision(self):
+        """Take the next collection revision for this write"""
+        self.revision = await next_revision(type(self))
+
+    @before_event(Insert)
+    def mark_comments_moved(self):
+        """New regions have no embedded thread to move"""
+        self.comments_moved = True
     
+    @classmethod
+    async def find_simplified(cls, query: dict, bucket: str) -> List["Region"]:
+        """
+        Load regions with `coordinates` replaced by their precomputed variant
+        for a zoom bucket. Full coordinates and the other variants are not read.
+        """
+        return [cls.model_validate(doc) for doc in await cls.find_simplified_docs(query, bucket)]
+
+    @classmethod
+    async def find_simplified_docs(
+        cls, query: dict, bucket: str, projection: Optional[dict] = None
+    ) -> List[dict]:
+        """
+        Raw-document version of find_simplified. Regions stored before the
+        variants existed are filled in on first read. projection is an
+        optional inclusion projection; "coordinates" is served from the variant.
+        """
+        if projection is None:
+            projection = {"geometry": 0, "coordinates": 0}
+            projection.update({f"simplified.z{zoom}": 0 for zoom in SIMPLIFY_ZOOMS if f"z{zoom}" != bucket})
+        else:
+            projection = {k: v for k, v in projection.items() if k != "coordinates"}
+            projection[f"simplified.{bucket}"] = 1
+        collection = cls.get_pymongo_collection()
+        docs = await collection.find(query, projection).to_list(None)
+
+        missing = [doc["_id"] for doc in docs if bucket not in (doc.get("simplified") or {})]
+        if missing:
+            filled = {}
+            updates = []
+            for region in await cls.find({"_id": {"$in": missing}}).to_list():
+                region.simplified = simplified_variants(region.coordinates)
+                filled[region.id] = region.simplified
+                updates.append(UpdateOne({"_id": region.id}, {"$set": {"simplified": region.simplified}}))
+            if updates:  # Regions deleted since the find have nothing to fill
+                await collection.bulk_write(updates, ordered=False)
+            for doc in docs:
+                if doc["_id"] in filled:
+                    doc["simplified"] = filled[doc["_id"]]
+            docs = [doc for doc in docs if doc["_id"] in filled or doc["_id"] not in missing]
+
+        for doc in docs:
+            doc["coordinates"] = doc["simplified"][bucket]
+        return docs
+
     @staticmethod
     def calculate_overlap(coords1: dict, coords2: dict) -> float:
         """
@@ -58,84 +283,309 @@ class Region(Document):
         Returns 0-100 indicating overlap percentage.
         """
         try:
-            geom1 = shape(coords1)
-            geom2 = shape(coords2)
-            
-            if not geom1.is_valid or not geom2.is_valid:
-                return 0.0
-            
-            # Handle point geometries with buffer
-            if geom1.geom_type == 'Point':
-                geom1 = geom1.buffer(0.001)  # ~111 meters
-            if geom2.geom_type == 'Point':
-                geom2 = geom2.buffer(0.001)
-            
-            # Check intersection
-            if not geom1.intersects(geom2):
-                return 0.0
-            
-            intersection = geom1.intersection(geom2)
-            smaller_area = min(geom1.area, geom2.area)
-            
-            if smaller_area == 0:
+            geom1 = build_footprint(coords1)
+            geom2 = build_footprint(coords2)
+
+            if geom1 is None or geom2 is None:
                 return 0.0
-            
-            overlap_pct = (intersection.area / smaller_area) * 100
-            return min(overlap_pct, 100.0)
-            
+
+            return overlap_percentage(geom1, geom2)
+
         except Exception as e:
             print(f"Error calculating overlap: {e}")
             return 0.0
-    
+
+    def current_scores(self, now: Optional[datetime] = None) -> Tuple[float, float, float]:
+        """(raw, normalized, safety) scores decayed to now, O(1) from the stored sum"""
+        return region_scores_at(
+            self.cluster_factor,
+            self.contribution_sum,
+            self.score_reference_time,
+            self.incident_count,
+            now or datetime.utcnow(),
+        )
+
+    def current_raw_score(self, now: Optional[datetime] = None) -> float:
+        return self.current_scores(now)[0]
+
+    def current_normalized_score(self, now: Optional[datetime] = None) -> float:
+        return self.current_scores(now)[1]
+
+    def current_safety_score(self, now: Optional[datetime] = None) -> float:
+        return self.current_scores(now)[2]
+
+    @classmethod
+    async def apply_stats_delta(cls, region_id: str, delta: RegionStatsDelta):
+        """
+        Apply incident changes to a region's aggregates in one atomic update.
+        Counters are incremented, the decayed contribution sum is rebased,
+        and the derived fields (average severity, scores) are recomputed
+        server-side from them, so concurrent writes never lose updates.
+        Use recalculate_stats to repair drift.
+        """
+        if delta.is_empty():
+            return
+
+        def incremented(field: str, amount):
+            return {"$add": [{"$ifNull": [f"${field}", 0]}, amount]}
+
+        def decay_to(reference, since):
+            # e^(-lambda * (reference - since) in days), as a pipeline expression
+            days = {"$divide": [{"$subtract": [reference, since]}, SECONDS_PER_DAY * 1000]}
+            return {"$exp": {"$multiply": [-DECAY_RATE, days]}}
+
+        # Rebase the stored sum and the delta onto the later of the two
+        # reference times, so the reference only ever moves forward
+        stored_reference = {"$ifNull": ["$score_reference_time", delta.reference_time]}
+        reference = {"$max": [stored_reference, delta.reference_time]}
+
+        counters = {
+            "incident_count": incremented("incident_count", delta.incident_count),
+            "severity_score_sum": incremented("severity_score_sum", delta.severity_score_sum),
+            "high_severity_count": incremented("high_severity_count", delta.high_severity_count),
+            "contribution_sum": {
+                "$add": [
+                    {
+                        "$multiply": [
+                            {"$ifNull": ["$contribution_sum", 0.0]},
+                            decay_to(reference, stored_reference),
+                        ]
+                    },
+                    {
+                        "$multiply": [
+                            delta.contribution_sum,
+                            decay_to(reference, delta.reference_time),
+                        ]
+                    },
+                ]
+            },
+            "score_reference_time": reference,
+            "updated_at": datetime.utcnow(),
+            "revision": await next_revision(cls),
+        }
+        if delta.incident_types:
+            counters["incident_types"] = merged_histogram("$incident_types", delta.incident_types)
+
+        empty = {"$lte": ["$incident_count", 0]}
+        average = {"$divide": ["$severity_score_sum", "$incident_count"]}
+
+        pipeline = [
+            {"$set": counters},
+            {
+                "$set": {
+                    # Reset float drift once a region is empty again
+                    "incident_count": {"$max": ["$incident_count", 0]},
+                    "severity_score_sum": {"$cond": [empty, 0, "$severity_score_sum"]},
+                    "high_severity_count": {"$cond": [empty, 0, "$high_severity_count"]},
+                    "contribution_sum": {
+                        "$cond": [empty, 0.0, {"$max": ["$contribution_sum", 0.0]}]
+                    },
+                    "incident_types": {
+                        "$arrayToObject": {
+                            "$filter": {
+                                "input": {"$objectToArray": "$incident_types"},
+                                "cond": {"$gt": ["$$this.v", 0]},
+                            }
+                        }
+                    },
+                    "average_severity": {
+                        "$switch": {
+                            "branches": [
+                                {"case": empty, "then": None},
+                                {"case": {"$lte": [average, 1.5]}, "then": "low"},
+                                {"case": {"$lte": [average, 2.5]}, "then": "medium"},
+                                {"case": {"$lte": [average, 3.5]}, "then": "high"},
+                            ],
+                            "default": "critical",
+                        }
+                    },
+                }
+            },
+            {
+                "$set": {
+                    "raw_score": {
+                        "$multiply": [{"$ifNull": ["$cluster_factor", 1.0]}, "$contribution_sum"]
+                    }
+                }
+            },
+            {
+                "$set": {
+                    "normalized_score": {
+                        "$min": [
+                            {"$multiply": [{"$divide": ["$raw_score", MAX_SCORE_CEILING]}, 100.0]},
+                            100.0,
+                        ]
+                    }
+                }
+            },
+            {
+                "$set": {
+                    "safety_score": {
+                        "$max": [0.0, {"$subtract": [10.0, {"$divide": ["$normalized_score", 10.0]}]}]
+                    }
+                }
+            },
+        ]
+
+        await cls.get_pymongo_collection().update_one(
+            {"_id": ObjectId(region_id)}, pipeline
+        )
+
     async def recalculate_stats(self):
         """
-        Recalculate aggregated statistics based on linked incidents.
-        Should be called after adding/updating incidents.
+        Recalculate aggregated statistics from scratch based on linked incidents.
+        Incident writes keep the aggregates current through apply_stats_delta;
+        this is the repair operation. The aggregates are computed server-side,
+        only the grouped result is transferred.
         """
         from app.models.incident_model import Incident
-        from app.utils.incident_weight import calculate_region_score
-        
-        incidents = await Incident.find({"region_id": str(self.id)}).to_list()
-        
-        self.incident_count = len(incidents)
-        
-        if not incidents:
-            self.raw_score = 0.0
-            self.normalized_score = 0.0
-            self.average_severity = None
-            self.high_severity_count = 0
-            self.incident_types = {}
-            self.safety_score = 10.0 # Legacy
-        else:
-            # Calculate severity stats
-            severity_map = {"low": 1, "medium": 2, "high": 3, "critical": 4}
-            severity_scores = [severity_map.get(inc.severity, 2) for inc in incidents]
-            avg_severity_score = sum(severity_scores) / len(severity_scores)
-            
-            if avg_severity_score <= 1.5:
-                self.average_severity = "low"
-            elif avg_severity_score <= 2.5:
-                self.average_severity = "medium"
-            elif avg_severity_score <= 3.5:
-                self.average_severity = "high"
-            else:
-                self.average_severity = "critical"
-            
-            # Count high severity incidents
-            self.high_severity_count = sum(1 for inc in incidents if inc.severity in ["high", "critical"])
-            
-            # Count incident types
-            self.incident_types = {}
-            for inc in incidents:
-                self.incident_types[inc.incident_type] = self.incident_types.get(inc.incident_type, 0) + 1
-            
-            # Calculate new scores
-            self.raw_score, self.normalized_score = calculate_region_score(incidents, self.cluster_factor)
-            
-            # Update legacy safety_score (map normalized score 0-100 to 10-0)
-            # 0 normalized (safe) -> 10 safety score
-            # 100 normalized (unsafe) -> 0 safety score
-            self.safety_score = max(0.0, 10.0 - (self.normalized_score / 10.0))
-        
-        self.updated_at = datetime.utcnow()
+
+        now = datetime.utcnow()
+        pipeline = region_stats_pipeline({"region_id": str(self.id)}, now)
+        cursor = await Incident.get_pymongo_collection().aggregate(pipeline)
+        results = await cursor.to_list(None)
+
+        fields = region_stats_fields(results[0] if results else None, self.cluster_factor, now)
+        for field, value in fields.items():
+            setattr(self, field, value)
         await self.save()
+
+    @classmethod
+    async def recalculate_all_stats(cls) -> int:
+        """
+        Repair every region's aggregates in one pass: a single pipeline
+        grouped by region_id, then one bulk write. Returns the region count.
+        """
+        from app.models.incident_model import Incident
+
+        now = datetime.utcnow()
+        cursor = await Incident.get_pymongo_collection().aggregate(
+            region_stats_pipeline({"region_id": {"$ne": None}}, now)
+        )
+        aggregates = {doc["_id"]: doc async for doc in cursor}
+
+        collection = cls.get_pymongo_collection()
+        regions = await collection.find({}, {"cluster_factor": 1}).to_list(None)
+        revision = await next_revision(cls)
+        operations = [
+            UpdateOne(
+                {"_id": region["_id"]},
+                {
+                    "$set": {
+                        **region_stats_fields(
+                            aggregates.get(str(region["_id"])),
+                            region.get("cluster_factor", 1.0),
+                            now,
+                        ),
+                        "revision": revision,
+                    }
+                },
+            )
+            for region in regions
+        ]
+        for start in range(0, len(operations), 1000):
+            await collection.bulk_write(operations[start:start + 1000], ordered=False)
+        return len(regions)
+
+
+def region_stats_pipeline(match: dict, now: datetime) -> list:
+    """
+    Aggregation over incidents producing, per region_id: incident_count,
+    severity_score_sum, high_severity_count, incident_types and the sum of
+    contributions decayed to `now`.
+    """
+    severity_score = {
+        "$switch": {
+            "branches": [
+                {"case": {"$eq": ["$severity", severity]}, "then": score}
+                for severity, score in SEVERITY_SCORES.items()
+            ],
+            "default": 2,
+        }
+    }
+    age_days = {
+        "$max": [0, {"$divide": [{"$subtract": [now, "$created_at"]}, SECONDS_PER_DAY * 1000]}]
+    }
+    contribution = {
+        "$multiply": [
+            {"$ifNull": ["$initial_weight", 1.0]},
+            {"$ifNull": ["$effective_multiplier", 1.0]},
+            {"$exp": {"$multiply": [-DECAY_RATE, age_days]}},
+        ]
+    }
+
+    return [
+        {"$match": match},
+        {
+            "$group": {
+                "_id": {"region_id": "$region_id", "incident_type": "$incident_type"},
+                "count": {"$sum": 1},
+                "severity_score_sum": {"$sum": severity_score},
+                "high_severity_count": {
+                    "$sum": {"$cond": [{"$in": ["$severity", list(HIGH_SEVERITIES)]}, 1, 0]}
+                },
+                "contribution_sum": {"$sum": contribution},
+            }
+        },
+        {
+            "$group": {
+                "_id": "$_id.region_id",
+                "incident_count": {"$sum": "$count"},
+                "severity_score_sum": {"$sum": "$severity_score_sum"},
+                "high_severity_count": {"$sum": "$high_severity_count"},
+                "contribution_sum": {"$sum": "$contribution_sum"},
+                "incident_types": {
+                    "$push": {"k": {"$toString": "$_id.incident_type"}, "v": "$count"}
+                },
+            }
+        },
+        {"$set": {"incident_types": {"$arrayToObject": "$incident_types"}}},
+    ]
+
+
+def region_stats_fields(aggregate: Optional[dict], cluster_factor: float, now: datetime) -> dict:
+    """Region fields for one region_stats_pipeline result (None if no incidents)"""
+    if not aggregate or not aggregate["incident_count"]:
+        return {
+            "incident_count": 0,
+            "severity_score_sum": 0,
+            "high_severity_count": 0,
+            "incident_types": {},
+            "average_severity": None,
+            "contribution_sum": 0.0,
+            "score_reference_time": now,
+            "raw_score": 0.0,
+            "normalized_score": 0.0,
+            "safety_score": 10.0,  # Legacy
+            "updated_at": now,
+        }
+
+    avg_severity_score = aggregate["severity_score_sum"] / aggregate["incident_count"]
+    if avg_severity_score <= 1.5:
+        average_severity = "low"
+    elif avg_severity_score <= 2.5:
+        average_severity = "medium"
+    elif avg_severity_score <= 3.5:
+        average_severity = "high"
+    else:
+        average_severity = "critical"
+
+    raw_score = cluster_factor * aggregate["contribution_sum"]
+    normalized_score = normalize_region_score(raw_score)
+
+    return {
+        "incident_count": aggregate["incident_count"],
+        "severity_score_sum": aggregate["severity_score_sum"],
+        "high_severity_count": aggregate["high_severity_count"],
+        "incident_types": aggregate["incident_types"],
+        "average_severity": average_severity,
+        "contribution_sum": aggregate["contribution_sum"],
+        "score_reference_time": now,
+        "raw_score": raw_score,
+        "normalized_score": normalized_score,
+        # Update legacy safety_score (map normalized score 0-100 to 10-0)
+        # 0 normalized (safe) -> 10 safety score
+        # 100 normalized (unsafe) -> 0 safety score
+        "safety_score": max(0.0, 10.0 - (normalized_score / 10.0)),
+        "updated_at": now,
+    }
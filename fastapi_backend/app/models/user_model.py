@@ -1,6 +1,8 @@
-from beanie import Document
+from beanie import Delete, Document, Replace, Save, SaveChanges, Update, after_event
 from pydantic import EmailStr
+from pymongo import ASCENDING, IndexModel
 from app.schemas.role_schema import Role
+from app.services.auth_cache import auth_cache
 
 class User(Document):
     email: EmailStr
@@ -14,3 +16,12 @@ class User(Document):
 
     class Settings:
         name = "users"  # MongoDB collection name
+        indexes = [
+            # Login/register lookups. Not unique: existing data may hold duplicates
+            IndexModel([("email", ASCENDING)], name="email_1"),
+        ]
+
+    @after_event(Save, Replace, SaveChanges, Update, Delete)
+    def drop_cached_tokens(self):
+        """Role and credibility are read from cached users; forget them on any write"""
+        auth_cache.invalidate_user(str(self.id))
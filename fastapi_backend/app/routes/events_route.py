@@ -0,0 +1,54 @@
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.services.event_stream import EventFilter, event_stream
+from app.utils.geometry import parse_bbox
+
+
+router = APIRouter()
+
+EVENT_KINDS = ("incident", "region")
+
+
+def parse_list(value: Optional[str]) -> Optional[frozenset]:
+    if not value:
+        return None
+    return frozenset(v.strip() for v in value.split(",") if v.strip())
+
+
+@router.get("/")
+async def stream_changes(
+    request: Request,
+    bbox: Optional[str] = Query(None, description="min_lon,min_lat,max_lon,max_lat"),
+    region_id: Optional[str] = Query(None, description="Comma-separated region ids"),
+    kind: Optional[str] = Query(None, description="incident, region or both (comma-separated)"),
+    last_event_id: Optional[str] = Header(None),
+):
+    """
+    Server-sent events for incident and region writes. Each "change" event
+    carries kind, action, id, region_id and bounds; clients refetch what they
+    show. A "resync" event means events were dropped (slow client or too long
+    offline) and everything in view should be refetched.
+    """
+    bounds = None
+    if bbox:
+        bounds = parse_bbox(bbox)
+        if bounds is None:
+            raise HTTPException(
+                status_code=400, detail="bbox must be min_lon,min_lat,max_lon,max_lat"
+            )
+
+    kinds = parse_list(kind)
+    if kinds and not kinds <= set(EVENT_KINDS):
+        raise HTTPException(status_code=400, detail=f"kind must be one of {', '.join(EVENT_KINDS)}")
+
+    if event_stream.full():
+        raise HTTPException(status_code=503, detail="Too many event stream subscribers")
+
+    event_filter = EventFilter(bbox=bounds, region_ids=parse_list(region_id), kinds=kinds)
+    return StreamingResponse(
+        event_stream.frames(event_filter, last_event_id or None, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
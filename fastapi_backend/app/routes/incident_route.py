@@ -1,196 +1,374 @@
-from fastapi import APIRouter, HTTPException, Depends, File, UploadFile
-from typing import Optional
-from datetime import datetime
+from fastapi import APIRouter, HTTPException, Depends, Header, Request, Response
+from pydantic import ValidationError
+from typing import Awaitable, Callable, Hashable, Iterable, Optional
 from bson import ObjectId
-import shutil
-import os
-import uuid
+from pymongo import DESCENDING
+from pymongo.errors import WriteError
+import orjson
+import time
+from urllib.parse import unquote
 
-from app.models.incident_model import Incident, Comment, Audit
+from app.models.incident_model import Incident, IncidentScoring, Audit
 from app.schemas.incident_schema import (
     IncidentCreate,
     IncidentResponse,
     IncidentUpdate,
     IncidentValidation,
     CommentCreate,
-    CommentResponse,
+    CommentListResponse,
     IncidentListResponse,
-    AuditResponse,
 )
 from app.schemas.region_schema import (
     RegionListResponse,
     RegionResponse,
     RegionCommentCreate,
-    RegionCommentResponse,
 )
-from app.models.region_model import Region, RegionComment
+from app.models.region_model import Region, RegionShape, RegionStatsDelta
+from app.models.comment_model import CommentEntry
 from app.dependencies.auth_dependencies import get_current_user
 from app.models.user_model import User
-from app.utils.incident_weight import calculate_time_decay, calculate_audit_multiplier
+from app.utils.incident_weight import (
+    apply_incident_weights,
+    calculate_audit_multiplier,
+)
+from app.utils.geometry import (
+    bbox_geojson,
+    build_footprint,
+    overlap_percentage,
+    parse_bbox,
+    to_geojson,
+    zoom_bucket,
+)
+from app.utils.pagination import after_cursor, decode_cursor, encode_cursor
+from app.utils.etag import decay_bucket, etag_matches, make_etag, not_modified
+from app.utils.serializers import (
+    INCIDENT_EMBEDS,
+    INCIDENT_FIELDS,
+    INCIDENT_PROJECTION,
+    REGION_EMBEDS,
+    REGION_EXCLUDED_FIELDS,
+    REGION_FIELDS,
+    comment_payload,
+    fieldset_projection,
+    incident_payload,
+    json_response,
+    parse_fieldset,
+    region_payload,
+)
+from app.services.region_index import region_index
+from app.services.geometry_cache import region_geometry_cache
+from app.services.bulk_import import import_incident_batch
+from app.services.recalc_queue import recalc_queue
+from app.services.change_events import change_hub
+from app.services.response_cache import CachedResponse, response_cache
+from app.services.image_store import (
+    MAX_UPLOAD_BYTES,
+    UnsupportedImageType,
+    UploadTooLarge,
+    store_image,
+    upload_chunks,
+)
+from app.services.image_pipeline import image_pipeline
+from app.services.comments import comment_page, post_comment
+from app.services.revisions import collection_revision, document_revision, next_revision
 
 
 router = APIRouter(prefix="/incidents", tags=["incidents"])
 
 
+BULK_BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 1000
+MAX_NDJSON_LINE_BYTES = 1024 * 1024
+
+CANT_EXTRACT_GEO_KEYS = 16755  # MongoDB error code for geometry a 2dsphere index rejects
+
+MAX_PAGE_SIZE = 500
+COUNT_MODES = ("estimated", "exact", "none")
+COUNT_ESTIMATE_LIMIT = 10000  # Filtered estimates stop counting here
+
+MAX_ZOOM = 24
+
+MAX_COMMENT_PAGE_SIZE = 100
+
+
 # ===== HELPER FUNCTIONS =====
 
 
-async def update_incident_weights(incident: Incident):
+async def iter_ndjson_lines(stream, max_line_bytes: int = MAX_NDJSON_LINE_BYTES):
     """
-    Recalculate and update incident weights.
-    Should be called after any interaction (audit, update).
+    Yield (line_number, line) for each non-blank line of a streamed NDJSON body.
+    Lines longer than max_line_bytes are not buffered; they are yielded as
+    (line_number, None).
     """
-    # 1. Initial Weight (simplified logic for now, can be expanded)
-    # Base weight 1.0, boosted by severity
-    severity_map = {"low": 1.0, "medium": 1.5, "high": 2.5, "critical": 4.0}
-    incident.initial_weight = severity_map.get(incident.severity, 1.0)
-
-    # 2. Effective Multiplier from Audits
-    if not incident.audits:
-        incident.effective_multiplier = 1.0
-    else:
-        # Average of multipliers
-        incident.effective_multiplier = sum(
-            a.multiplier for a in incident.audits
-        ) / len(incident.audits)
-
-    # 3. Time Decay
-    incident.time_decay_factor = calculate_time_decay(incident.created_at)
-
-    # 4. Final Contribution
-    incident.contribution_score = (
-        incident.initial_weight
-        * incident.effective_multiplier
-        * incident.time_decay_factor
-    )
+    buffer = bytearray()
+    oversized = False
+    line_no = 0
+    async for chunk in stream:
+        # Only the new chunk is searched, so long lines stay linear
+        start = 0
+        while (end := chunk.find(b"\n", start)) >= 0:
+            line_no += 1
+            if oversized or len(buffer) + end - start > max_line_bytes:
+                yield line_no, None
+            else:
+                buffer += chunk[start:end]
+                if buffer.strip():
+                    yield line_no, bytes(buffer)
+            buffer.clear()
+            oversized = False
+            start = end + 1
+
+        if not oversized:
+            buffer += chunk[start:]
+            if len(buffer) > max_line_bytes:
+                buffer.clear()
+                oversized = True
+
+    if oversized:
+        yield line_no + 1, None
+    elif buffer.strip():
+        yield line_no + 1, bytes(buffer)
+
+
+async def insert_spatial(document):
+    """Insert a region or incident; coordinates the 2dsphere index rejects are a 422"""
+    try:
+        await document.insert()
+    except WriteError as e:
+        if e.code != CANT_EXTRACT_GEO_KEYS:
+            raise
+        raise HTTPException(status_code=422, detail="Coordinates rejected by the spatial index")
 
-    incident.updated_at = datetime.utcnow()
 
-    await incident.save()
+async def incident_written(
+    before: Optional[Incident], after: Incident, action: str = "updated"
+):
+    """
+    Publish an incident write and queue the change to its region's
+    aggregates (before is None for a new incident).
+    """
+    change_hub.incident_changed(after, action)
 
-    # Trigger region recalculation
-    if incident.region_id:
-        try:
-            region = await Region.get(ObjectId(incident.region_id))
-            if region:
-                await region.recalculate_stats()
-                await region.save()
-        except Exception as e:
-            print(f"Error recalculating region stats: {e}")
-
-
-def build_incident_response(incident: Incident) -> IncidentResponse:
-    """Helper to build IncidentResponse from Incident model"""
-    return IncidentResponse(
-        id=str(incident.id),
-        user_id=incident.user_id,
-        user_email=incident.user_email,
-        area_type=incident.area_type,
-        coordinates=incident.coordinates,
-        incident_type=incident.incident_type,
-        description=incident.description,
-        severity=incident.severity,
-        status=incident.status,
-        images=incident.images or [],
-        comments=(
-            [CommentResponse(**c.dict()) for c in incident.comments]
-            if incident.comments
-            else []
-        ),
-        alert_level=incident.alert_level,
-        region_id=incident.region_id,
-        created_at=incident.created_at,
-        updated_at=incident.updated_at,
-        # New fields
-        initial_weight=getattr(incident, "initial_weight", 1.0),
-        effective_multiplier=getattr(incident, "effective_multiplier", 1.0),
-        time_decay_factor=getattr(incident, "time_decay_factor", 1.0),
-        contribution_score=getattr(incident, "contribution_score", 0.0),
-        audits=[
-            AuditResponse(
-                auditor_id=a.auditor_id,
-                auditor_email=a.auditor_email,
-                s_env=a.s_env,
-                notes=a.notes,
-                created_at=a.created_at,
-                multiplier=a.multiplier
-            )
-            for a in getattr(incident, "audits", [])
-        ],
-        # Legacy fields mapping
-        comment_count=getattr(incident, "comment_count", 0),
-        has_sufficient_description=getattr(incident, "has_sufficient_description", False),
-        image_count=getattr(incident, "image_count", 0),
-        engagement_score=getattr(incident, "engagement_score", 0.0),
-        base_weight=getattr(incident, "initial_weight", 1.0),  # Map to initial_weight
-        final_weight=getattr(incident, "contribution_score", 1.0),  # Map to contribution_score
-        admin_validated=getattr(incident, "admin_validated", False),
-        admin_validated_by=getattr(incident, "admin_validated_by", None),
-        ngo_validated=getattr(incident, "ngo_validated", False),
-        ngo_validated_by=getattr(incident, "ngo_validated_by", None),
-        validation_score=getattr(incident, "validation_score", 0.0),
-        validation_notes=getattr(incident, "validation_notes", None),
-    )
+    if after.region_id:
+        stats_delta = RegionStatsDelta.removing(before) if before else RegionStatsDelta()
+        stats_delta.add_incident(after)
+        await apply_region_stats_delta(after.region_id, stats_delta)
 
 
-def build_region_response(region: Region) -> RegionResponse:
-    """Helper to build RegionResponse from Region model"""
-    return RegionResponse(
-        id=str(region.id),
-        name=region.name,
-        area_type=region.area_type,
-        coordinates=region.coordinates,
-        incident_count=region.incident_count,
-        safety_score=region.safety_score,
-        average_severity=region.average_severity,
-        high_severity_count=region.high_severity_count,
-        incident_types=region.incident_types,
-        comments=(
-            [RegionCommentResponse(**c.dict()) for c in region.comments]
-            if region.comments
-            else []
-        ),
-        created_at=region.created_at,
-        updated_at=region.updated_at,
-        incident_weighted_score=region.incident_weighted_score,
-        validation_weighted_score=region.validation_weighted_score,
-        total_incident_weight=region.total_incident_weight,
-        total_validation_weight=region.total_validation_weight,
-        validated_incident_count=region.validated_incident_count,
-        incident_weightage_percent=region.incident_weightage_percent,
-        validation_weightage_percent=region.validation_weightage_percent,
-    )
+async def apply_region_stats_delta(region_id: str, stats_delta: RegionStatsDelta):
+    """Queue a region aggregate update; applied in the background"""
+    try:
+        await recalc_queue.submit(region_id, stats_delta)
+    except Exception as e:
+        print(f"Error updating region stats: {e}")
+
+
+async def cached_json(
+    key: Hashable,
+    tags: Iterable[str],
+    etag: str,
+    load: Callable[[], Awaitable[object]],
+    if_none_match: Optional[str],
+):
+    """
+    Serve a read endpoint through the response cache.
+    etag is the caller's cheap revision ETag: a matching If-None-Match is
+    answered with 304 before the cache is consulted. load returns the
+    payload and only runs on a miss; concurrent misses for the same key
+    share one call.
+    """
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    async def load_encoded() -> CachedResponse:
+        return CachedResponse(orjson.dumps(await load()), etag)
+
+    # The ETag is part of the key, so a body is never served under a newer ETag
+    cached = await response_cache.get_or_load((key, etag), tags, load_encoded)
+    return json_response(cached.body, cached.etag)
+
+
+async def comment_thread(
+    model, subject_type: str, subject_id: str, limit: int, cursor: Optional[str], if_none_match: Optional[str]
+):
+    """Paginated comments of an incident or region, newest first"""
+    limit = max(1, min(limit, MAX_COMMENT_PAGE_SIZE))
+    position = None
+    if cursor:
+        position = decode_cursor(cursor)
+        if position is None:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    subject_oid = ObjectId(subject_id)
+    revision = await document_revision(model, subject_oid)
+    if revision is None:
+        raise HTTPException(status_code=404, detail=f"{subject_type.capitalize()} not found")
+
+    # Every comment posted moves the parent's revision
+    etag = make_etag(f"{subject_type}-comments", subject_id, revision)
+
+    async def load():
+        parent = await model.get_pymongo_collection().find_one(
+            {"_id": subject_oid}, {"comment_count": 1}
+        )
+        if not parent:
+            raise HTTPException(status_code=404, detail=f"{subject_type.capitalize()} not found")
+
+        comments, next_cursor = await comment_page(subject_type, subject_id, limit, position)
+        return {
+            "comments": [comment_payload(doc) for doc in comments],
+            "total": parent.get("comment_count", 0),
+            "next_cursor": next_cursor,
+        }
+
+    key = (f"{subject_type}-comments", subject_id, limit, cursor)
+    return await cached_json(key, [f"{subject_type}:{subject_id}"], etag, load, if_none_match)
+
+
+async def find_overlapping_region(coordinates: dict) -> Optional[RegionShape]:
+    """
+    Find the oldest region overlapping the given coordinates by more than 50%.
+    The spatial index narrows the search to bounding-box candidates and only
+    the candidates MongoDB reports as intersecting are loaded and tested.
+    """
+    geom = build_footprint(coordinates)
+    if geom is None:
+        return None
+
+    await region_index.refresh()
+    candidate_ids = region_index.query(geom)
+    if not candidate_ids:
+        return None
+
+    candidates = await Region.find(
+        {
+            "_id": {"$in": [ObjectId(region_id) for region_id in candidate_ids]},
+            "geometry": {"$geoIntersects": {"$geometry": to_geojson(geom)}},
+        }
+    ).project(RegionShape).to_list()
+    candidates.sort(key=lambda r: r.id)
+
+    for candidate in candidates:
+        region_geom = region_geometry_cache.get(candidate)
+        if region_geom is not None and overlap_percentage(region_geom, geom) > 50:
+            return candidate
+
+    return None
+
+
+def written_incident_response(incident: Incident) -> Response:
+    """Response for an incident just written, serialized like the read endpoints"""
+    return json_response(incident_payload(incident.model_dump(by_alias=True)))
 
 
 # ===== ENDPOINTS =====
 
 
 @router.post("/upload")
-async def upload_image(
-    file: UploadFile = File(...), current_user: User = Depends(get_current_user)
-):
-    """Upload an image file"""
+async def upload_image(request: Request, current_user: User = Depends(get_current_user)):
+    """
+    Upload an image, either as the raw request body (Content-Type image/*,
+    optional X-Filename header) or as a multipart "file" field. Returns its content-addressed URL;
+    uploading the same image again returns the same URL.
+    """
     # Verify user is authenticated (current_user dependency ensures this)
     _ = current_user  # Mark as used
 
+    # Auth has run but the body hasn't been read yet: reject oversized uploads up front
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"Image exceeds {MAX_UPLOAD_BYTES} bytes")
+
+    content_type = request.headers.get("content-type", "")
     try:
-        # Create uploads directory if it doesn't exist
-        UPLOAD_DIR = "uploads"
-        os.makedirs(UPLOAD_DIR, exist_ok=True)
+        if content_type.startswith("multipart/form-data"):
+            async with request.form(max_files=1) as form:
+                file = form.get("file")
+                if file is None or isinstance(file, str):
+                    raise HTTPException(status_code=400, detail="Missing file field")
+                stored = await store_image(upload_chunks(file), file.content_type, file.filename)
+        else:
+            filename = unquote(request.headers.get("x-filename", ""))
+            stored = await store_image(request.stream(), content_type, filename)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except UnsupportedImageType as e:
+        raise HTTPException(status_code=415, detail=str(e))
+
+    # Thumbnail and medium variants are rendered in the background
+    image_pipeline.submit(stored)
+
+    # Return URL (relative path that will be served by static mount)
+    return {"url": stored.url, "sha256": stored.sha256, "size": stored.size}
+
+
+@router.post("/bulk")
+async def bulk_import_incidents(
+    request: Request, current_user: User = Depends(get_current_user)
+):
+    """
+    Bulk import incidents from an NDJSON request body (one IncidentCreate per line).
+    Lines are processed in batches as the body streams in; each batch gets
+    vectorized region assignment, one insert_many and one aggregate update per
+    affected region.
+    """
+    if current_user.role not in ["ngo", "admin"]:
+        raise HTTPException(
+            status_code=403, detail="Not authorized to bulk import incidents"
+        )
 
-        # Generate unique filename
-        file_extension = os.path.splitext(file.filename)[1]
-        filename = f"{uuid.uuid4()}{file_extension}"
-        file_path = os.path.join(UPLOAD_DIR, filename)
+    started = time.perf_counter()
+    received = 0
+    inserted = 0
+    regions_created = 0
+    regions_updated = 0
+    failed = 0
+    errors = []  # Details of the first MAX_REPORTED_ERRORS failures
+    batch = []
+
+    def add_errors(new_errors):
+        nonlocal failed
+        failed += len(new_errors)
+        errors.extend(new_errors[: MAX_REPORTED_ERRORS - len(errors)])
+
+    async def flush():
+        nonlocal inserted, regions_created, regions_updated
+        result = await import_incident_batch(batch, current_user)
+        inserted += result["inserted"]
+        regions_created += result["regions_created"]
+        regions_updated += result["regions_updated"]
+        add_errors(result["errors"])
+        batch.clear()
+
+    async for line_no, line in iter_ndjson_lines(request.stream()):
+        received += 1
+        if line is None:
+            add_errors([{"line": line_no, "error": f"Line exceeds {MAX_NDJSON_LINE_BYTES} bytes"}])
+            continue
+        try:
+            batch.append((line_no, IncidentCreate.model_validate_json(line)))
+        except ValidationError as e:
+            add_errors([{"line": line_no, "error": str(e)}])
 
-        # Save file
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        if len(batch) >= BULK_BATCH_SIZE:
+            await flush()
 
-        # Return URL (relative path that will be served by static mount)
-        return {"url": f"/uploads/{filename}"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    if batch:
+        await flush()
+
+    elapsed = time.perf_counter() - started
+    errors.sort(key=lambda e: e["line"])
+
+    return {
+        "received": received,
+        "inserted": inserted,
+        "failed": failed,
+        "regions_created": regions_created,
+        "regions_updated": regions_updated,
+        "errors": errors,
+        "elapsed_seconds": round(elapsed, 3),
+        "incidents_per_second": round(inserted / elapsed, 1) if elapsed > 0 else None,
+    }
 
 
 @router.post("/", response_model=IncidentResponse)
@@ -206,22 +384,16 @@ async def create_incident(
     # Check if user provided region_id
     if incident_data.region_id:
         try:
-            region = await Region.get(ObjectId(incident_data.region_id))
+            region = await Region.find_one(
+                {"_id": ObjectId(incident_data.region_id)}
+            ).project(RegionShape)
         except:
             raise HTTPException(status_code=404, detail="Region not found")
+        if not region:
+            raise HTTPException(status_code=404, detail="Region not found")
     else:
         # Find overlapping region (>50% overlap threshold)
-        all_regions = await Region.find().to_list()
-
-        for existing_region in all_regions:
-            overlap = Region.calculate_overlap(
-                incident_data.coordinates, existing_region.coordinates
-            )
-
-            # If significant overlap (>50%), use this region
-            if overlap > 50:
-                region = existing_region
-                break
+        region = await find_overlapping_region(incident_data.coordinates)
 
         # No overlapping region found, create new one
         if not region:
@@ -230,7 +402,9 @@ async def create_incident(
                 area_type=incident_data.area_type,
                 coordinates=incident_data.coordinates,
             )
-            await region.insert()
+            await insert_spatial(region)
+            region_index.add(region)
+            change_hub.region_changed(str(region.id), "created", region.geometry)
 
     # Create incident linked to region
     incident = Incident(
@@ -244,13 +418,15 @@ async def create_incident(
         images=incident_data.images or [],
         region_id=str(region.id),
     )
+    incident.image_variants = await image_pipeline.ready_variants(incident.images)
 
-    await incident.insert()
-
-    # Calculate initial weights and engagement metrics
-    await update_incident_weights(incident)
+    # Initial weights go in with the insert
+    apply_incident_weights(incident)
+    await insert_spatial(incident)
+    await image_pipeline.record_late_variants([incident])
+    await incident_written(None, incident, action="created")
 
-    return build_incident_response(incident)
+    return written_incident_response(incident)
 
 
 @router.get("/", response_model=IncidentListResponse)
@@ -259,8 +435,30 @@ async def get_incidents(
     incident_type: Optional[str] = None,
     alert_level: Optional[str] = None,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    count: str = "estimated",
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
 ):
-    """Get all incidents with optional filters"""
+    """
+    Get incidents with optional filters, newest first.
+    Pass `next_cursor` back as `cursor` to get the next page.
+    `count` is "estimated" (default), "exact" or "none"; the total is
+    only computed for the first page.
+    `fields` (comma-separated response fields) and `include` (any of
+    "comments,audits") trim each incident; by default all are returned.
+    """
+    fieldset = parse_incident_fieldset(fields, include)
+    projection = INCIDENT_PROJECTION
+    if fieldset is not None:
+        # created_at and _id back the page cursor
+        projection = {**fieldset_projection(INCIDENT_FIELDS, fieldset), "created_at": 1}
+
+    if count not in COUNT_MODES:
+        raise HTTPException(status_code=400, detail=f"count must be one of {', '.join(COUNT_MODES)}")
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
     query = {}
 
     if status:
@@ -270,33 +468,154 @@ async def get_incidents(
     if alert_level:
         query["alert_level"] = alert_level
 
-    incidents = await Incident.find(query).limit(limit).to_list()
-    total = await Incident.find(query).count()
+    page_query = query
+    if cursor:
+        position = decode_cursor(cursor)
+        if position is None:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        page_query = {**query, **after_cursor(*position)}
+
+    bucket, now = decay_bucket()
+    etag = make_etag("incidents", await collection_revision(Incident), bucket)
+
+    async def load():
+        # One extra row tells whether there is a next page
+        incidents = (
+            await Incident.get_pymongo_collection()
+            .find(page_query, projection)
+            .sort([("created_at", DESCENDING), ("_id", DESCENDING)])
+            .limit(limit + 1)
+            .to_list(None)
+        )
+
+        next_cursor = None
+        if len(incidents) > limit:
+            incidents = incidents[:limit]
+            last = incidents[-1]
+            next_cursor = encode_cursor(last["created_at"], last["_id"])
+
+        total = None
+        total_is_estimate = False
+        if not cursor and count != "none":
+            total, total_is_estimate = await count_incidents(query, exact=count == "exact")
 
-    incident_responses = [build_incident_response(inc) for inc in incidents]
+        return {
+            "incidents": [incident_payload(doc, now, fieldset) for doc in incidents],
+            "total": total,
+            "total_is_estimate": total_is_estimate,
+            "next_cursor": next_cursor,
+        }
 
-    return IncidentListResponse(incidents=incident_responses, total=total)
+    key = ("incidents", status, incident_type, alert_level, limit, cursor, count, fieldset, bucket)
+    return await cached_json(key, ["incidents"], etag, load, if_none_match)
+
+
+async def count_incidents(query: dict, exact: bool):
+    """
+    Count incidents matching a filter. Returns (total, is_estimate).
+    Estimates use collection metadata when unfiltered and stop counting
+    at COUNT_ESTIMATE_LIMIT otherwise.
+    """
+    collection = Incident.get_pymongo_collection()
+    if exact:
+        return await collection.count_documents(query), False
+    if not query:
+        return await collection.estimated_document_count(), True
+
+    total = await collection.count_documents(query, limit=COUNT_ESTIMATE_LIMIT)
+    return total, total >= COUNT_ESTIMATE_LIMIT
+
+
+def parse_incident_fieldset(fields: Optional[str], include: Optional[str]):
+    try:
+        return parse_fieldset(fields, include, INCIDENT_FIELDS, INCIDENT_EMBEDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 # ===== REGION ENDPOINTS (must be before /{incident_id} to avoid path conflicts) =====
 
 
 @router.get("/regions", response_model=RegionListResponse)
-async def get_regions():
-    """Get all regions with aggregated statistics for map display"""
-    regions = await Region.find().to_list()
-    region_responses = [build_region_response(region) for region in regions]
-    return RegionListResponse(regions=region_responses, total=len(region_responses))
+async def get_regions(
+    bbox: Optional[str] = None,
+    zoom: Optional[int] = None,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    Get regions with aggregated statistics for map display.
+    `bbox` ("min_lon,min_lat,max_lon,max_lat") returns only regions
+    intersecting the viewport; `zoom` returns coordinates simplified for
+    that map zoom level. `fields` and `include` ("comments") trim each
+    region; by default all fields are returned.
+    """
+    try:
+        fieldset = parse_fieldset(fields, include, REGION_FIELDS, REGION_EMBEDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    query = {}
+
+    if bbox:
+        bounds = parse_bbox(bbox)
+        if bounds is None:
+            raise HTTPException(
+                status_code=400, detail="bbox must be min_lon,min_lat,max_lon,max_lat"
+            )
+        query["geometry"] = {"$geoIntersects": {"$geometry": bbox_geojson(*bounds)}}
+
+    if zoom is not None and not 0 <= zoom <= MAX_ZOOM:
+        raise HTTPException(status_code=400, detail=f"zoom must be between 0 and {MAX_ZOOM}")
+
+    simplified = zoom_bucket(zoom) if zoom is not None else None
+    bucket, now = decay_bucket()
+    etag = make_etag("regions", await collection_revision(Region), bucket)
+
+    async def load():
+        projection = None if fieldset is None else fieldset_projection(REGION_FIELDS, fieldset)
+        if simplified and (fieldset is None or "coordinates" in fieldset):
+            regions = await Region.find_simplified_docs(query, simplified, projection)
+        else:
+            regions = await Region.get_pymongo_collection().find(
+                query, projection or REGION_EXCLUDED_FIELDS
+            ).to_list(None)
+
+        return {
+            "regions": [region_payload(doc, now, fieldset) for doc in regions],
+            "total": len(regions),
+        }
+
+    key = ("regions", bbox, simplified, fieldset, bucket)
+    return await cached_json(key, ["regions"], etag, load, if_none_match)
 
 
 @router.get("/regions/{region_id}", response_model=RegionResponse)
-async def get_region(region_id: str):
+async def get_region(
+    region_id: str,
+    if_none_match: Optional[str] = Header(None),
+):
     """Get a specific region by ID"""
     try:
-        region = await Region.get(ObjectId(region_id))
-        if not region:
+        region_oid = ObjectId(region_id)
+        revision = await document_revision(Region, region_oid)
+        if revision is None:
             raise HTTPException(status_code=404, detail="Region not found")
-        return build_region_response(region)
+
+        bucket, now = decay_bucket()
+        etag = make_etag("region", region_id, revision, bucket)
+
+        async def load():
+            region = await Region.get_pymongo_collection().find_one(
+                {"_id": region_oid}, REGION_EXCLUDED_FIELDS
+            )
+            if not region:
+                raise HTTPException(status_code=404, detail="Region not found")
+            return region_payload(region, now)
+
+        key = ("region", region_id, bucket)
+        return await cached_json(key, [f"region:{region_id}"], etag, load, if_none_match)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -309,55 +628,110 @@ async def add_region_comment(
 ):
     """Add a comment/discussion to a region"""
     try:
-        region = await Region.get(ObjectId(region_id))
+        region = await post_comment(
+            Region,
+            "region",
+            region_id,
+            str(current_user.id),
+            current_user.email,
+            comment_data.text,
+            projection=REGION_EXCLUDED_FIELDS,
+        )
         if not region:
             raise HTTPException(status_code=404, detail="Region not found")
 
-        comment = RegionComment(
-            user_id=str(current_user.id),
-            user_email=current_user.email,
-            text=comment_data.text,
-        )
-
-        if not region.comments:
-            region.comments = []
+        change_hub.region_changed(region_id)
 
-        region.comments.append(comment)
-        region.updated_at = datetime.utcnow()
+        return json_response(region_payload(region))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        await region.save()
 
-        return build_region_response(region)
+@router.get("/regions/{region_id}/comments", response_model=CommentListResponse)
+async def get_region_comments(
+    region_id: str,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    Get a region's comments, newest first.
+    Pass `next_cursor` back as `cursor` to get older ones.
+    """
+    try:
+        return await comment_thread(Region, "region", region_id, limit, cursor, if_none_match)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/regions/{region_id}/incidents", response_model=IncidentListResponse)
-async def get_region_incidents(region_id: str):
-    """Get all incidents for a specific region"""
+async def get_region_incidents(
+    region_id: str,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    Get all incidents for a specific region.
+    `fields` and `include` work as on the incident list.
+    """
+    fieldset = parse_incident_fieldset(fields, include)
+    projection = INCIDENT_PROJECTION
+    if fieldset is not None:
+        projection = fieldset_projection(INCIDENT_FIELDS, fieldset)
+
     try:
-        region = await Region.get(ObjectId(region_id))
-        if not region:
+        region_oid = ObjectId(region_id)
+        if not await Region.find({"_id": region_oid}).count():
             raise HTTPException(status_code=404, detail="Region not found")
 
-        incidents = await Incident.find({"region_id": region_id}).to_list()
-        incident_responses = [build_incident_response(inc) for inc in incidents]
+        # Any incident write may add, change or remove one of the region's incidents
+        bucket, now = decay_bucket()
+        etag = make_etag("region-incidents", region_id, await collection_revision(Incident), bucket)
 
-        return IncidentListResponse(
-            incidents=incident_responses, total=len(incident_responses)
-        )
+        async def load():
+            incidents = await Incident.get_pymongo_collection().find(
+                {"region_id": region_id}, projection
+            ).to_list(None)
+
+            return {
+                "incidents": [incident_payload(doc, now, fieldset) for doc in incidents],
+                "total": len(incidents),
+                "total_is_estimate": False,
+                "next_cursor": None,
+            }
+
+        key = ("region-incidents", region_id, fieldset, bucket)
+        return await cached_json(key, [f"region-incidents:{region_id}"], etag, load, if_none_match)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/{incident_id}", response_model=IncidentResponse)
-async def get_incident(incident_id: str):
+async def get_incident(
+    incident_id: str,
+    if_none_match: Optional[str] = Header(None),
+):
     """Get a specific incident by ID"""
     try:
-        incident = await Incident.get(ObjectId(incident_id))
-        if not incident:
+        incident_oid = ObjectId(incident_id)
+        revision = await document_revision(Incident, incident_oid)
+        if revision is None:
             raise HTTPException(status_code=404, detail="Incident not found")
-        return build_incident_response(incident)
+
+        bucket, now = decay_bucket()
+        etag = make_etag("incident", incident_id, revision, bucket)
+
+        async def load():
+            incident = await Incident.get_pymongo_collection().find_one(
+                {"_id": incident_oid}, INCIDENT_PROJECTION
+            )
+            if not incident:
+                raise HTTPException(status_code=404, detail="Incident not found")
+            return incident_payload(incident, now)
+
+        key = ("incident", incident_id, bucket)
+        return await cached_json(key, [f"incident:{incident_id}"], etag, load, if_none_match)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -376,32 +750,29 @@ async def update_incident(
         )
 
     try:
-        incident = await Incident.get(ObjectId(incident_id))
-        if not incident:
-            raise HTTPException(status_code=404, detail="Incident not found")
+        fields = {}
 
-        # Update fields
         if update_data.status:
-            incident.status = update_data.status
+            fields["status"] = update_data.status
             if update_data.status == "verified":
-                incident.verified_by = str(current_user.id)
+                fields["verified_by"] = str(current_user.id)
             elif update_data.status == "resolved":
-                incident.resolved_by = str(current_user.id)
+                fields["resolved_by"] = str(current_user.id)
 
         if update_data.severity:
-            incident.severity = update_data.severity
+            fields["severity"] = update_data.severity
 
         if update_data.alert_level:
-            incident.alert_level = update_data.alert_level
+            fields["alert_level"] = update_data.alert_level
 
-        incident.updated_at = datetime.utcnow()
-        await incident.save()
+        # Weights are recomputed in the same write; a severity change moves them
+        written = await Incident.apply_update(incident_id, fields)
+        if not written:
+            raise HTTPException(status_code=404, detail="Incident not found")
 
-        # Recalculate weights if severity changed
-        if update_data.severity:
-            await update_incident_weights(incident)
+        await incident_written(*written)
 
-        return build_incident_response(incident)
+        return written_incident_response(written[1])
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -414,28 +785,39 @@ async def add_comment(
 ):
     """Add a comment to an incident"""
     try:
-        incident = await Incident.get(ObjectId(incident_id))
+        # Comments don't enter the weights, so the region aggregates are unaffected
+        incident = await post_comment(
+            Incident,
+            "incident",
+            incident_id,
+            str(current_user.id),
+            current_user.email,
+            comment_data.text,
+            projection={**INCIDENT_PROJECTION, "geometry": 1},
+        )
         if not incident:
             raise HTTPException(status_code=404, detail="Incident not found")
 
-        comment = Comment(
-            user_id=str(current_user.id),
-            user_email=current_user.email,
-            text=comment_data.text,
-        )
-
-        if not incident.comments:
-            incident.comments = []
-
-        incident.comments.append(comment)
-        incident.updated_at = datetime.utcnow()
+        change_hub.incident_changed(IncidentScoring.model_validate(incident))
 
-        await incident.save()
+        return json_response(incident_payload(incident))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        # Recalculate weights as comment count changed
-        await update_incident_weights(incident)
 
-        return build_incident_response(incident)
+@router.get("/{incident_id}/comments", response_model=CommentListResponse)
+async def get_comments(
+    incident_id: str,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    Get an incident's comments, newest first.
+    Pass `next_cursor` back as `cursor` to get older ones.
+    """
+    try:
+        return await comment_thread(Incident, "incident", incident_id, limit, cursor, if_none_match)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -446,7 +828,7 @@ async def delete_incident(
 ):
     """Delete an incident (only by creator or admin)"""
     try:
-        incident = await Incident.get(ObjectId(incident_id))
+        incident = await Incident.find_one({"_id": ObjectId(incident_id)}).project(IncidentScoring)
         if not incident:
             raise HTTPException(status_code=404, detail="Incident not found")
 
@@ -457,16 +839,15 @@ async def delete_incident(
             )
 
         region_id = incident.region_id
-        await incident.delete()
+        stats_delta = RegionStatsDelta.removing(incident)
+        await Incident.find_one({"_id": incident.id}).delete()
+        await CommentEntry.find({"subject_type": "incident", "subject_id": incident_id}).delete()
+        await next_revision(Incident)  # Moves the collection high-water mark
+        change_hub.incident_changed(incident, "deleted")
 
-        # Recalculate region stats after deletion
+        # Remove the incident from its region's aggregates
         if region_id:
-            try:
-                region = await Region.get(ObjectId(region_id))
-                if region:
-                    await region.recalculate_stats()
-            except Exception:
-                pass  # Ignore errors when updating region stats
+            await apply_region_stats_delta(region_id, stats_delta)
 
         return {"message": "Incident deleted successfully"}
     except Exception as e:
@@ -493,10 +874,6 @@ async def admin_validate_incident(
         )
 
     try:
-        incident = await Incident.get(ObjectId(incident_id))
-        if not incident:
-            raise HTTPException(status_code=404, detail="Incident not found")
-
         # Calculate multiplier
         # Admins have high credibility (e.g. 1.0)
         c_a = getattr(current_user, "auditor_credibility", 1.0)
@@ -511,22 +888,22 @@ async def admin_validate_incident(
             multiplier=multiplier,
         )
 
-        if not incident.audits:
-            incident.audits = []
-        incident.audits.append(audit)
-
-        # Legacy flags
-        incident.admin_validated = True
-        incident.admin_validated_by = str(current_user.id)
-        incident.validation_notes = validation_data.validation_notes
-
-        incident.updated_at = datetime.utcnow()
-        await incident.save()
+        # Legacy flags; the audit and recomputed weights go in the same write
+        written = await Incident.apply_update(
+            incident_id,
+            {
+                "admin_validated": True,
+                "admin_validated_by": str(current_user.id),
+                "validation_notes": validation_data.validation_notes,
+            },
+            audit=audit,
+        )
+        if not written:
+            raise HTTPException(status_code=404, detail="Incident not found")
 
-        # Recalculate weights
-        await update_incident_weights(incident)
+        await incident_written(*written)
 
-        return build_incident_response(incident)
+        return written_incident_response(written[1])
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -548,10 +925,6 @@ async def ngo_validate_incident(
         )
 
     try:
-        incident = await Incident.get(ObjectId(incident_id))
-        if not incident:
-            raise HTTPException(status_code=404, detail="Incident not found")
-
         # Calculate multiplier
         c_a = getattr(current_user, "auditor_credibility", 0.5)
         multiplier = calculate_audit_multiplier(validation_data.s_env, c_a)
@@ -565,22 +938,22 @@ async def ngo_validate_incident(
             multiplier=multiplier,
         )
 
-        if not incident.audits:
-            incident.audits = []
-        incident.audits.append(audit)
-
-        # Legacy flags
-        incident.ngo_validated = True
-        incident.ngo_validated_by = str(current_user.id)
-        incident.validation_notes = validation_data.validation_notes
-
-        incident.updated_at = datetime.utcnow()
-        await incident.save()
+        # Legacy flags; the audit and recomputed weights go in the same write
+        written = await Incident.apply_update(
+            incident_id,
+            {
+                "ngo_validated": True,
+                "ngo_validated_by": str(current_user.id),
+                "validation_notes": validation_data.validation_notes,
+            },
+            audit=audit,
+        )
+        if not written:
+            raise HTTPException(status_code=404, detail="Incident not found")
 
-        # Recalculate weights
-        await update_incident_weights(incident)
+        await incident_written(*written)
 
-        return build_incident_response(incident)
+        return written_incident_response(written[1])
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -596,19 +969,15 @@ async def remove_admin_validation(
         )
 
     try:
-        incident = await Incident.get(ObjectId(incident_id))
-        if not incident:
+        written = await Incident.apply_update(
+            incident_id, {"admin_validated": False, "admin_validated_by": None}
+        )
+        if not written:
             raise HTTPException(status_code=404, detail="Incident not found")
 
-        incident.admin_validated = False
-        incident.admin_validated_by = None
-        incident.admin_validation_date = None
-        incident.updated_at = datetime.utcnow()
-
-        await incident.save()
-        await update_incident_weights(incident)
+        await incident_written(*written)
 
-        return build_incident_response(incident)
+        return written_incident_response(written[1])
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -625,18 +994,14 @@ async def remove_ngo_validation(
         )
 
     try:
-        incident = await Incident.get(ObjectId(incident_id))
-        if not incident:
+        written = await Incident.apply_update(
+            incident_id, {"ngo_validated": False, "ngo_validated_by": None}
+        )
+        if not written:
             raise HTTPException(status_code=404, detail="Incident not found")
 
-        incident.ngo_validated = False
-        incident.ngo_validated_by = None
-        incident.ngo_validation_date = None
-        incident.updated_at = datetime.utcnow()
-
-        await incident.save()
-        await update_incident_weights(incident)
+        await incident_written(*written)
 
-        return build_incident_response(incident)
+        return written_incident_response(written[1])
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, HTTPException, Depends
+
+from app.dependencies.auth_dependencies import get_current_user
+from app.models.user_model import User
+from app.services.auth_cache import auth_cache
+from app.services.event_stream import event_stream
+from app.services.geometry_cache import region_geometry_cache
+from app.services.image_pipeline import image_pipeline
+from app.services.password_hasher import password_hasher
+from app.services.recalc_queue import recalc_queue
+from app.services.response_cache import response_cache
+from app.services.tile_cache import tile_cache
+
+
+router = APIRouter()
+
+
+@router.get("/")
+async def get_metrics(current_user: User = Depends(get_current_user)):
+    """In-process cache and queue counters, for sizing (admins only)"""
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Only admins can view metrics")
+
+    return {
+        "region_geometry_cache": region_geometry_cache.stats(),
+        "region_recalc_queue": recalc_queue.stats(),
+        "tile_cache": tile_cache.stats(),
+        "response_cache": response_cache.stats(),
+        "event_stream": event_stream.stats(),
+        "auth_cache": auth_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+        "image_pipeline": image_pipeline.stats(),
+    }
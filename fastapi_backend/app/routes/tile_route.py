@@ -0,0 +1,38 @@
+from fastapi import APIRouter, HTTPException, Response
+
+from app.services.tile_cache import tile_cache
+from app.services.vector_tiles import render_tile
+from app.utils.tiles import is_valid_tile
+
+
+router = APIRouter()
+
+MAX_TILE_ZOOM = 22
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+TILE_MAX_AGE = 60  # Seconds browsers may reuse a tile
+
+
+@router.get("/{z}/{x}/{y}.mvt")
+async def get_tile(z: int, x: int, y: int):
+    """
+    Mapbox Vector Tile with a "regions" layer (polygons with scores) and,
+    from zoom 10, an "incidents" layer (points).
+    """
+    if z > MAX_TILE_ZOOM or not is_valid_tile(z, x, y):
+        raise HTTPException(status_code=404, detail="Tile not found")
+
+    key = (z, x, y)
+    data = tile_cache.get(key)
+    if data is None:
+        generation = tile_cache.generation
+        try:
+            data, bounds, region_ids = await render_tile(z, x, y)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        tile_cache.put(key, data, bounds, region_ids, generation)
+
+    return Response(
+        content=data,
+        media_type=MVT_MEDIA_TYPE,
+        headers={"Cache-Control": f"public, max-age={TILE_MAX_AGE}"},
+    )
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, HTTPException
 from app.models.user_model import User
 from app.schemas.user_schema import UserCreate, UserResponse, TokenResponse, UserLogin
-from app.utils.auth import hash_password, verify_password
+from app.services.password_hasher import PasswordHasherBusy, password_hasher
+from app.utils.auth import needs_rehash
 from app.utils.jwt_utils import create_access_token
 
 
@@ -13,7 +14,11 @@ async def create_user(user: UserCreate):
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    hashed_password = hash_password(user.password)
+    try:
+        hashed_password = await password_hasher.hash(user.password)
+    except PasswordHasherBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
     user_doc = User(email=user.email, password=hashed_password, role=user.role)
     await user_doc.insert()
     return UserResponse(id=str(user_doc.id), email=user_doc.email, role=user_doc.role)
@@ -22,7 +27,14 @@ async def create_user(user: UserCreate):
 @router.post("/login", response_model=TokenResponse)
 async def login_user(user: UserLogin):
     user_doc = await User.find_one(User.email == user.email)
-    if not user_doc or not verify_password(user.password, user_doc.password):
+    try:
+        valid = user_doc is not None and await password_hasher.verify(user.password, user_doc.password)
+        if valid and needs_rehash(user_doc.password):
+            # BCRYPT_ROUNDS changed since this hash was made; upgrade it while we have the password
+            await user_doc.set({User.password: await password_hasher.hash(user.password)})
+    except PasswordHasherBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
     token_data = {"user_id": str(user_doc.id), "email": user_doc.email, "role": user_doc.role}
@@ -49,6 +49,14 @@ class CommentResponse(BaseModel):
         from_attributes = True
 
 
+class CommentListResponse(BaseModel):
+    """Schema for a page of an incident's or region's comments, newest first"""
+
+    comments: List[CommentResponse]
+    total: int
+    next_cursor: Optional[str] = None
+
+
 class AuditResponse(BaseModel):
     """Schema for audit response"""
 
@@ -60,6 +68,14 @@ class AuditResponse(BaseModel):
     multiplier: float
 
 
+class ImageVariantsResponse(BaseModel):
+    """Schema for the downscaled copies of an incident image"""
+
+    original: str
+    thumb: str
+    medium: str
+
+
 class IncidentResponse(BaseModel):
     """Schema for incident response"""
 
@@ -73,6 +89,7 @@ class IncidentResponse(BaseModel):
     severity: str
     status: str
     images: List[str]
+    image_variants: List[ImageVariantsResponse] = []
     comments: List[CommentResponse]
     alert_level: str
     region_id: Optional[str] = None
@@ -108,4 +125,6 @@ class IncidentListResponse(BaseModel):
     """Schema for listing incidents"""
 
     incidents: List[IncidentResponse]
-    total: int
+    total: Optional[int] = None  # None when counting was skipped
+    total_is_estimate: bool = False
+    next_cursor: Optional[str] = None  # Pass back as `cursor` for the next page
@@ -36,6 +36,7 @@ class RegionResponse(BaseModel):
     high_severity_count: int
     incident_types: Dict[str, int]
     comments: List[RegionCommentResponse] = []
+    comment_count: int = 0
     created_at: datetime
     updated_at: datetime
     
@@ -0,0 +1,135 @@
+"""
+Compare full-document reads with the projected read models used by the
+incident routes: BSON bytes per document and pydantic decode time.
+
+By default measures synthetic incidents shaped like real ones (polygon
+coordinates, stored geometry, comments and audits). With --live it reads a
+sample from the configured database instead.
+
+Usage:
+    python -m app.scripts.bench_projections [--count 2000] [--live]
+"""
+
+import argparse
+import asyncio
+import math
+import time
+from datetime import datetime, timedelta
+from bson import BSON, ObjectId
+
+from app.models.incident_model import Incident, IncidentScoring, IncidentSummary
+from app.services.database import init_database
+from app.utils.geometry import footprint_geojson
+
+
+def synthetic_incident(n: int) -> dict:
+    """A stored incident document with a ~40 vertex polygon, comments and audits"""
+    lon, lat = 85.9 + (n % 100) * 0.001, 26.7 + (n // 100) * 0.001
+    ring = [
+        [lon + 0.002 * math.cos(2 * math.pi * i / 40), lat + 0.002 * math.sin(2 * math.pi * i / 40)]
+        for i in range(40)
+    ]
+    ring.append(ring[0])
+    coordinates = {"type": "Polygon", "coordinates": [ring]}
+    created_at = datetime.utcnow() - timedelta(hours=n)
+    return {
+        "_id": ObjectId(),
+        "user_id": str(ObjectId()),
+        "user_email": f"user{n}@example.com",
+        "area_type": "street",
+        "coordinates": coordinates,
+        "geometry": footprint_geojson(coordinates),
+        "incident_type": "harassment",
+        "description": "Poorly lit stretch near the bus park, reported by several people. " * 3,
+        "severity": "high",
+        "status": "pending",
+        "images": [f"/uploads/{ObjectId()}.jpg"],
+        "comments": [
+            {
+                "id": str(ObjectId()),
+                "user_id": str(ObjectId()),
+                "user_email": "c@example.com",
+                "text": "Same here",
+                "created_at": created_at,
+            }
+            for _ in range(3)
+        ],
+        "alert_level": "normal",
+        "region_id": str(ObjectId()),
+        "created_at": created_at,
+        "updated_at": created_at,
+        "initial_weight": 1.5,
+        "effective_multiplier": 1.0,
+        "audits": [
+            {
+                "auditor_id": str(ObjectId()),
+                "auditor_email": "ngo@example.com",
+                "s_env": 0.7,
+                "notes": "Checked on site",
+                "created_at": created_at,
+                "multiplier": 1.2,
+            }
+        ],
+        "comment_count": 3,
+        "has_sufficient_description": True,
+        "image_count": 1,
+        "engagement_score": 0.8,
+    }
+
+
+def project(doc: dict, model) -> dict:
+    """What MongoDB returns for a projection on the model's fields"""
+    keys = {field.alias or name for name, field in model.model_fields.items()}
+    return {k: v for k, v in doc.items() if k in keys}
+
+
+def decode_seconds(docs, model) -> float:
+    start = time.perf_counter()
+    for doc in docs:
+        model.model_validate(doc)
+    return time.perf_counter() - start
+
+
+async def run(count: int, live: bool):
+    # Beanie has to be initialized to validate full Incident documents,
+    # even when the sample is synthetic
+    client = await init_database()
+    try:
+        if live:
+            cursor = Incident.get_pymongo_collection().find().limit(count)
+            docs = await cursor.to_list(None)
+        else:
+            docs = [synthetic_incident(n) for n in range(count)]
+    finally:
+        await client.close()
+
+    if not docs:
+        print("No incidents to measure")
+        return
+    report(docs)
+
+
+def report(docs: list):
+    print(f"{len(docs)} documents")
+    print(f"{'read model':<18}{'bytes/doc':>12}{'decode us/doc':>16}")
+
+    rows = [("Incident", docs, Incident)]
+    for model in (IncidentSummary, IncidentScoring):
+        rows.append((model.__name__, [project(d, model) for d in docs], model))
+
+    for name, projected, model in rows:
+        size = sum(len(BSON.encode(d)) for d in projected) / len(projected)
+        decode = decode_seconds(projected, model) / len(projected) * 1e6
+        print(f"{name:<18}{size:>12.0f}{decode:>16.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--live", action="store_true", help="sample incidents from the database")
+    args = parser.parse_args()
+    asyncio.run(run(args.count, args.live))
+
+
+if __name__ == "__main__":
+    main()
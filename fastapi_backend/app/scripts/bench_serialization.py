@@ -0,0 +1,149 @@
+"""
+Compare the CPU cost of the incident/region read responses: the pydantic
+path (document -> model -> payload -> response_model validation -> JSON) against the raw-document orjson path in app/utils/serializers.py.
+
+Reports requests per second for a 100-incident list, a single incident and
+a 100-region list, on synthetic documents (no database reads are timed).
+
+Usage:
+    python -m app.scripts.bench_serialization [--seconds 2]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime
+from bson import ObjectId
+from pydantic import TypeAdapter
+
+from app.models.incident_model import IncidentSummary
+from app.models.region_model import Region
+from app.schemas.incident_schema import IncidentListResponse, IncidentResponse
+from app.schemas.region_schema import RegionListResponse
+from app.scripts.bench_projections import project, synthetic_incident
+from app.services.database import init_database
+from app.utils.serializers import (
+    REGION_EXCLUDED_FIELDS,
+    incident_payload,
+    json_response,
+    region_payload,
+)
+
+LIST_SIZE = 100
+
+
+def synthetic_region(n: int) -> dict:
+    incident = synthetic_incident(n)
+    return {
+        "_id": ObjectId(),
+        "name": f"Region {n}",
+        "area_type": "polygon",
+        "coordinates": incident["coordinates"],
+        "incident_count": 12,
+        "average_severity": "high",
+        "high_severity_count": 7,
+        "incident_types": {"harassment": 8, "no_lights": 4},
+        "severity_score_sum": 34,
+        "contribution_sum": 14.2,
+        "score_reference_time": incident["created_at"],
+        "comments": [
+            {"id": str(ObjectId()), "user_id": str(ObjectId()), "user_email": "c@example.com",
+             "text": "Avoid after dark", "created_at": incident["created_at"]}
+        ],
+        "created_at": incident["created_at"],
+        "updated_at": incident["updated_at"],
+    }
+
+
+def as_model(model, doc: dict) -> dict:
+    """Round-trip a document through its pydantic model, as Beanie reads do"""
+    return model.model_validate(doc).model_dump(by_alias=True)
+
+
+def fastapi_encode(adapter: TypeAdapter, content) -> bytes:
+    """What FastAPI does with a response_model: validate, dump, json.dumps"""
+    value = adapter.validate_python(content)
+    return json.dumps(adapter.dump_python(value, mode="json")).encode()
+
+
+def rate(fn, seconds: float) -> float:
+    calls = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        fn()
+        calls += 1
+    return calls / seconds
+
+
+async def run(seconds: float):
+    # Beanie must be initialized to validate Region documents
+    client = await init_database()
+    await client.close()
+
+    now = datetime.utcnow()
+    incidents = [project(synthetic_incident(n), IncidentSummary) for n in range(LIST_SIZE)]
+    regions = [
+        {k: v for k, v in synthetic_region(n).items() if k not in REGION_EXCLUDED_FIELDS}
+        for n in range(LIST_SIZE)
+    ]
+
+    list_adapter = TypeAdapter(IncidentListResponse)
+    detail_adapter = TypeAdapter(IncidentResponse)
+    region_adapter = TypeAdapter(RegionListResponse)
+
+    cases = {
+        "incident list (100)": (
+            lambda: fastapi_encode(
+                list_adapter,
+                {
+                    "incidents": [incident_payload(as_model(IncidentSummary, d), now) for d in incidents],
+                    "total": len(incidents),
+                },
+            ),
+            lambda: json_response(
+                {
+                    "incidents": [incident_payload(d, now) for d in incidents],
+                    "total": len(incidents),
+                    "total_is_estimate": False,
+                    "next_cursor": None,
+                }
+            ).body,
+        ),
+        "incident detail": (
+            lambda: fastapi_encode(
+                detail_adapter,
+                incident_payload(as_model(IncidentSummary, incidents[0]), now),
+            ),
+            lambda: json_response(incident_payload(incidents[0], now)).body,
+        ),
+        "region list (100)": (
+            lambda: fastapi_encode(
+                region_adapter,
+                {
+                    "regions": [region_payload(as_model(Region, d), now) for d in regions],
+                    "total": len(regions),
+                },
+            ),
+            lambda: json_response(
+                {"regions": [region_payload(d, now) for d in regions], "total": len(regions)}
+            ).body,
+        ),
+    }
+
+    print(f"{'endpoint':<22}{'pydantic req/s':>16}{'orjson req/s':>14}{'speedup':>9}")
+    for name, (before, after) in cases.items():
+        old_rate = rate(before, seconds)
+        new_rate = rate(after, seconds)
+        print(f"{name:<22}{old_rate:>16,.0f}{new_rate:>14,.0f}{new_rate / old_rate:>8.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=2.0, help="time per measurement")
+    args = parser.parse_args()
+    asyncio.run(run(args.seconds))
+
+
+if __name__ == "__main__":
+    main()
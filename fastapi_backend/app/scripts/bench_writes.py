@@ -0,0 +1,183 @@
+"""
+Count MongoDB commands and time the incident write endpoints: the old
+whole-document save() chains against the atomic updates now used by
+app/routes/incident_route.py.
+
+The old paths are reproduced below as they were (read, mutate, save, then
+save again after recalculating weights). Commands are counted with a
+pymongo CommandListener; region aggregate updates run inline, as they do
+when the background queue isn't running.
+
+Writes to the configured database: a scratch region and incident are
+created for the run and removed afterwards.
+
+Usage:
+    python -m app.scripts.bench_writes [--iterations 50]
+"""
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+from beanie import PydanticObjectId
+from bson import ObjectId
+from pymongo import monitoring
+
+from app.models.comment_model import CommentEntry
+from app.models.incident_model import Audit, Comment, Incident
+from app.models.region_model import Region, RegionStatsDelta
+from app.models.user_model import User
+from app.routes.incident_route import (
+    add_comment,
+    admin_validate_incident,
+    apply_region_stats_delta,
+    update_incident,
+)
+from app.schemas.incident_schema import CommentCreate, IncidentUpdate, IncidentValidation
+from app.services.change_events import change_hub
+from app.services.database import init_database
+from app.utils.incident_weight import apply_incident_weights, calculate_audit_multiplier
+
+
+class CommandCounter(monitoring.CommandListener):
+    def __init__(self):
+        self.counts = Counter()
+
+    def started(self, event):
+        self.counts[event.command_name] += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+# ===== Previous implementations =====
+
+
+async def legacy_save_weights(incident: Incident, stats_delta: RegionStatsDelta):
+    apply_incident_weights(incident)
+    await incident.save()
+    change_hub.incident_changed(incident)
+    if incident.region_id:
+        stats_delta.add_incident(incident)
+        await apply_region_stats_delta(incident.region_id, stats_delta)
+
+
+async def legacy_comment(incident_id: str, user: User):
+    incident = await Incident.get(ObjectId(incident_id))
+    stats_delta = RegionStatsDelta.removing(incident)
+    incident.comments.append(Comment(user_id=str(user.id), user_email=user.email, text="Same here"))
+    await incident.save()
+    await legacy_save_weights(incident, stats_delta)
+
+
+async def legacy_validate(incident_id: str, user: User):
+    incident = await Incident.get(ObjectId(incident_id))
+    stats_delta = RegionStatsDelta.removing(incident)
+    incident.audits.append(
+        Audit(
+            auditor_id=str(user.id),
+            auditor_email=user.email,
+            s_env=0.8,
+            multiplier=calculate_audit_multiplier(0.8, 1.0),
+        )
+    )
+    incident.admin_validated = True
+    incident.admin_validated_by = str(user.id)
+    await incident.save()
+    await legacy_save_weights(incident, stats_delta)
+
+
+async def legacy_update(incident_id: str, user: User):
+    incident = await Incident.get(ObjectId(incident_id))
+    stats_delta = RegionStatsDelta.removing(incident)
+    incident.severity = "high"
+    await incident.save()
+    await legacy_save_weights(incident, stats_delta)
+
+
+# ===== Current endpoints =====
+
+
+async def current_comment(incident_id: str, user: User):
+    await add_comment(incident_id, CommentCreate(text="Same here"), current_user=user)
+
+
+async def current_validate(incident_id: str, user: User):
+    await admin_validate_incident(incident_id, IncidentValidation(s_env=0.8), current_user=user)
+
+
+async def current_update(incident_id: str, user: User):
+    await update_incident(incident_id, IncidentUpdate(severity="high"), current_user=user)
+
+
+CASES = {
+    "comment": (legacy_comment, current_comment),
+    "admin validation": (legacy_validate, current_validate),
+    "severity update": (legacy_update, current_update),
+}
+
+
+async def measure(fn, incident_id: str, user: User, counter: CommandCounter, iterations: int):
+    counter.counts.clear()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await fn(incident_id, user)
+    elapsed = time.perf_counter() - started
+    return sum(counter.counts.values()) / iterations, elapsed / iterations * 1000, dict(counter.counts)
+
+
+async def run(iterations: int):
+    counter = CommandCounter()
+    # Must be registered before the client is created
+    monitoring.register(counter)
+    client = await init_database()
+
+    user = User(id=PydanticObjectId(), email="bench@example.com", password="-", role="admin")
+    user.auditor_credibility = 1.0
+    point = {"type": "Point", "coordinates": [85.9, 26.7]}
+    region = Region(name="bench", area_type="point", coordinates=point)
+    await region.insert()
+
+    try:
+        print(f"{'endpoint':<18}{'old ops':>9}{'new ops':>9}{'old ms':>9}{'new ms':>9}")
+        for name, (before, after) in CASES.items():
+            results = []
+            for fn in (before, after):
+                # Fresh incident per run so both start from the same document size
+                incident = Incident(
+                    user_id=str(user.id),
+                    user_email=user.email,
+                    area_type="point",
+                    coordinates=point,
+                    incident_type="other",
+                    description="Benchmark incident",
+                    region_id=str(region.id),
+                )
+                await incident.insert()
+                results.append(await measure(fn, str(incident.id), user, counter, iterations))
+
+            (old_ops, old_ms, old_counts), (new_ops, new_ms, new_counts) = results
+            print(f"{name:<18}{old_ops:>9.1f}{new_ops:>9.1f}{old_ms:>9.2f}{new_ms:>9.2f}")
+            print(f"{'':<18}old {old_counts}")
+            print(f"{'':<18}new {new_counts}")
+    finally:
+        incidents = await Incident.find({"region_id": str(region.id)}).to_list()
+        ids = [str(incident.id) for incident in incidents]
+        await CommentEntry.find({"subject_type": "incident", "subject_id": {"$in": ids}}).delete()
+        await Incident.find({"region_id": str(region.id)}).delete()
+        await region.delete()
+        await client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50, help="writes per endpoint and variant")
+    args = parser.parse_args()
+    asyncio.run(run(args.iterations))
+
+
+if __name__ == "__main__":
+    main()
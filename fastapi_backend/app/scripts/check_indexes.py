@@ -0,0 +1,141 @@
+"""
+Check that every query shape the API issues is served by an index.
+
+Runs explain() on each shape below against the configured database (after
+init_database has created the declared indexes) and exits non-zero if any
+winning plan contains a COLLSCAN. Keep QUERY_SHAPES in sync when adding or
+changing queries in the routes and services.
+
+Usage:
+    python -m app.scripts.check_indexes
+"""
+
+import asyncio
+import sys
+from datetime import datetime
+from bson import ObjectId
+from pymongo import DESCENDING
+
+from app.models.comment_model import CommentEntry
+from app.models.incident_model import Incident
+from app.models.region_model import Region
+from app.models.user_model import User
+from app.services.database import init_database
+from app.services.revisions import REVISIONS_COLLECTION
+
+NEWEST_FIRST = [("created_at", DESCENDING), ("_id", DESCENDING)]
+SAMPLE_ID = ObjectId()
+SAMPLE_TIME = datetime(2024, 1, 1)
+SAMPLE_POLYGON = {
+    "type": "Polygon",
+    "coordinates": [[[85.9, 26.7], [85.91, 26.7], [85.91, 26.71], [85.9, 26.71], [85.9, 26.7]]],
+}
+AFTER_CURSOR = {
+    "$or": [
+        {"created_at": {"$lt": SAMPLE_TIME}},
+        {"created_at": SAMPLE_TIME, "_id": {"$lt": SAMPLE_ID}},
+    ]
+}
+
+# (description, model or raw collection name, filter, sort). GET
+# /incidents/regions without a bbox reads every region on purpose and is
+# not listed.
+QUERY_SHAPES = [
+    # GET /incidents/ (first page, next pages and counts)
+    ("incidents list", Incident, {}, NEWEST_FIRST),
+    ("incidents list by status", Incident, {"status": "pending"}, NEWEST_FIRST),
+    ("incidents list by type", Incident, {"incident_type": "gbv"}, NEWEST_FIRST),
+    ("incidents list by alert level", Incident, {"alert_level": "high_alert"}, NEWEST_FIRST),
+    (
+        "incidents list by status and type",
+        Incident,
+        {"status": "pending", "incident_type": "gbv"},
+        NEWEST_FIRST,
+    ),
+    ("incidents list next page", Incident, AFTER_CURSOR, NEWEST_FIRST),
+    ("incidents list next page by status", Incident, {"status": "pending", **AFTER_CURSOR}, NEWEST_FIRST),
+    ("incidents count by status", Incident, {"status": "pending"}, None),
+    # Incident by id, region incidents and region stats recalculation
+    ("incident by id", Incident, {"_id": SAMPLE_ID}, None),
+    ("incidents of a region", Incident, {"region_id": str(SAMPLE_ID)}, None),
+    # Vector tiles (incident layer) and image variant recording
+    ("incidents in tile", Incident, {"geometry": {"$geoIntersects": {"$geometry": SAMPLE_POLYGON}}}, None),
+    (
+        "incidents showing an image",
+        Incident,
+        {"images": "/uploads/sample.jpg", "image_variants.original": {"$ne": "/uploads/sample.jpg"}},
+        None,
+    ),
+    # Region lookups
+    ("region by id", Region, {"_id": SAMPLE_ID}, None),
+    ("regions by ids", Region, {"_id": {"$in": [SAMPLE_ID]}}, None),
+    (
+        "overlap candidates",
+        Region,
+        {"_id": {"$in": [SAMPLE_ID]}, "geometry": {"$geoIntersects": {"$geometry": SAMPLE_POLYGON}}},
+        None,
+    ),
+    ("spatial index refresh", Region, {"created_at": {"$gte": SAMPLE_TIME}, "_id": {"$nin": [SAMPLE_ID]}}, None),
+    ("regions in viewport", Region, {"geometry": {"$geoIntersects": {"$geometry": SAMPLE_POLYGON}}}, None),
+    # Comment threads (first page, next pages and migration counts)
+    ("comments of an incident", CommentEntry, {"subject_type": "incident", "subject_id": str(SAMPLE_ID)}, NEWEST_FIRST),
+    (
+        "comments next page",
+        CommentEntry,
+        {"subject_type": "region", "subject_id": str(SAMPLE_ID), **AFTER_CURSOR},
+        NEWEST_FIRST,
+    ),
+    # Collection revisions behind the read endpoints' ETags
+    ("collection revision", REVISIONS_COLLECTION, {"_id": Incident.Settings.name}, None),
+    # Login/register and authentication
+    ("user by email", User, {"email": "someone@example.com"}, None),
+    ("user by id", User, {"_id": SAMPLE_ID}, None),
+]
+
+
+def plan_stages(plan: dict):
+    """Yield every stage name in an explain() plan tree"""
+    if not isinstance(plan, dict):
+        return
+    if "stage" in plan:
+        yield plan["stage"]
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            yield from plan_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        yield from plan_stages(child)
+
+
+def collection_of(model):
+    if isinstance(model, str):
+        return Incident.get_pymongo_collection().database[model]
+    return model.get_pymongo_collection()
+
+
+async def explain(model, query: dict, sort) -> list:
+    cursor = collection_of(model).find(query)
+    if sort:
+        cursor = cursor.sort(sort)
+    result = await cursor.limit(1).explain()
+    return list(plan_stages(result["queryPlanner"]["winningPlan"]))
+
+
+async def main() -> int:
+    client = await init_database()
+    failures = 0
+    try:
+        for description, model, query, sort in QUERY_SHAPES:
+            stages = await explain(model, query, sort)
+            ok = "COLLSCAN" not in stages
+            failures += not ok
+            print(f"{'ok  ' if ok else 'FAIL'} {description}: {' <- '.join(stages)}")
+    finally:
+        await client.close()
+
+    if failures:
+        print(f"{failures} query shape(s) fall back to a collection scan")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
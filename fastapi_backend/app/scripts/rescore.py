@@ -0,0 +1,179 @@
+"""
+Rescore every incident and region with the vectorized scoring engine.
+
+Run after changing DECAY_RATE, SEVERITY_WEIGHTS or MAX_SCORE_CEILING in
+app/utils/incident_weight.py. Audit multipliers are taken as stored, so a
+new ALPHA only applies to audits created after the change.
+
+Stop the API while this runs. Region scores are computed from a snapshot
+and written with $set, so region aggregate updates the API applies in the
+meantime (new, edited or audited incidents) are overwritten and lost.
+
+Usage:
+    python -m app.scripts.rescore [--chunk-size 1000] [--dry-run]
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+from bson import ObjectId
+import numpy as np
+from pymongo import UpdateOne
+
+from app.models.incident_model import Incident
+from app.models.region_model import Region
+from app.services.database import init_database
+from app.services.revisions import next_revision
+from app.utils import scoring_engine
+
+
+async def load_incidents() -> dict:
+    """Load the scoring inputs of every incident into NumPy arrays"""
+    pipeline = [
+        {
+            "$project": {
+                "region_id": 1,
+                "severity": 1,
+                "created_ms": {"$toLong": "$created_at"},
+                "multipliers": {"$ifNull": ["$audits.multiplier", []]},
+            }
+        }
+    ]
+    cursor = await Incident.get_pymongo_collection().aggregate(pipeline)
+
+    ids, region_ids, severities, created_ms, audit_counts, multipliers = [], [], [], [], [], []
+    async for doc in cursor:
+        ids.append(doc["_id"])
+        region_ids.append(doc.get("region_id") or "")
+        severities.append(doc.get("severity") or "")
+        created_ms.append(doc["created_ms"])
+        audit_counts.append(len(doc["multipliers"]))
+        multipliers.extend(doc["multipliers"])
+
+    return {
+        "ids": ids,
+        "region_ids": np.array(region_ids, dtype=object),
+        "severities": np.array(severities, dtype=object),
+        "created_at_s": np.array(created_ms, dtype=np.float64) / 1000.0,
+        "audit_counts": np.array(audit_counts, dtype=np.int64),
+        "multipliers": np.array(multipliers, dtype=np.float64),
+    }
+
+
+async def write_chunks(collection, operations, chunk_size: int):
+    for start in range(0, len(operations), chunk_size):
+        await collection.bulk_write(operations[start:start + chunk_size], ordered=False)
+
+
+async def rescore(chunk_size: int, dry_run: bool) -> dict:
+    now = datetime.utcnow()
+    now_s = now.replace(tzinfo=timezone.utc).timestamp()
+    timings = {}
+
+    started = time.perf_counter()
+    data = await load_incidents()
+    regions = await Region.get_pymongo_collection().find(
+        {}, {"cluster_factor": 1}
+    ).to_list(None)
+    timings["load"] = time.perf_counter() - started
+
+    # Incidents
+    started = time.perf_counter()
+    w_initial = scoring_engine.initial_weights(data["severities"])
+    m_effective = scoring_engine.effective_multipliers(data["audit_counts"], data["multipliers"])
+    decay = scoring_engine.time_decay(data["created_at_s"], now_s)
+    contributions = w_initial * m_effective * decay
+
+    # Regions (incidents without a known region are scored but not grouped)
+    region_keys = [str(r["_id"]) for r in regions]
+    region_position = {region_id: i for i, region_id in enumerate(region_keys)}
+    codes = np.array([region_position.get(r, -1) for r in data["region_ids"]], dtype=np.int64)
+    grouped = codes >= 0
+    cluster_factors = np.array([r.get("cluster_factor", 1.0) for r in regions], dtype=np.float64)
+    counts, contribution_sum, r_raw, r_norm = scoring_engine.region_scores(
+        codes[grouped], contributions[grouped], cluster_factors
+    )
+    safety = np.where(counts > 0, np.maximum(0.0, 10.0 - r_norm / 10.0), 10.0)
+    timings["compute"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    if not dry_run:
+        incident_revision = await next_revision(Incident)
+        region_revision = await next_revision(Region)
+        incident_ops = [
+            UpdateOne(
+                {"_id": incident_id},
+                {
+                    "$set": {
+                        "initial_weight": w,
+                        "effective_multiplier": m,
+                        "time_decay_factor": d,
+                        "contribution_score": c,
+                        "revision": incident_revision,
+                    }
+                },
+            )
+            for incident_id, w, m, d, c in zip(
+                data["ids"],
+                w_initial.tolist(),
+                m_effective.tolist(),
+                decay.tolist(),
+                contributions.tolist(),
+            )
+        ]
+        region_ops = [
+            UpdateOne(
+                {"_id": ObjectId(region_id)},
+                {
+                    "$set": {
+                        "contribution_sum": s,
+                        "score_reference_time": now,
+                        "raw_score": raw,
+                        "normalized_score": norm,
+                        "safety_score": safe,
+                        "revision": region_revision,
+                    }
+                },
+            )
+            for region_id, s, raw, norm, safe in zip(
+                region_keys,
+                contribution_sum.tolist(),
+                r_raw.tolist(),
+                r_norm.tolist(),
+                safety.tolist(),
+            )
+        ]
+        await write_chunks(Incident.get_pymongo_collection(), incident_ops, chunk_size)
+        await write_chunks(Region.get_pymongo_collection(), region_ops, chunk_size)
+    timings["write"] = time.perf_counter() - started
+
+    return {
+        "incidents": len(data["ids"]),
+        "regions": len(region_keys),
+        "timings": timings,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chunk-size", type=int, default=1000, help="operations per bulk_write")
+    parser.add_argument("--dry-run", action="store_true", help="compute scores without writing")
+    args = parser.parse_args()
+
+    client = await init_database()
+    try:
+        result = await rescore(args.chunk_size, args.dry_run)
+    finally:
+        await client.close()
+
+    total = sum(result["timings"].values())
+    rows = result["incidents"] + result["regions"]
+    print(f"incidents: {result['incidents']}, regions: {result['regions']}")
+    for stage, seconds in result["timings"].items():
+        print(f"  {stage:<8} {seconds:8.3f}s")
+    print(f"  {'total':<8} {total:8.3f}s ({rows / total if total else 0:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
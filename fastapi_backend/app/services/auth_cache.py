@@ -0,0 +1,132 @@
+"""
+Auth Cache
+
+Bounded TTL cache of verified bearer tokens and the user they belong to, so
+authenticated requests skip both the JWT signature check and the users
+lookup. Entries live for AUTH_CACHE_TTL_SECONDS at most, never past the
+token's own expiry, and are dropped as soon as the user document is written
+(see the User event hooks). Code that changes users with raw collection
+updates must call `invalidate_user` itself.
+
+Each user also has a generation that `invalidate_user` bumps. Callers read
+it before looking the user up and pass it to `put`, so a lookup that raced
+with a write is not cached.
+"""
+
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Set
+
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+
+
+class _Entry(NamedTuple):
+    user: object  # User
+    user_id: str
+    expires_at: float  # time.monotonic()
+
+
+class AuthCache:
+    """LRU of token -> verified user"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._miss_seconds = 0.0
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._tokens_by_user: Dict[str, Set[str]] = {}
+        self._generations: Dict[str, int] = {}
+
+    def get(self, token: str):
+        """Cached user for a token, or None (counted as a miss)"""
+        entry = self._entries.get(token)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if entry.expires_at <= time.monotonic():
+            self._remove(token)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(token)
+        # Copy, so a handler changing its current_user can't leak into other requests
+        return entry.user.model_copy()
+
+    def generation(self, user_id: str) -> int:
+        """Current generation of a user; read it before looking the user up"""
+        return self._generations.get(str(user_id), 0)
+
+    def put(self, token: str, user, generation: int, token_exp: Optional[float], lookup_seconds: float):
+        """
+        Cache a user verified the slow way. generation is what `generation`
+        returned before the lookup; the user is not cached if it has been
+        invalidated since. token_exp is the JWT "exp" claim (unix time);
+        lookup_seconds is how long verification took, for stats.
+        """
+        self._miss_seconds += lookup_seconds
+
+        ttl = self.ttl
+        if token_exp is not None:
+            ttl = min(ttl, token_exp - time.time())
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+
+        user_id = str(user.id)
+        if self.generation(user_id) != generation:
+            return  # Written while we were looking it up
+        self._remove(token)
+        self._entries[token] = _Entry(user.model_copy(), user_id, time.monotonic() + ttl)
+        self._tokens_by_user.setdefault(user_id, set()).add(token)
+        while len(self._entries) > self.maxsize:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: str):
+        """Forget every token of a user, e.g. after a role or credibility change"""
+        user_id = str(user_id)
+        self._generations[user_id] = self._generations.get(user_id, 0) + 1
+        tokens = self._tokens_by_user.pop(user_id, None)
+        if not tokens:
+            return
+        self.invalidations += 1
+        for token in tokens:
+            self._entries.pop(token, None)
+
+    def clear(self):
+        self._entries.clear()
+        self._tokens_by_user.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        avg_miss_ms = self._miss_seconds / self.misses * 1000 if self.misses else 0.0
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "avg_miss_ms": round(avg_miss_ms, 3),
+            # Hits would have cost an average miss each
+            "saved_ms": round(self.hits * avg_miss_ms, 1),
+        }
+
+    def _remove(self, token: str):
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        tokens = self._tokens_by_user.get(entry.user_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[entry.user_id]
+
+
+auth_cache = AuthCache(AUTH_CACHE_SIZE, AUTH_CACHE_TTL_SECONDS)
@@ -0,0 +1,226 @@
+"""
+Bulk Incident Import
+
+Assigns regions to a batch of incidents with vectorized shapely predicates,
+writes them with insert_many and updates each affected region's aggregates once.
+"""
+
+from typing import Dict, List, Tuple
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+import numpy as np
+import shapely
+
+from app.models.incident_model import Incident
+from app.models.region_model import Region, RegionShape, RegionStatsDelta
+from app.models.user_model import User
+from app.schemas.incident_schema import IncidentCreate
+from app.services.change_events import change_hub
+from app.services.geometry_cache import region_geometry_cache
+from app.services.image_pipeline import image_pipeline
+from app.services.recalc_queue import recalc_queue
+from app.services.revisions import next_revision
+from app.services.region_index import region_index
+from app.utils.geometry import build_footprint
+from app.utils.incident_weight import apply_incident_weights
+
+OVERLAP_THRESHOLD = 50.0  # Same rule as create_incident
+
+
+def overlap_percentages(geoms_a, geoms_b) -> np.ndarray:
+    """Element-wise overlap percentage (0-100) of two equal-length geometry arrays"""
+    pct = np.zeros(len(geoms_a))
+    if not len(geoms_a):
+        return pct
+
+    hit = shapely.intersects(geoms_a, geoms_b)
+    if not hit.any():
+        return pct
+
+    a, b = geoms_a[hit], geoms_b[hit]
+    smaller_area = np.minimum(shapely.area(a), shapely.area(b))
+    inter_area = shapely.area(shapely.intersection(a, b))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct[hit] = np.where(smaller_area > 0, inter_area / smaller_area * 100, 0.0)
+    return np.minimum(pct, 100.0)
+
+
+def write_errors(e: BulkWriteError) -> Dict[int, str]:
+    """
+    Index -> message of the documents an unordered insert_many rejected;
+    every other document was still written. Re-raises errors that aren't
+    per document (e.g. a write concern failure).
+    """
+    failed = {err["index"]: err.get("errmsg", "Write failed") for err in e.details.get("writeErrors", [])}
+    if not failed:
+        raise e
+    return failed
+
+
+async def import_incident_batch(
+    batch: List[Tuple[int, IncidentCreate]], current_user: User
+) -> dict:
+    """
+    Import one batch of parsed NDJSON lines.
+    Returns inserted/created counts, affected region ids and per-line errors.
+    """
+    errors = []
+    rows = []  # (line_no, data, footprint)
+
+    for line_no, data in batch:
+        geom = build_footprint(data.coordinates)
+        if geom is None:
+            errors.append({"line": line_no, "error": "Invalid coordinates"})
+            continue
+        rows.append((line_no, data, geom))
+
+    # Explicit region ids must exist
+    requested_ids = {data.region_id for _, data, _ in rows if data.region_id}
+    existing_ids = set()
+    if requested_ids:
+        valid_ids = [ObjectId(r) for r in requested_ids if ObjectId.is_valid(r)]
+        found = await Region.find({"_id": {"$in": valid_ids}}).project(RegionShape).to_list()
+        existing_ids = {str(r.id) for r in found}
+
+    assigned: List[str] = [None] * len(rows)
+    to_match = []
+    for i, (line_no, data, _) in enumerate(rows):
+        if not data.region_id:
+            to_match.append(i)
+        elif data.region_id in existing_ids:
+            assigned[i] = data.region_id
+        else:
+            errors.append({"line": line_no, "error": "Region not found"})
+
+    # Match against stored regions: bbox candidates from the index, then one
+    # vectorized overlap test over every (incident, candidate) pair
+    await region_index.refresh()
+    match_geoms = [rows[i][2] for i in to_match]
+    pairs = region_index.query_bulk(match_geoms)
+
+    if pairs:
+        candidate_ids = sorted({region_id for _, region_id in pairs}, key=ObjectId)
+        candidates = await Region.find(
+            {"_id": {"$in": [ObjectId(r) for r in candidate_ids]}}
+        ).project(RegionShape).to_list()
+        region_geoms = {str(r.id): region_geometry_cache.get(r) for r in candidates}
+        rank = {region_id: n for n, region_id in enumerate(candidate_ids)}
+
+        pairs = [(i, r) for i, r in pairs if region_geoms.get(r) is not None]
+        pair_inc = np.array([i for i, _ in pairs], dtype=np.intp)
+        pair_rank = np.array([rank[r] for _, r in pairs], dtype=np.intp)
+        geoms_a = np.array([match_geoms[i] for i, _ in pairs], dtype=object)
+        geoms_b = np.array([region_geoms[r] for _, r in pairs], dtype=object)
+
+        matched = overlap_percentages(geoms_a, geoms_b) > OVERLAP_THRESHOLD
+
+        # Oldest matching region wins, as in create_incident
+        best = np.full(len(match_geoms), len(candidate_ids), dtype=np.intp)
+        np.minimum.at(best, pair_inc[matched], pair_rank[matched])
+        for j, r in enumerate(best.tolist()):
+            if r < len(candidate_ids):
+                assigned[to_match[j]] = candidate_ids[r]
+
+    # Unmatched incidents either join a region created earlier in this batch
+    # or start a new one, in line order
+    new_regions: List[Region] = []
+    new_geoms = np.array([], dtype=object)
+    for i in to_match:
+        if assigned[i] is not None:
+            continue
+
+        line_no, data, geom = rows[i]
+        if len(new_geoms):
+            pct = overlap_percentages(np.full(len(new_geoms), geom, dtype=object), new_geoms)
+            hits = np.nonzero(pct > OVERLAP_THRESHOLD)[0]
+            if len(hits):
+                assigned[i] = str(new_regions[hits[0]].id)
+                continue
+
+        region = Region(
+            id=ObjectId(),
+            name=f"Region {data.area_type}",
+            area_type=data.area_type,
+            coordinates=data.coordinates,
+            comments_moved=True,
+        )
+        region.sync_geometry()
+        new_regions.append(region)
+        new_geoms = np.append(new_geoms, np.array([geom], dtype=object))
+        assigned[i] = str(region.id)
+
+    # insert_many skips the document hooks: geometry is synced and
+    # comments_moved set above, and each batch shares one revision per collection
+    if new_regions:
+        revision = await next_revision(Region)
+        for region in new_regions:
+            region.revision = revision
+        try:
+            await Region.insert_many(new_regions, ordered=False)
+        except BulkWriteError as e:
+            # e.g. a footprint the 2dsphere index rejects; its lines fail with it
+            failed = write_errors(e)
+            failed_ids = {str(new_regions[index].id): message for index, message in failed.items()}
+            for i, region_id in enumerate(assigned):
+                if region_id in failed_ids:
+                    errors.append({"line": rows[i][0], "error": failed_ids[region_id]})
+                    assigned[i] = None
+            new_regions = [region for n, region in enumerate(new_regions) if n not in failed]
+        for region in new_regions:
+            region_index.add(region)
+            change_hub.region_changed(str(region.id), "created", region.geometry)
+
+    # Write incidents
+    incidents = []
+    incident_lines = []
+    for i, (line_no, data, _) in enumerate(rows):
+        if assigned[i] is None:
+            continue
+        incident = Incident(
+            id=ObjectId(),
+            user_id=str(current_user.id),
+            user_email=current_user.email,
+            area_type=data.area_type,
+            coordinates=data.coordinates,
+            incident_type=data.incident_type,
+            description=data.description,
+            severity=data.severity,
+            images=data.images or [],
+            region_id=assigned[i],
+            comments_moved=True,
+        )
+        incident.sync_geometry()
+        if incident.images:
+            incident.image_variants = await image_pipeline.ready_variants(incident.images)
+        apply_incident_weights(incident)
+        incidents.append(incident)
+        incident_lines.append(line_no)
+
+    if incidents:
+        revision = await next_revision(Incident)
+        for incident in incidents:
+            incident.revision = revision
+        try:
+            await Incident.insert_many(incidents, ordered=False)
+        except BulkWriteError as e:
+            failed = write_errors(e)
+            for index, message in sorted(failed.items()):
+                errors.append({"line": incident_lines[index], "error": message})
+            incidents = [incident for n, incident in enumerate(incidents) if n not in failed]
+        await image_pipeline.record_late_variants(incidents)
+        for incident in incidents:
+            change_hub.incident_changed(incident, "created")
+
+    # One aggregate update per affected region
+    deltas: Dict[str, RegionStatsDelta] = {}
+    for incident in incidents:
+        deltas.setdefault(incident.region_id, RegionStatsDelta()).add_incident(incident)
+    for region_id, delta in deltas.items():
+        await recalc_queue.submit(region_id, delta)
+
+    return {
+        "inserted": len(incidents),
+        "regions_created": len(new_regions),
+        "regions_updated": len(deltas),
+        "errors": errors,
+    }
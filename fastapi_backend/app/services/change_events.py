@@ -0,0 +1,83 @@
+"""
+Change Events
+
+In-process hub for region and incident change notifications. Write paths
+publish what changed (and where); derived views such as the vector tile
+cache subscribe and invalidate only what the change touches.
+"""
+
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+from pydantic import BaseModel, Field
+from shapely.geometry import shape
+
+Bounds = Tuple[float, float, float, float]  # min_lon, min_lat, max_lon, max_lat
+
+
+class ChangeEvent(BaseModel):
+    """A region or incident was created, updated or deleted"""
+    kind: str  # "region", "incident"
+    action: str  # "created", "updated", "deleted"
+    id: str
+    region_id: Optional[str] = None
+    bounds: Optional[Bounds] = None  # Footprint bounds, when the change has a location
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class ChangeHub:
+    """Fans change events out to synchronous subscribers"""
+
+    def __init__(self):
+        self._subscribers: List[Callable[[ChangeEvent], None]] = []
+        self.published = 0
+
+    def subscribe(self, callback: Callable[[ChangeEvent], None]):
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[ChangeEvent], None]):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def publish(self, event: ChangeEvent):
+        self.published += 1
+        for callback in list(self._subscribers):
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"Error handling change event: {e}")
+
+    def region_changed(self, region_id: str, action: str = "updated", geometry: Optional[dict] = None):
+        self.publish(
+            ChangeEvent(
+                kind="region",
+                action=action,
+                id=region_id,
+                region_id=region_id,
+                bounds=geojson_bounds(geometry),
+            )
+        )
+
+    def incident_changed(self, incident, action: str = "updated"):
+        self.publish(
+            ChangeEvent(
+                kind="incident",
+                action=action,
+                id=str(incident.id),
+                region_id=incident.region_id,
+                bounds=geojson_bounds(incident.geometry),
+            )
+        )
+
+
+def geojson_bounds(geometry: Optional[dict]) -> Optional[Bounds]:
+    """Bounds of a stored GeoJSON footprint, None if missing or unparseable"""
+    if not geometry:
+        return None
+    try:
+        return tuple(shape(geometry).bounds)
+    except Exception as e:
+        print(f"Error parsing geometry: {e}")
+        return None
+
+
+change_hub = ChangeHub()
@@ -0,0 +1,173 @@
+"""
+Comment Threads
+
+Comments are stored in their own collection (CommentEntry). Posting one
+also updates the parent incident or region in a single atomic write:
+`comment_count` is incremented and the comment is pushed onto the
+embedded `comments` preview, which is capped at COMMENT_PREVIEW_SIZE so
+parent documents no longer grow with the discussion.
+
+Parents from before the collection existed still hold their whole thread
+embedded. New parents are created with COMMENTS_MOVED set; legacy ones
+get it once their thread has been copied to the collection (by
+app/migrations/move_comments.py, or here on their next comment). The
+preview is only trimmed on marked parents.
+"""
+
+import hashlib
+from typing import List, Optional, Tuple
+from beanie import PydanticObjectId
+from bson import ObjectId
+from pymongo import DESCENDING, ReturnDocument, UpdateOne
+
+from app.models.comment_model import COMMENT_PREVIEW_SIZE, CommentEntry
+from app.services.revisions import next_revision
+from app.utils.pagination import after_cursor, encode_cursor
+
+NEWEST_FIRST = [("created_at", DESCENDING), ("_id", DESCENDING)]
+
+# Set on parents whose embedded comments are all in the comments collection
+# (the comments_moved field of Incident and Region)
+COMMENTS_MOVED = "comments_moved"
+
+
+async def post_comment(
+    model, subject_type: str, subject_id: str, user_id: str, user_email: str, text: str,
+    projection: Optional[dict] = None,
+) -> Optional[dict]:
+    """
+    Add a comment to an incident or region (model is Incident or Region).
+    Returns the updated parent document, or None if it doesn't exist.
+    """
+    if not ObjectId.is_valid(subject_id):
+        return None
+    subject_oid = PydanticObjectId(subject_id)
+    collection = model.get_pymongo_collection()
+    if await collection.find_one({"_id": subject_oid}, {"_id": 1}) is None:
+        return None
+
+    comment = CommentEntry(
+        id=PydanticObjectId(),
+        subject_type=subject_type,
+        subject_id=subject_id,
+        user_id=user_id,
+        user_email=user_email,
+        text=text,
+    )
+
+    # Comment first, so the parent's new revision (and ETag) never points
+    # at a thread without it
+    await comment.insert()
+
+    parent = await collection.find_one_and_update(
+        {"_id": subject_oid, COMMENTS_MOVED: True},
+        {
+            "$push": {"comments": {"$each": [comment.preview()], "$slice": -COMMENT_PREVIEW_SIZE}},
+            "$inc": {"comment_count": 1},
+            "$set": {"updated_at": comment.created_at, "revision": await next_revision(model)},
+        },
+        projection=projection,
+        return_document=ReturnDocument.AFTER,
+    )
+    if parent is not None:
+        return parent
+
+    legacy = await collection.find_one({"_id": subject_oid}, {"comments": 1})
+    if legacy is None:
+        await comment.delete()  # Deleted since the check above
+        return None
+
+    # Not moved yet: trimming the embedded thread would lose it. Moving it
+    # rebuilds the preview and count from the collection, which already
+    # holds the new comment.
+    await move_embedded_comments(model, subject_type, [legacy])
+    return await collection.find_one({"_id": legacy["_id"]}, projection)
+
+
+async def comment_page(
+    subject_type: str, subject_id: str, limit: int, position: Optional[Tuple] = None
+) -> Tuple[List[dict], Optional[str]]:
+    """One page of a thread, newest first, and the cursor of the next page"""
+    query = {"subject_type": subject_type, "subject_id": subject_id}
+    if position:
+        query.update(after_cursor(*position))
+
+    # One extra row tells whether there is a next page
+    comments = (
+        await CommentEntry.get_pymongo_collection()
+        .find(query, {"subject_type": 0, "subject_id": 0})
+        .sort(NEWEST_FIRST)
+        .limit(limit + 1)
+        .to_list(None)
+    )
+
+    next_cursor = None
+    if len(comments) > limit:
+        comments = comments[:limit]
+        next_cursor = encode_cursor(comments[-1]["created_at"], comments[-1]["_id"])
+    return comments, next_cursor
+
+
+def comment_id(subject_id: str, index: int, legacy_id) -> ObjectId:
+    """Stable _id for an embedded comment, so re-runs upsert the same document"""
+    if legacy_id and ObjectId.is_valid(legacy_id):
+        return ObjectId(legacy_id)
+    seed = f"{subject_id}:{legacy_id or index}".encode()
+    return ObjectId(hashlib.md5(seed).digest()[:12])
+
+
+async def move_embedded_comments(model, subject_type: str, parents: List[dict]) -> int:
+    """
+    Copy the embedded comments of parents (raw documents with `comments`)
+    into the collection, then cut each parent down to the latest
+    COMMENT_PREVIEW_SIZE, set `comment_count` from the collection and mark
+    it moved. Safe to repeat. Returns how many comments were copied.
+    """
+    comments = CommentEntry.get_pymongo_collection()
+    inserts = []
+    for parent in parents:
+        subject_id = str(parent["_id"])
+        for i, c in enumerate(parent.get("comments") or []):
+            doc = {
+                "subject_type": subject_type,
+                "subject_id": subject_id,
+                "user_id": c["user_id"],
+                "user_email": c["user_email"],
+                "text": c["text"],
+                "created_at": c["created_at"],
+            }
+            inserts.append(
+                UpdateOne({"_id": comment_id(subject_id, i, c.get("id"))}, {"$setOnInsert": doc}, upsert=True)
+            )
+    moved = 0
+    if inserts:
+        result = await comments.bulk_write(inserts, ordered=False)
+        moved = result.upserted_count
+
+    # Rebuild counts and previews from the collection, which also holds
+    # comments posted through the API since the parent was read
+    revision = await next_revision(model)
+    updates = []
+    for parent in parents:
+        query = {"subject_type": subject_type, "subject_id": str(parent["_id"])}
+        latest = (
+            await comments.find(query, {"subject_type": 0, "subject_id": 0})
+            .sort(NEWEST_FIRST)
+            .limit(COMMENT_PREVIEW_SIZE)
+            .to_list(None)
+        )
+        preview = [{"id": str(c.pop("_id")), **c} for c in reversed(latest)]
+        updates.append(
+            UpdateOne(
+                {"_id": parent["_id"]},
+                {"$set": {
+                    "comments": preview,
+                    "comment_count": await comments.count_documents(query),
+                    "revision": revision,
+                    COMMENTS_MOVED: True,
+                }},
+            )
+        )
+    if updates:
+        await model.get_pymongo_collection().bulk_write(updates, ordered=False)
+    return moved
@@ -0,0 +1,91 @@
+"""
+Database Service
+
+Creates the MongoDB client and initializes Beanie. Shared by the FastAPI
+lifespan and the standalone scripts under app/migrations.
+
+Indexes are declared in each model's Settings and created (idempotently)
+by init_beanie. Bump INDEX_SET_VERSION when an index is renamed or removed:
+the next startup then also drops indexes that are no longer declared.
+A database without a recorded version only gets the version recorded;
+its undeclared indexes are logged, not dropped, since they may have been
+created by hand.
+"""
+
+import os
+from typing import List, cast
+from dotenv import load_dotenv
+from pymongo import AsyncMongoClient, IndexModel
+from beanie import init_beanie
+from beanie.odm.settings.document import IndexModelField
+from beanie.odm.utils.pydantic import get_model_fields
+from beanie.odm.utils.typing import get_index_attributes
+
+from app.models.user_model import User
+from app.models.incident_model import Incident
+from app.models.region_model import Region
+from app.models.comment_model import CommentEntry
+
+load_dotenv()
+
+MONGODB_URI = os.getenv("MONGODB_URI")
+DB_NAME = os.getenv("DB_NAME")
+
+DOCUMENT_MODELS = [User, Incident, Region, CommentEntry]
+
+INDEX_SET_VERSION = 1
+META_COLLECTION = "schema_meta"
+
+
+async def init_database() -> AsyncMongoClient:
+    """Connect to MongoDB, initialize Beanie and create declared indexes"""
+    client = AsyncMongoClient(MONGODB_URI)
+    db = client[cast(str, DB_NAME)]
+
+    meta = db[META_COLLECTION]
+    applied = await meta.find_one({"_id": "indexes"})
+    version = applied.get("version") if applied else None
+
+    # Only drop undeclared indexes when a recorded declared set changed
+    upgrade = version is not None and version != INDEX_SET_VERSION
+    await init_beanie(
+        database=db, document_models=DOCUMENT_MODELS, allow_index_dropping=upgrade
+    )
+
+    if version is None:
+        for model in DOCUMENT_MODELS:
+            names = await undeclared_indexes(model)
+            if names:
+                print(
+                    f"Undeclared indexes on {model.get_collection_name()} (not dropped): "
+                    f"{', '.join(names)}"
+                )
+
+    if version != INDEX_SET_VERSION:
+        await meta.update_one(
+            {"_id": "indexes"}, {"$set": {"version": INDEX_SET_VERSION}}, upsert=True
+        )
+        if upgrade:
+            print(f"Index set upgraded to version {INDEX_SET_VERSION}")
+        else:
+            print(f"Index set version {INDEX_SET_VERSION} recorded")
+    return client
+
+
+async def undeclared_indexes(model) -> List[str]:
+    """Names of indexes on a model's collection that the model doesn't declare"""
+    declared = [
+        IndexModelField(IndexModel([(field.alias or name, attrs[0])], **attrs[1]))
+        for name, field in get_model_fields(model).items()
+        if (attrs := get_index_attributes(field)) is not None
+    ]
+    declared = IndexModelField.merge_indexes(declared, model.get_settings().indexes or [])
+    existing = IndexModelField.from_pymongo_index_information(
+        await model.get_pymongo_collection().index_information()
+    )
+    # Compared by key only: the server reports options (e.g. 2dsphereIndexVersion) models don't declare
+    return [
+        index.name
+        for index in existing
+        if IndexModelField.find_index_with_the_same_fields(declared, index) is None
+    ]
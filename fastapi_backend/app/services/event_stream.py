@@ -0,0 +1,213 @@
+"""
+Event Stream
+
+Pushes change_hub events to dashboards as server-sent events, so they can
+refetch only what changed instead of polling the full lists.
+
+Each subscriber has a bounded queue and a filter (bbox, region ids, kinds)
+that is applied when the event is published, so unrelated events are never
+queued. Publishing never blocks: when a slow client's queue is full it is
+marked as lagging, its backlog is dropped and it gets a single "resync"
+event telling it to refetch. Recent events are kept for replay so a client
+reconnecting with Last-Event-ID doesn't miss anything.
+
+Event ids are "<boot>:<seq>", where boot is random per process. A
+Last-Event-ID from another worker or from before a restart can't be
+compared with this process's sequence, so it gets a resync instead.
+
+Events are per process: with several workers each stream only sees writes
+handled by its own worker.
+"""
+
+import asyncio
+import os
+import uuid
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, FrozenSet, NamedTuple, Optional
+import orjson
+
+from app.services.change_events import Bounds, ChangeEvent, change_hub
+from app.services.region_index import region_index
+
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "100"))
+EVENT_MAX_SUBSCRIBERS = int(os.getenv("EVENT_MAX_SUBSCRIBERS", "1000"))
+EVENT_REPLAY_SIZE = int(os.getenv("EVENT_REPLAY_SIZE", "500"))
+EVENT_HEARTBEAT_SECONDS = float(os.getenv("EVENT_HEARTBEAT_SECONDS", "15"))
+
+RETRY_MS = 5000  # Client reconnect delay
+
+
+class EventFilter(NamedTuple):
+    bbox: Optional[Bounds] = None
+    region_ids: Optional[FrozenSet[str]] = None
+    kinds: Optional[FrozenSet[str]] = None
+
+    def matches(self, kind: str, region_id: Optional[str], bounds: Optional[Bounds]) -> bool:
+        if self.kinds is not None and kind not in self.kinds:
+            return False
+        if self.region_ids is not None and region_id not in self.region_ids:
+            return False
+        if self.bbox is not None:
+            # Events without a location can't be placed, so they're kept
+            if bounds is not None and not _intersects(bounds, self.bbox):
+                return False
+        return True
+
+
+class _Published(NamedTuple):
+    seq: int
+    kind: str
+    region_id: Optional[str]
+    bounds: Optional[Bounds]
+    frame: bytes
+
+
+class Subscriber:
+    def __init__(self, event_filter: EventFilter):
+        self.filter = event_filter
+        self.queue: asyncio.Queue = asyncio.Queue(EVENT_QUEUE_SIZE)
+        self.lagging = False
+
+
+class SubscriberLimitError(Exception):
+    pass
+
+
+class EventStream:
+    """Fans change events out to SSE subscribers"""
+
+    def __init__(self):
+        self.boot = uuid.uuid4().hex[:12]
+        self.seq = 0
+        self.delivered = 0
+        self.resyncs = 0
+        self._subscribers: set = set()
+        self._recent: deque = deque(maxlen=EVENT_REPLAY_SIZE)
+
+    def on_change(self, event: ChangeEvent):
+        self.seq += 1
+        # Aggregate updates are published without a footprint; regions are indexed
+        bounds = event.bounds or region_index.bounds(event.region_id)
+        payload = {
+            "kind": event.kind,
+            "action": event.action,
+            "id": event.id,
+            "region_id": event.region_id,
+            "bounds": bounds,
+            "at": event.created_at,
+        }
+        published = _Published(
+            self.seq, event.kind, event.region_id, bounds, self._frame(self.seq, "change", payload)
+        )
+        self._recent.append(published)
+
+        for subscriber in list(self._subscribers):
+            self._offer(subscriber, published)
+
+    def subscribe(self, event_filter: EventFilter, last_event_id: Optional[str] = None) -> Subscriber:
+        """Register a subscriber, replaying what it missed since last_event_id"""
+        if len(self._subscribers) >= EVENT_MAX_SUBSCRIBERS:
+            raise SubscriberLimitError("Too many event stream subscribers")
+
+        subscriber = Subscriber(event_filter)
+        if last_event_id is not None:
+            last_seen = self._own_seq(last_event_id)
+            oldest = self._recent[0].seq if self._recent else self.seq + 1
+            if last_seen is None or last_seen > self.seq or last_seen + 1 < oldest <= self.seq:
+                # Another process's id, or a gap older than the replay buffer
+                subscriber.lagging = True
+                self.resyncs += 1
+            else:
+                for published in self._recent:
+                    if published.seq > last_seen:
+                        self._offer(subscriber, published)
+
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self._subscribers.discard(subscriber)
+
+    def full(self) -> bool:
+        return len(self._subscribers) >= EVENT_MAX_SUBSCRIBERS
+
+    async def frames(
+        self,
+        event_filter: EventFilter,
+        last_event_id: Optional[str],
+        is_disconnected: Callable[[], Awaitable[bool]],
+    ) -> AsyncIterator[bytes]:
+        """
+        SSE frames for one subscriber, with heartbeats, until it disconnects.
+        The subscriber is registered when the stream starts, so it is always
+        removed again, even if the client left before the first frame.
+        """
+        try:
+            subscriber = self.subscribe(event_filter, last_event_id)
+        except SubscriberLimitError:
+            return  # Filled up since the request was accepted; the client retries
+
+        try:
+            yield f"retry: {RETRY_MS}\n\n".encode()
+            while True:
+                if subscriber.lagging:
+                    while not subscriber.queue.empty():
+                        subscriber.queue.get_nowait()
+                    subscriber.lagging = False
+                    yield self._frame(self.seq, "resync", {})
+                    continue
+
+                try:
+                    frame = await asyncio.wait_for(subscriber.queue.get(), EVENT_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await is_disconnected():
+                        return
+                    yield b": keep-alive\n\n"
+                    continue
+
+                if not subscriber.lagging:
+                    self.delivered += 1
+                    yield frame
+        finally:
+            self.unsubscribe(subscriber)
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self._subscribers),
+            "max_subscribers": EVENT_MAX_SUBSCRIBERS,
+            "published": self.seq,
+            "delivered": self.delivered,
+            "resyncs": self.resyncs,
+            "max_queue_depth": max((s.queue.qsize() for s in self._subscribers), default=0),
+        }
+
+    def _own_seq(self, event_id: str) -> Optional[int]:
+        """Sequence number of an event id issued by this process, else None"""
+        boot, _, seq = event_id.strip().partition(":")
+        if boot != self.boot or not seq.isdigit():
+            return None
+        return int(seq)
+
+    def _frame(self, seq: int, event: str, payload: dict) -> bytes:
+        return b"id: %s:%d\nevent: %s\ndata: %s\n\n" % (
+            self.boot.encode(), seq, event.encode(), orjson.dumps(payload)
+        )
+
+    def _offer(self, subscriber: Subscriber, published: _Published):
+        if subscriber.lagging:
+            return
+        if not subscriber.filter.matches(published.kind, published.region_id, published.bounds):
+            return
+        try:
+            subscriber.queue.put_nowait(published.frame)
+        except asyncio.QueueFull:
+            subscriber.lagging = True
+            self.resyncs += 1
+
+
+def _intersects(a: Bounds, b: Bounds) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+event_stream = EventStream()
+change_hub.subscribe(event_stream.on_change)
@@ -0,0 +1,73 @@
+"""
+Region Geometry Cache
+
+Bounded LRU cache of parsed, validated, buffered and prepared region
+footprints, so overlap checks only build the incoming geometry per request.
+Entries are keyed by region id and rebuilt when the region's
+`geometry_hash` (a digest of its coordinates, stored with the footprint)
+changes. `updated_at` and `revision` can't be used for that: every
+incident write bumps them through the region aggregates.
+"""
+
+import os
+from collections import OrderedDict
+from typing import Optional, Tuple
+import shapely
+from shapely.geometry.base import BaseGeometry
+
+from app.utils.geometry import build_footprint, geometry_digest
+
+REGION_GEOMETRY_CACHE_SIZE = int(os.getenv("REGION_GEOMETRY_CACHE_SIZE", "1024"))
+
+
+class PreparedGeometryCache:
+    """LRU of region id -> (geometry version, prepared footprint)"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[str, Optional[BaseGeometry]]]" = OrderedDict()
+
+    def get(self, region) -> Optional[BaseGeometry]:
+        """Return the prepared footprint of a region, building it on a miss"""
+        region_id = str(region.id)
+        # Regions saved before geometry_hash existed are hashed here
+        version = region.geometry_hash or geometry_digest(region.coordinates)
+        entry = self._entries.get(region_id)
+
+        if entry is not None and entry[0] == version:
+            self.hits += 1
+            self._entries.move_to_end(region_id)
+            return entry[1]
+
+        self.misses += 1
+        geom = build_footprint(region.coordinates)
+        if geom is not None:
+            shapely.prepare(geom)
+
+        self._entries[region_id] = (version, geom)
+        self._entries.move_to_end(region_id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+        return geom
+
+    def invalidate(self, region_id: str):
+        self._entries.pop(region_id, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+region_geometry_cache = PreparedGeometryCache(REGION_GEOMETRY_CACHE_SIZE)
@@ -0,0 +1,170 @@
+"""
+Image Pipeline
+
+Generates thumbnail and medium WebP variants of uploaded images in a
+process pool, off the request path. The upload endpoint submits each new
+image and returns straight away; when the variants are written they are
+recorded on every incident that references the image. Incidents created
+after that pick up the existing variants directly.
+
+Variant files are named after the original's content hash (see
+app/utils/image_variants.py), so they are immutable too.
+
+Workers are started with forkserver (spawn where it isn't available)
+rather than fork: forking the running server would copy its event loop,
+Mongo client and threads into every worker.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional
+from starlette.concurrency import run_in_threadpool
+
+from app.models.incident_model import ImageVariants, Incident, IncidentScoring
+from app.services.change_events import change_hub
+from app.services.image_store import CONTENT_ADDRESSED_NAME, UPLOAD_DIR, StoredImage
+from app.services.revisions import next_revision
+from app.utils.image_variants import VARIANT_SIZES, render_variants, variant_filename
+
+IMAGE_VARIANT_WORKERS = int(os.getenv("IMAGE_VARIANT_WORKERS", "2"))
+WORKER_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+class ImagePipeline:
+    """Renders image variants in worker processes and records them on incidents"""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._jobs: Dict[str, asyncio.Task] = {}  # Original URL -> running job
+
+        # Metrics
+        self.submitted = 0
+        self.rendered = 0
+        self.failed = 0
+        self.original_bytes = 0
+        self.variant_bytes = 0
+        self._render_seconds = 0.0
+
+    def submit(self, stored: StoredImage):
+        """Render the variants of a stored upload in the background"""
+        if stored.url in self._jobs:
+            return
+        self.submitted += 1
+        job = asyncio.create_task(self._render(stored))
+        self._jobs[stored.url] = job
+        job.add_done_callback(lambda _: self._jobs.pop(stored.url, None))
+
+    async def ready_variants(self, urls: Iterable[str]) -> List[ImageVariants]:
+        """Variants already rendered for these image URLs"""
+        return await run_in_threadpool(_ready_variants, list(urls))
+
+    async def record_late_variants(self, incidents: List[Incident]):
+        """
+        Record variants that finished rendering while these incidents were
+        being inserted; the jobs' own update may have run just before.
+        """
+        for incident in incidents:
+            covered = {v.original for v in incident.image_variants}
+            missing = [url for url in incident.images or [] if url not in covered]
+            if not missing:
+                continue
+            for variants in await self.ready_variants(missing):
+                await record_variants(variants)
+                incident.image_variants.append(variants)
+
+    async def stop(self):
+        """Wait for running jobs, then shut the worker processes down"""
+        if self._jobs:
+            await asyncio.gather(*self._jobs.values(), return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "pending": len(self._jobs),
+            "submitted": self.submitted,
+            "rendered": self.rendered,
+            "failed": self.failed,
+            "avg_render_ms": round(self._render_seconds / self.rendered * 1000, 1) if self.rendered else 0.0,
+            # Bytes of rendered variants per byte of original
+            "variant_byte_ratio": round(self.variant_bytes / self.original_bytes, 4) if self.original_bytes else 0.0,
+        }
+
+    async def _render(self, stored: StoredImage):
+        if not CONTENT_ADDRESSED_NAME.match(stored.filename):
+            return
+        try:
+            if not await self.ready_variants([stored.url]):
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        self.workers, mp_context=multiprocessing.get_context(WORKER_START_METHOD)
+                    )
+
+                started = time.perf_counter()
+                _, written = await asyncio.get_running_loop().run_in_executor(
+                    self._executor,
+                    render_variants,
+                    os.path.join(UPLOAD_DIR, stored.filename),
+                    UPLOAD_DIR,
+                    stored.sha256,
+                )
+                self._render_seconds += time.perf_counter() - started
+                self.rendered += 1
+                self.original_bytes += stored.size
+                self.variant_bytes += written
+
+            # Incidents may already reference this image (uploaded, then reported quickly)
+            await record_variants(variant_urls(stored.url, stored.sha256))
+        except Exception as e:
+            print(f"Error rendering image variants: {e}")
+            self.failed += 1
+
+
+def variant_urls(url: str, sha256: str) -> ImageVariants:
+    base = url.rsplit("/", 1)[0]
+    return ImageVariants(
+        original=url,
+        **{name: f"{base}/{variant_filename(sha256, name)}" for name in VARIANT_SIZES},
+    )
+
+
+async def record_variants(variants: ImageVariants):
+    """Add variants to every incident showing the original that doesn't list them yet"""
+    query = {"images": variants.original, "image_variants.original": {"$ne": variants.original}}
+    incidents = await Incident.find(query).project(IncidentScoring).to_list()
+    if not incidents:
+        return
+
+    await Incident.get_pymongo_collection().update_many(
+        {**query, "_id": {"$in": [incident.id for incident in incidents]}},
+        {
+            "$push": {"image_variants": variants.model_dump()},
+            "$set": {"revision": await next_revision(Incident)},
+        },
+    )
+    for incident in incidents:
+        change_hub.incident_changed(incident)
+
+
+def _ready_variants(urls: List[str]) -> List[ImageVariants]:
+    ready = []
+    for url in urls:
+        filename = url.rsplit("/", 1)[-1]
+        if not url.startswith("/uploads/") or not CONTENT_ADDRESSED_NAME.match(filename):
+            continue  # Legacy upload or external URL
+        sha256 = filename[:64]
+        if all(
+            os.path.exists(os.path.join(UPLOAD_DIR, variant_filename(sha256, name)))
+            for name in VARIANT_SIZES
+        ):
+            ready.append(variant_urls(url, sha256))
+    return ready
+
+
+image_pipeline = ImagePipeline(IMAGE_VARIANT_WORKERS)
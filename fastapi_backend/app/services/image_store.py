@@ -0,0 +1,140 @@
+"""
+Image Store
+
+Content-addressed storage for uploaded images. Uploads are streamed in
+chunks to a temporary file, hashed with SHA-256 as they arrive and
+rejected as soon as they pass MAX_UPLOAD_BYTES. The file is then renamed
+to `<sha256><ext>`, so a photo attached to several reports is stored once.
+All file I/O runs in the threadpool.
+
+Content-addressed files never change, so they are served with a one-year
+immutable Cache-Control (see UploadStaticFiles).
+"""
+
+import hashlib
+import os
+import re
+import uuid
+from typing import AsyncIterator, NamedTuple, Optional
+from starlette.concurrency import run_in_threadpool
+from starlette.staticfiles import StaticFiles
+
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads")
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_CHUNK_BYTES = 256 * 1024
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Content type -> stored extension
+IMAGE_TYPES = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+}
+IMAGE_EXTENSIONS = {".jpeg": ".jpg", **{ext: ext for ext in IMAGE_TYPES.values()}}
+
+# <sha256><ext>, or a derived variant <sha256>-<variant><ext>
+CONTENT_ADDRESSED_NAME = re.compile(r"^[0-9a-f]{64}(-[a-z0-9]+)?(\.[a-z0-9]+)?$")
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class UnsupportedImageType(Exception):
+    pass
+
+
+class StoredImage(NamedTuple):
+    sha256: str
+    filename: str
+    size: int
+    duplicate: bool  # Same content was already stored
+
+    @property
+    def url(self) -> str:
+        return f"/uploads/{self.filename}"
+
+
+def image_extension(content_type: Optional[str], filename: Optional[str]) -> str:
+    """Stored extension for an upload, from its content type or else its file name"""
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in IMAGE_TYPES:
+        return IMAGE_TYPES[media_type]
+
+    ext = os.path.splitext(filename or "")[1].lower()
+    if ext in IMAGE_EXTENSIONS:
+        return IMAGE_EXTENSIONS[ext]
+    raise UnsupportedImageType(f"Unsupported image type, expected one of {', '.join(sorted(IMAGE_TYPES))}")
+
+
+async def store_image(
+    chunks: AsyncIterator[bytes], content_type: Optional[str], filename: Optional[str] = None
+) -> StoredImage:
+    """Stream an upload to disk under its content hash"""
+    ext = image_extension(content_type, filename)
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+
+    tmp_path = os.path.join(UPLOAD_DIR, f".upload-{uuid.uuid4().hex}")
+    digest = hashlib.sha256()
+    size = 0
+    out = await run_in_threadpool(open, tmp_path, "wb")
+    try:
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > MAX_UPLOAD_BYTES:
+                    raise UploadTooLarge(f"Image exceeds {MAX_UPLOAD_BYTES} bytes")
+                await run_in_threadpool(_write_chunk, out, digest, chunk)
+        finally:
+            await run_in_threadpool(out.close)
+
+        name = f"{digest.hexdigest()}{ext}"
+        duplicate = await run_in_threadpool(_publish, tmp_path, os.path.join(UPLOAD_DIR, name))
+    except BaseException:
+        await run_in_threadpool(_remove, tmp_path)
+        raise
+
+    return StoredImage(digest.hexdigest(), name, size, duplicate)
+
+
+async def upload_chunks(upload) -> AsyncIterator[bytes]:
+    """Chunks of a multipart UploadFile"""
+    while True:
+        chunk = await upload.read(UPLOAD_CHUNK_BYTES)
+        if not chunk:
+            return
+        yield chunk
+
+
+class UploadStaticFiles(StaticFiles):
+    """StaticFiles that marks content-addressed uploads as immutable"""
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if CONTENT_ADDRESSED_NAME.match(os.path.basename(full_path)):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+
+def _write_chunk(out, digest, chunk: bytes):
+    # Hashing here too keeps large chunks off the event loop
+    digest.update(chunk)
+    out.write(chunk)
+
+
+def _publish(tmp_path: str, path: str) -> bool:
+    """Move the temporary file into place. Returns True if the content was already stored."""
+    if os.path.exists(path):
+        os.remove(tmp_path)
+        return True
+    os.replace(tmp_path, path)
+    return False
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,98 @@
+"""
+Password Hasher
+
+Runs bcrypt in a dedicated thread pool so hashing and verifying passwords
+doesn't block the event loop (bcrypt releases the GIL while it works).
+At most PASSWORD_HASH_WORKERS hashes run at once; further calls wait their
+turn, and once PASSWORD_HASH_MAX_WAITING calls are already waiting new ones
+are rejected with PasswordHasherBusy instead of piling up behind a login
+spike.
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from app.utils.auth import hash_password, verify_password
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_WAITING = int(os.getenv("PASSWORD_HASH_MAX_WAITING", "64"))
+
+
+class PasswordHasherBusy(Exception):
+    pass
+
+
+class PasswordHasher:
+    """Bounded bcrypt worker pool"""
+
+    def __init__(self, workers: int, max_waiting: int):
+        self.workers = workers
+        self.max_waiting = max_waiting
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots = asyncio.Semaphore(workers)
+
+        # Metrics
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.max_waiting_seen = 0
+        self._wait_seconds = 0.0
+        self._work_seconds = 0.0
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run(verify_password, password, hashed)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "running": self.running,
+            "waiting": self.waiting,
+            "max_waiting": self.max_waiting,
+            "max_waiting_seen": self.max_waiting_seen,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self._wait_seconds / self.completed * 1000, 3) if self.completed else 0.0,
+            "avg_hash_ms": round(self._work_seconds / self.completed * 1000, 3) if self.completed else 0.0,
+        }
+
+    async def _run(self, fn, *args):
+        if self.waiting >= self.max_waiting:
+            self.rejected += 1
+            raise PasswordHasherBusy("Too many password checks in progress, try again shortly")
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="bcrypt")
+
+        queued = time.perf_counter()
+        self.waiting += 1
+        self.max_waiting_seen = max(self.max_waiting_seen, self.waiting)
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        started = time.perf_counter()
+        self.running += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self.running -= 1
+            self._slots.release()
+            self.completed += 1
+            self._wait_seconds += started - queued
+            self._work_seconds += time.perf_counter() - started
+
+
+password_hasher = PasswordHasher(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_WAITING)
@@ -0,0 +1,185 @@
+"""
+Region Recalculation Queue
+
+Coalescing background queue for region aggregate updates. Write endpoints
+submit a RegionStatsDelta and return; pending deltas for the same region
+are merged, and after a debounce window each region gets a single atomic
+update, with bounded concurrency, off the request path.
+
+A failed update is retried on its own with exponential backoff, never
+merged with newer deltas, and dropped (logged) after RECALC_MAX_ATTEMPTS;
+recalculate_region_stats repairs what was lost.
+"""
+
+import asyncio
+import os
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+from app.models.region_model import Region, RegionStatsDelta
+from app.services.change_events import change_hub
+
+RECALC_DEBOUNCE_SECONDS = float(os.getenv("RECALC_DEBOUNCE_SECONDS", "0.5"))
+RECALC_CONCURRENCY = int(os.getenv("RECALC_CONCURRENCY", "4"))
+RECALC_MAX_ATTEMPTS = int(os.getenv("RECALC_MAX_ATTEMPTS", "5"))
+RECALC_MAX_BACKOFF_SECONDS = float(os.getenv("RECALC_MAX_BACKOFF_SECONDS", "60"))
+
+
+class _Retry(NamedTuple):
+    region_id: str
+    delta: RegionStatsDelta
+    enqueued_at: float
+    attempts: int
+    due: float  # time.monotonic()
+
+
+class RegionRecalcQueue:
+    """Deduplicates pending region updates and applies them in the background"""
+
+    def __init__(self, debounce: float, concurrency: int):
+        self.debounce = debounce
+        self.concurrency = concurrency
+        self._pending: Dict[str, RegionStatsDelta] = {}
+        self._enqueued_at: Dict[str, float] = {}  # When each pending region was first submitted
+        self._retries: List[_Retry] = []  # Failed updates, kept apart from fresh deltas
+        self._wakeup = asyncio.Event()
+        self._worker: Optional[asyncio.Task] = None
+        self._stopping = False
+
+        # Metrics
+        self.submitted = 0
+        self.coalesced = 0
+        self.applied = 0
+        self.failed = 0
+        self.dropped = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    def start(self):
+        if self.running:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the worker after applying everything still pending"""
+        if not self.running:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._worker
+        self._worker = None
+
+    async def submit(self, region_id: str, delta: RegionStatsDelta):
+        """
+        Queue a change to a region's aggregates. Returns immediately while
+        the worker runs; applies inline when it doesn't (scripts, shutdown).
+        """
+        if delta.is_empty():
+            return
+
+        self.submitted += 1
+
+        if not self.running or self._stopping:
+            await Region.apply_stats_delta(region_id, delta)
+            self.applied += 1
+            change_hub.region_changed(region_id)
+            return
+
+        self._merge(region_id, delta, time.monotonic())
+        self._wakeup.set()
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        oldest = min(self._enqueued_at.values(), default=None)
+        return {
+            "running": self.running,
+            "depth": len(self._pending),
+            "oldest_pending_seconds": now - oldest if oldest is not None else 0.0,
+            "submitted": self.submitted,
+            "coalesced": self.coalesced,
+            "applied": self.applied,
+            "failed": self.failed,
+            "retrying": len(self._retries),
+            "dropped": self.dropped,
+            "last_lag_seconds": self.last_lag,
+            "max_lag_seconds": self.max_lag,
+            "debounce_seconds": self.debounce,
+            "concurrency": self.concurrency,
+        }
+
+    def _merge(self, region_id: str, delta: RegionStatsDelta, enqueued_at: float):
+        pending = self._pending.get(region_id)
+        if pending is None:
+            self._pending[region_id] = delta
+            self._enqueued_at[region_id] = enqueued_at
+        else:
+            self.coalesced += 1
+            pending.merge(delta)
+            self._enqueued_at[region_id] = min(self._enqueued_at[region_id], enqueued_at)
+
+    async def _run(self):
+        while True:
+            timeout = None
+            if self._retries:
+                timeout = max(0.0, min(r.due for r in self._retries) - time.monotonic())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+                woken = True
+            except asyncio.TimeoutError:
+                woken = False  # A retry is due
+            if woken and not self._stopping:
+                await asyncio.sleep(self.debounce)
+            self._wakeup.clear()
+
+            pending, self._pending = self._pending, {}
+            enqueued_at, self._enqueued_at = self._enqueued_at, {}
+            # On stop, failed updates get one last attempt
+            now = time.monotonic()
+            retries = [r for r in self._retries if self._stopping or r.due <= now]
+            self._retries = [r for r in self._retries if not (self._stopping or r.due <= now)]
+
+            jobs = [_Retry(region_id, delta, enqueued_at[region_id], 0, now) for region_id, delta in pending.items()]
+            if jobs or retries:
+                await self._flush(jobs + retries)
+
+            if self._stopping and not self._pending:
+                return
+
+    async def _flush(self, jobs: List[_Retry]):
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def apply(job: _Retry):
+            async with semaphore:
+                try:
+                    await Region.apply_stats_delta(job.region_id, job.delta)
+                except Exception as e:
+                    self.failed += 1
+                    attempts = job.attempts + 1
+                    if self._stopping or attempts >= RECALC_MAX_ATTEMPTS:
+                        self.dropped += 1
+                        print(
+                            f"Error updating region stats, dropping delta for region {job.region_id} "
+                            f"after {attempts} attempts ({job.delta}): {e}"
+                        )
+                        return
+                    print(f"Error updating region stats (attempt {attempts}): {e}")
+                    backoff = min(self.debounce * 2 ** attempts, RECALC_MAX_BACKOFF_SECONDS)
+                    self._retries.append(job._replace(attempts=attempts, due=time.monotonic() + backoff))
+                    return
+
+                self.applied += 1
+                change_hub.region_changed(job.region_id)
+                lag = time.monotonic() - job.enqueued_at
+                self.last_lag = lag
+                self.max_lag = max(self.max_lag, lag)
+
+        await asyncio.gather(*(apply(job) for job in jobs))
+
+
+recalc_queue = RegionRecalcQueue(RECALC_DEBOUNCE_SECONDS, RECALC_CONCURRENCY)
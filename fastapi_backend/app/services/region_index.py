@@ -0,0 +1,156 @@
+"""
+Region Spatial Index
+
+In-process STRtree over region footprints. Region matching queries the tree
+for bounding-box candidates and only runs the exact overlap test on those.
+
+The tree is per process: regions inserted by other workers are picked up by
+refresh(). Ids and created_at come from each worker's own clock, so neither
+orders inserts across workers; refresh() looks back REGION_INDEX_REFRESH_WINDOW
+seconds from the newest created_at it has seen and loads any region in that
+window it doesn't know yet.
+
+Regions are never deleted by the API. Callers load the candidate regions by
+id, so a region removed by hand simply drops out until the next build().
+"""
+
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple, Union
+import numpy as np
+import shapely
+from bson import ObjectId
+from shapely import STRtree
+from shapely.geometry.base import BaseGeometry
+
+from app.models.region_model import Region, RegionShape
+from app.utils.geometry import build_footprint
+
+REBUILD_THRESHOLD = 64  # Pending inserts scanned linearly before a rebuild
+# Covers clock skew between workers and inserts that land after their created_at
+REGION_INDEX_REFRESH_WINDOW = timedelta(
+    seconds=float(os.getenv("REGION_INDEX_REFRESH_WINDOW_SECONDS", "300"))
+)
+
+
+class RegionSpatialIndex:
+    """STRtree-backed lookup of region ids by footprint"""
+
+    def __init__(self):
+        self._tree: Optional[STRtree] = None
+        self._tree_ids: List[str] = []
+        self._pending: Dict[str, BaseGeometry] = {}  # Inserted since the last rebuild
+        self._geometries: Dict[str, BaseGeometry] = {}
+        self._newest: Optional[datetime] = None  # Newest created_at indexed
+        self._recent: Dict[str, datetime] = {}  # Indexed ids created within the window of _newest
+
+    def __len__(self) -> int:
+        return len(self._geometries)
+
+    async def build(self):
+        """Load every region and build the tree from scratch"""
+        self._geometries = {}
+        self._pending = {}
+        self._newest = None
+        self._recent = {}
+
+        regions = await Region.find().project(RegionShape).to_list()
+        for region in regions:
+            self._track(region)
+
+        self._rebuild()
+
+    async def refresh(self):
+        """Index regions inserted since the last build/refresh (e.g. by another worker)"""
+        query = {}
+        if self._newest is not None:
+            since = self._newest - REGION_INDEX_REFRESH_WINDOW
+            self._recent = {r: t for r, t in self._recent.items() if t >= since}
+            query = {
+                "created_at": {"$gte": since},
+                "_id": {"$nin": [ObjectId(r) for r in self._recent]},
+            }
+        regions = await Region.find(query).project(RegionShape).to_list()
+        for region in regions:
+            self.add(region)
+
+    def add(self, region: Union[Region, RegionShape]):
+        """Index a newly inserted region"""
+        geom = self._track(region)
+        if geom is None:
+            return
+
+        self._pending[str(region.id)] = geom
+
+        if len(self._pending) > REBUILD_THRESHOLD:
+            self._rebuild()
+
+    def bounds(self, region_id: Optional[str]) -> Optional[Tuple[float, float, float, float]]:
+        """Footprint bounds of an indexed region, None if it isn't indexed"""
+        geom = self._geometries.get(region_id) if region_id else None
+        return tuple(geom.bounds) if geom is not None else None
+
+    def query(self, geom: BaseGeometry) -> List[str]:
+        """
+        Return ids of regions whose bounding box intersects geom,
+        oldest region first.
+        """
+        candidates = set()
+
+        if self._tree is not None:
+            for idx in self._tree.query(geom):
+                candidates.add(self._tree_ids[idx])
+
+        for region_id, region_geom in self._pending.items():
+            if _bounds_intersect(region_geom.bounds, geom.bounds):
+                candidates.add(region_id)
+
+        return sorted(candidates, key=ObjectId)
+
+    def query_bulk(self, geoms: List[BaseGeometry]) -> List[Tuple[int, str]]:
+        """
+        Bounding-box candidates for many geometries at once.
+        Returns (index into geoms, region id) pairs.
+        """
+        pairs = []
+
+        if self._tree is not None and geoms:
+            input_idx, tree_idx = self._tree.query(geoms)
+            for i, t in zip(input_idx.tolist(), tree_idx.tolist()):
+                pairs.append((i, self._tree_ids[t]))
+
+        if self._pending and geoms:
+            bounds = shapely.bounds(geoms)
+            for region_id, region_geom in self._pending.items():
+                minx, miny, maxx, maxy = region_geom.bounds
+                hits = np.nonzero(
+                    (bounds[:, 0] <= maxx) & (minx <= bounds[:, 2])
+                    & (bounds[:, 1] <= maxy) & (miny <= bounds[:, 3])
+                )[0]
+                pairs.extend((i, region_id) for i in hits.tolist())
+
+        return pairs
+
+    def _track(self, region: Union[Region, RegionShape]) -> Optional[BaseGeometry]:
+        created_at = region.created_at or region.id.generation_time.replace(tzinfo=None)
+        if self._newest is None or created_at > self._newest:
+            self._newest = created_at
+        self._recent[str(region.id)] = created_at
+
+        geom = build_footprint(region.coordinates)
+        if geom is not None:
+            self._geometries[str(region.id)] = geom
+        return geom
+
+    def _rebuild(self):
+        self._tree_ids = list(self._geometries.keys())
+        geoms = [self._geometries[region_id] for region_id in self._tree_ids]
+        self._tree = STRtree(geoms) if geoms else None
+        self._pending = {}
+
+
+def _bounds_intersect(a: tuple, b: tuple) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+region_index = RegionSpatialIndex()
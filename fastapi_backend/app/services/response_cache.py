@@ -0,0 +1,171 @@
+"""
+Response Cache
+
+Read-through cache of encoded read-endpoint responses (JSON bytes plus
+ETag), bounded by total bytes with LRU eviction and a TTL.
+
+Entries carry tags ("incident:<id>", "region:<id>", "region-incidents:<id>",
+"incidents", "regions"); change events from the write paths invalidate
+exactly the tags they affect. Concurrent misses for the same key share one
+load (single flight), and a load that overlaps an invalidation of its tags
+is returned but not stored. If the loading request is cancelled (its client
+went away), the requests waiting on it retry instead of failing with it. The TTL bounds staleness from writes handled by
+other worker processes.
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Hashable, Iterable, NamedTuple, Tuple
+
+from app.services.change_events import ChangeEvent, change_hub
+
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "30"))
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+
+
+class _LeaderCancelled(Exception):
+    """Set on an in-flight load whose own request was cancelled"""
+
+
+class _Entry(NamedTuple):
+    response: CachedResponse
+    tags: Tuple[str, ...]
+    expires_at: float
+
+
+class ResponseCache:
+    """Byte-bounded TTL + LRU cache with tag invalidation and single flight"""
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_bytes // 8  # Keep one huge response from flushing the rest
+        self.ttl = ttl
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidated = 0
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._tag_keys: Dict[str, set] = {}
+        self._tag_generations: Dict[str, int] = {}
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        tags: Iterable[str],
+        load: Callable[[], Awaitable[CachedResponse]],
+    ) -> CachedResponse:
+        """Return the cached response for key, loading it once on a miss"""
+        tags = tuple(tags)
+        while True:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at >= time.monotonic():
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                    return entry.response
+                self._remove(key)
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except _LeaderCancelled:
+                continue  # Check the cache again, or load it ourselves
+
+        self.misses += 1
+        generations = [self._tag_generations.get(tag, 0) for tag in tags]
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            response = await load()
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            future.exception()  # Mark retrieved when nobody else was waiting
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+        future.set_result(response)
+        if generations == [self._tag_generations.get(tag, 0) for tag in tags]:
+            self._store(key, tags, response)
+        return response
+
+    def invalidate(self, tags: Iterable[str]):
+        for tag in tags:
+            self._tag_generations[tag] = self._tag_generations.get(tag, 0) + 1
+            for key in list(self._tag_keys.get(tag, ())):
+                self._remove(key)
+                self.invalidated += 1
+
+    def on_change(self, event: ChangeEvent):
+        if event.kind == "incident":
+            tags = ["incidents", f"incident:{event.id}"]
+            if event.region_id:
+                tags.append(f"region-incidents:{event.region_id}")
+        else:
+            tags = ["regions", f"region:{event.id}"]
+        self.invalidate(tags)
+
+    def clear(self):
+        for key in list(self._entries):
+            self._remove(key)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "invalidated": self.invalidated,
+            "ttl_seconds": self.ttl,
+        }
+
+    def _store(self, key: Hashable, tags: Tuple[str, ...], response: CachedResponse):
+        size = len(response.body)
+        if size > self.max_entry_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = _Entry(response, tags, time.monotonic() + self.ttl)
+        self.bytes += size
+        for tag in tags:
+            self._tag_keys.setdefault(tag, set()).add(key)
+
+        while self.bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.bytes -= len(entry.response.body)
+        for tag in entry.tags:
+            keys = self._tag_keys.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_keys[tag]
+
+
+response_cache = ResponseCache(RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_TTL_SECONDS)
+change_hub.subscribe(response_cache.on_change)
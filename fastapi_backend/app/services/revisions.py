@@ -0,0 +1,43 @@
+"""
+Revision Counters
+
+One monotonic counter per collection, stored in the `revisions` collection.
+Every write to a document takes the next value as the document's `revision`,
+so a document's revision only grows, and the counter itself is the
+collection's high-water mark: it changes whenever any document in the
+collection is written or deleted. Both back the ETags of the read endpoints.
+"""
+
+from typing import Optional
+from pymongo import ReturnDocument
+
+REVISIONS_COLLECTION = "revisions"
+
+
+def _counters(model):
+    return model.get_pymongo_collection().database[REVISIONS_COLLECTION]
+
+
+async def next_revision(model) -> int:
+    """Advance a collection's counter and return the new value"""
+    counter = await _counters(model).find_one_and_update(
+        {"_id": model.get_collection_name()},
+        {"$inc": {"revision": 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return counter["revision"]
+
+
+async def collection_revision(model) -> int:
+    """Current high-water mark of a collection, 0 if it was never written"""
+    counter = await _counters(model).find_one({"_id": model.get_collection_name()})
+    return counter["revision"] if counter else 0
+
+
+async def document_revision(model, doc_id) -> Optional[int]:
+    """A document's revision without loading it, None if it doesn't exist"""
+    doc = await model.get_pymongo_collection().find_one({"_id": doc_id}, {"revision": 1})
+    if doc is None:
+        return None
+    return doc.get("revision", 0)
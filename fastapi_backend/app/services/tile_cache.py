@@ -0,0 +1,103 @@
+"""
+Vector Tile Cache
+
+Bounded LRU of encoded vector tiles. Entries are dropped when a change event
+touches them: a region shown in the tile changed (score, stats), or a
+region/incident was created, updated or deleted inside the tile's bounds.
+A TTL bounds staleness from score decay and from writes handled by other
+worker processes, which publish on their own hub.
+"""
+
+import os
+import time
+from collections import OrderedDict
+from typing import FrozenSet, NamedTuple, Optional, Tuple
+
+from app.services.change_events import Bounds, ChangeEvent, change_hub
+
+TILE_CACHE_SIZE = int(os.getenv("TILE_CACHE_SIZE", "2048"))
+TILE_CACHE_TTL_SECONDS = float(os.getenv("TILE_CACHE_TTL_SECONDS", "300"))
+
+TileKey = Tuple[int, int, int]
+
+
+class CachedTile(NamedTuple):
+    data: bytes
+    bounds: Bounds  # Tile bounds including the render buffer
+    region_ids: FrozenSet[str]
+    expires_at: float
+
+
+class TileCache:
+    """LRU of (z, x, y) -> encoded tile, invalidated by change events"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+        self.generation = 0  # Bumped on every change event
+        self._entries: "OrderedDict[TileKey, CachedTile]" = OrderedDict()
+
+    def get(self, key: TileKey) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at < time.monotonic():
+            self.misses += 1
+            self._entries.pop(key, None)
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry.data
+
+    def put(self, key: TileKey, data: bytes, bounds: Bounds, region_ids, generation: int):
+        """
+        Store a rendered tile. `generation` is the value read before rendering;
+        if a change arrived meanwhile the tile may already be stale and is
+        not stored.
+        """
+        if generation != self.generation:
+            return
+        self._entries[key] = CachedTile(
+            data, bounds, frozenset(region_ids), time.monotonic() + self.ttl
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def on_change(self, event: ChangeEvent):
+        """Drop every tile the change is visible in"""
+        self.generation += 1
+        stale = [
+            key
+            for key, entry in self._entries.items()
+            if (event.region_id and event.region_id in entry.region_ids)
+            or (event.bounds and _intersects(event.bounds, entry.bounds))
+        ]
+        for key in stale:
+            del self._entries[key]
+        self.invalidated += len(stale)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "bytes": sum(len(entry.data) for entry in self._entries.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "invalidated": self.invalidated,
+        }
+
+
+def _intersects(a: Bounds, b: Bounds) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+tile_cache = TileCache(TILE_CACHE_SIZE, TILE_CACHE_TTL_SECONDS)
+change_hub.subscribe(tile_cache.on_change)
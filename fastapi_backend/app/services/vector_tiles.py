@@ -0,0 +1,151 @@
+"""
+Vector Tile Rendering
+
+Encodes regions (polygons with their scores) and incidents (points) into
+Mapbox Vector Tiles. Features are read with indexed $geoIntersects queries
+on the tile bounds, so a tile costs the same however many incidents exist
+outside it.
+"""
+
+from datetime import datetime
+from typing import List, Set, Tuple
+import mapbox_vector_tile
+import shapely
+
+from app.models.incident_model import Incident
+from app.models.region_model import Region
+from app.services.change_events import Bounds
+from app.utils.geometry import bbox_geojson, parse_geometry, zoom_bucket
+from app.utils.tiles import MAX_LATITUDE, tile_bounds_lonlat, tile_bounds_mercator, to_mercator
+
+TILE_EXTENT = 4096
+TILE_BUFFER = 64  # In tile units; features are clipped this far outside the tile
+INCIDENT_MIN_ZOOM = 10  # Below this only regions are drawn
+MAX_TILE_INCIDENTS = 5000
+
+INCIDENT_TILE_FIELDS = {
+    "coordinates": 1,
+    "incident_type": 1,
+    "severity": 1,
+    "status": 1,
+    "alert_level": 1,
+    "region_id": 1,
+}
+
+
+def buffered_bounds(z: int, x: int, y: int) -> Tuple[Bounds, Bounds]:
+    """Tile bounds grown by TILE_BUFFER, as (lon/lat, mercator)"""
+    pad = TILE_BUFFER / TILE_EXTENT
+
+    min_lon, min_lat, max_lon, max_lat = tile_bounds_lonlat(z, x, y)
+    dx, dy = (max_lon - min_lon) * pad, (max_lat - min_lat) * pad
+    lonlat = (
+        max(min_lon - dx, -180.0),
+        max(min_lat - dy, -MAX_LATITUDE),
+        min(max_lon + dx, 180.0),
+        min(max_lat + dy, MAX_LATITUDE),
+    )
+
+    min_x, min_y, max_x, max_y = tile_bounds_mercator(z, x, y)
+    d = (max_x - min_x) * pad
+    return lonlat, (min_x - d, min_y - d, max_x + d, max_y + d)
+
+
+def _properties(values: dict) -> dict:
+    # MVT has no null
+    return {k: v for k, v in values.items() if v is not None}
+
+
+def _tile_geometry(geom, clip: Bounds):
+    if geom is None or geom.is_empty:
+        return None
+    clipped = shapely.clip_by_rect(to_mercator(geom), *clip)
+    return None if clipped.is_empty else clipped
+
+
+async def region_features(z: int, query: dict, clip: Bounds, now: datetime) -> Tuple[List[dict], Set[str]]:
+    bucket = zoom_bucket(z)
+    if bucket:
+        regions = await Region.find_simplified(query, bucket)
+    else:
+        regions = await Region.find(query).to_list()
+
+    features = []
+    region_ids = set()
+    for region in regions:
+        region_ids.add(str(region.id))
+        geom = _tile_geometry(parse_geometry(region.coordinates), clip)
+        if geom is None:
+            continue
+        features.append(
+            {
+                "geometry": geom,
+                "properties": _properties(
+                    {
+                        "id": str(region.id),
+                        "name": region.name,
+                        "incident_count": region.incident_count,
+                        "high_severity_count": region.high_severity_count,
+                        "average_severity": region.average_severity,
+                        "safety_score": round(region.current_safety_score(now), 2),
+                        "normalized_score": round(region.current_normalized_score(now), 2),
+                    }
+                ),
+            }
+        )
+    return features, region_ids
+
+
+async def incident_features(query: dict, clip: Bounds) -> List[dict]:
+    collection = Incident.get_pymongo_collection()
+    docs = await collection.find(query, INCIDENT_TILE_FIELDS).limit(MAX_TILE_INCIDENTS).to_list(None)
+
+    features = []
+    for doc in docs:
+        geom = parse_geometry(doc.get("coordinates") or {})
+        if geom is None or geom.is_empty:
+            continue
+        point = _tile_geometry(geom if geom.geom_type == "Point" else geom.representative_point(), clip)
+        if point is None:
+            continue
+        features.append(
+            {
+                "geometry": point,
+                "properties": _properties(
+                    {
+                        "id": str(doc["_id"]),
+                        "incident_type": doc.get("incident_type"),
+                        "severity": doc.get("severity"),
+                        "status": doc.get("status"),
+                        "alert_level": doc.get("alert_level"),
+                        "region_id": doc.get("region_id"),
+                    }
+                ),
+            }
+        )
+    return features
+
+
+async def render_tile(z: int, x: int, y: int) -> Tuple[bytes, Bounds, Set[str]]:
+    """
+    Encode one tile with a "regions" and (from INCIDENT_MIN_ZOOM) an
+    "incidents" layer. Returns the tile, the lon/lat bounds it covers and
+    the ids of the regions it shows.
+    """
+    lonlat, clip = buffered_bounds(z, x, y)
+    query = {"geometry": {"$geoIntersects": {"$geometry": bbox_geojson(*lonlat)}}}
+    now = datetime.utcnow()
+
+    features, region_ids = await region_features(z, query, clip, now)
+    layers = [{"name": "regions", "features": features}]
+    if z >= INCIDENT_MIN_ZOOM:
+        layers.append({"name": "incidents", "features": await incident_features(query, clip)})
+
+    tile_data = mapbox_vector_tile.encode(
+        layers,
+        default_options={
+            "quantize_bounds": tile_bounds_mercator(z, x, y),
+            "extents": TILE_EXTENT,
+        },
+    )
+    return tile_data, lonlat, region_ids
@@ -1,6 +1,11 @@
+import os
+from typing import Optional
 import bcrypt
 
-def hash_password(password: str) -> str:
+# bcrypt cost factor for new hashes (bcrypt's own default is 12)
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
     """Hash a password using bcrypt."""
     # Convert password to bytes and truncate if longer than 72 bytes
     password_bytes = password.encode('utf-8')
@@ -8,7 +13,7 @@ def hash_password(password: str) -> str:
         password_bytes = password_bytes[:72]
     
     # Generate salt and hash the password
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=rounds or BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode('utf-8')
 
@@ -20,3 +25,14 @@ def verify_password(password: str, hashed: str) -> bool:
 
     hashed_bytes = hashed.encode('utf-8')
     return bcrypt.checkpw(password_bytes, hashed_bytes)
+
+def hash_rounds(hashed: str) -> Optional[int]:
+    """Cost factor of a bcrypt hash ("$2b$12$..."), None if it isn't one."""
+    parts = hashed.split('$')
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+def needs_rehash(hashed: str) -> bool:
+    """Whether a hash was made with a different cost than BCRYPT_ROUNDS."""
+    return hash_rounds(hashed) != BCRYPT_ROUNDS
@@ -0,0 +1,50 @@
+"""
+ETag Utility
+
+Strong ETags for read endpoints, built from document revisions or a
+collection high-water mark (see app/services/revisions.py).
+
+Responses that include time-decayed scores are evaluated at the start of
+the current decay bucket rather than at "now", so the same revisions give
+byte-identical bodies for the whole bucket and the ETag stays strong.
+"""
+
+import os
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from fastapi import Response
+
+DECAY_BUCKET_SECONDS = int(os.getenv("DECAY_BUCKET_SECONDS", "3600"))
+
+# Bump when response schemas change so clients don't revalidate old bodies
+REPRESENTATION_VERSION = 1
+
+EPOCH = datetime(1970, 1, 1)  # Naive UTC, like the stored datetimes
+
+# Browsers keep the body but revalidate on every use
+CACHE_CONTROL = "no-cache"
+
+
+def decay_bucket(now: Optional[datetime] = None) -> Tuple[int, datetime]:
+    """Current decay bucket number and the time scores are evaluated at"""
+    now = now or datetime.utcnow()
+    bucket = int((now - EPOCH).total_seconds()) // DECAY_BUCKET_SECONDS
+    return bucket, EPOCH + timedelta(seconds=bucket * DECAY_BUCKET_SECONDS)
+
+
+def make_etag(*parts) -> str:
+    return '"' + "-".join(str(part) for part in (f"v{REPRESENTATION_VERSION}", *parts)) + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison against an If-None-Match header, as RFC 9110 requires for GET"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
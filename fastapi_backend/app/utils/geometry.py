@@ -0,0 +1,172 @@
+"""
+Geometry Utility
+
+Shared helpers for turning stored GeoJSON coordinates into shapely geometries
+and comparing them.
+"""
+
+import hashlib
+from typing import Optional, Tuple
+import orjson
+from shapely.geometry import shape, mapping
+from shapely.geometry.base import BaseGeometry
+
+POINT_BUFFER = 0.001  # ~111 meters, gives points an area to overlap with
+
+# Longitude/latitude ranges the 2dsphere index accepts
+LON_RANGE = (-180.0, 180.0)
+LAT_RANGE = (-90.0, 90.0)
+
+# Map zoom levels with a precomputed simplified geometry. A request is served
+# from the first bucket at or above its zoom; above the last one the full
+# coordinates are returned.
+SIMPLIFY_ZOOMS = (4, 6, 8, 10, 12, 14)
+SIMPLIFY_PIXELS = 0.5  # Tolerance in screen pixels
+TILE_SIZE = 256
+
+# Lets $geoIntersects take polygons larger than a hemisphere (whole-world viewports)
+STRICT_WINDING_CRS = {"type": "name", "properties": {"name": "urn:x-mongodb:crs:strictwinding:EPSG:4326"}}
+
+
+def parse_geometry(coords: dict) -> Optional[BaseGeometry]:
+    """Parse stored GeoJSON coordinates. Returns None if they can't be parsed."""
+    try:
+        # Some clients send a whole GeoJSON Feature instead of its geometry
+        if coords.get("type") == "Feature":
+            coords = coords["geometry"]
+        return shape(coords)
+    except Exception as e:
+        print(f"Error parsing geometry: {e}")
+        return None
+
+
+def build_footprint(coords: dict) -> Optional[BaseGeometry]:
+    """
+    Build the geometry used for overlap checks from GeoJSON coordinates.
+    Points are buffered so they cover an area.
+    Returns None if the coordinates can't be parsed, are invalid or fall
+    outside longitude/latitude ranges.
+    """
+    geom = parse_geometry(coords)
+    if geom is None or geom.is_empty or not geom.is_valid:
+        return None
+
+    if geom.geom_type == 'Point':
+        geom = geom.buffer(POINT_BUFFER)
+
+    if not in_lon_lat_range(geom):
+        return None
+
+    return geom
+
+
+def in_lon_lat_range(geom: BaseGeometry) -> bool:
+    min_lon, min_lat, max_lon, max_lat = geom.bounds
+    return (
+        LON_RANGE[0] <= min_lon and max_lon <= LON_RANGE[1]
+        and LAT_RANGE[0] <= min_lat and max_lat <= LAT_RANGE[1]
+    )
+
+
+def footprint_geojson(coords: dict) -> Optional[dict]:
+    """
+    Normalize GeoJSON coordinates into the footprint geometry stored in the
+    2dsphere-indexed `geometry` field, so database intersection queries agree
+    with overlap checks. Returns None if the coordinates are unusable.
+    """
+    geom = build_footprint(coords)
+    if geom is None:
+        return None
+    return to_geojson(geom)
+
+
+def geometry_digest(coords: dict) -> str:
+    """Digest of GeoJSON coordinates; changes only when the footprint does"""
+    return hashlib.blake2b(orjson.dumps(coords, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+
+
+def to_geojson(geom: BaseGeometry) -> dict:
+    """Convert a shapely geometry to a plain GeoJSON dict (lists, not tuples)"""
+    if geom.geom_type == 'GeometryCollection':
+        return {"type": geom.geom_type, "geometries": [to_geojson(g) for g in geom.geoms]}
+    geojson = mapping(geom)
+    return {"type": geojson["type"], "coordinates": _to_lists(geojson["coordinates"])}
+
+
+def _to_lists(value):
+    if isinstance(value, (list, tuple)):
+        return [_to_lists(v) for v in value]
+    return value
+
+
+def overlap_percentage(geom1: BaseGeometry, geom2: BaseGeometry) -> float:
+    """
+    Calculate overlap percentage between two footprints.
+    Returns 0-100, relative to the smaller of the two areas.
+    """
+    if not geom1.intersects(geom2):
+        return 0.0
+
+    smaller_area = min(geom1.area, geom2.area)
+    if smaller_area == 0:
+        return 0.0
+
+    intersection = geom1.intersection(geom2)
+    overlap_pct = (intersection.area / smaller_area) * 100
+    return min(overlap_pct, 100.0)
+
+
+def zoom_bucket(zoom: int) -> Optional[str]:
+    """Key of the simplified geometry for a zoom level, None for full precision"""
+    for bucket in SIMPLIFY_ZOOMS:
+        if zoom <= bucket:
+            return f"z{bucket}"
+    return None
+
+
+def simplify_tolerance(zoom: int) -> float:
+    """Degrees covered by SIMPLIFY_PIXELS at a zoom level (at the equator)"""
+    return 360.0 / (TILE_SIZE * 2 ** zoom) * SIMPLIFY_PIXELS
+
+
+def simplified_variants(coords: dict) -> dict:
+    """
+    Precompute the simplified GeoJSON of coordinates for every zoom bucket.
+    Geometries that can't be parsed are stored as-is.
+    """
+    geom = parse_geometry(coords)
+    if geom is None:
+        return {f"z{zoom}": coords for zoom in SIMPLIFY_ZOOMS}
+
+    variants = {}
+    for zoom in SIMPLIFY_ZOOMS:
+        simple = geom.simplify(simplify_tolerance(zoom), preserve_topology=True)
+        variants[f"z{zoom}"] = to_geojson(simple if not simple.is_empty else geom)
+    return variants
+
+
+def bbox_geojson(min_lon: float, min_lat: float, max_lon: float, max_lat: float) -> dict:
+    """Counter-clockwise GeoJSON polygon of a viewport, usable with $geoIntersects"""
+    return {
+        "type": "Polygon",
+        "coordinates": [[
+            [min_lon, min_lat],
+            [max_lon, min_lat],
+            [max_lon, max_lat],
+            [min_lon, max_lat],
+            [min_lon, min_lat],
+        ]],
+        "crs": STRICT_WINDING_CRS,
+    }
+
+
+def parse_bbox(bbox: str) -> Optional[Tuple[float, float, float, float]]:
+    """Parse "min_lon,min_lat,max_lon,max_lat". Returns None if it isn't a valid viewport."""
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(v) for v in bbox.split(","))
+    except ValueError:
+        return None
+
+    if not (-180 <= min_lon < max_lon <= 180 and -90 <= min_lat < max_lat <= 90):
+        return None
+    return min_lon, min_lat, max_lon, max_lat
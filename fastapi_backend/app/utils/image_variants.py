@@ -0,0 +1,52 @@
+"""
+Image Variants
+
+Renders the downscaled copies served in place of original photos. Runs in
+worker processes (see app/services/image_pipeline.py), so this module only
+depends on Pillow.
+"""
+
+import os
+from typing import Dict, Tuple
+from PIL import Image, ImageOps
+
+# Variant name -> longest side in pixels
+VARIANT_SIZES: Dict[str, int] = {"thumb": 320, "medium": 1280}
+VARIANT_FORMAT = "webp"
+VARIANT_QUALITY = 80
+
+
+def variant_filename(sha256: str, name: str) -> str:
+    """
+    Stored name of a variant. The size is part of the name, so changing
+    VARIANT_SIZES produces new files rather than stale immutable ones.
+    """
+    return f"{sha256}-{name}{VARIANT_SIZES[name]}.{VARIANT_FORMAT}"
+
+
+def render_variants(src_path: str, out_dir: str, sha256: str) -> Tuple[Dict[str, str], int]:
+    """
+    Write every variant of an image. Returns variant name -> file name and
+    the total bytes written.
+    """
+    with Image.open(src_path) as img:
+        img = ImageOps.exif_transpose(img)  # Phone photos are often stored rotated
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+
+        filenames = {}
+        written = 0
+        for name, size in VARIANT_SIZES.items():
+            variant = img.copy()
+            variant.thumbnail((size, size), Image.LANCZOS)  # Never upscales
+
+            filename = variant_filename(sha256, name)
+            path = os.path.join(out_dir, filename)
+            tmp_path = f"{path}.tmp"
+            variant.save(tmp_path, VARIANT_FORMAT, quality=VARIANT_QUALITY, method=4)
+            os.replace(tmp_path, path)
+
+            filenames[name] = filename
+            written += os.path.getsize(path)
+
+    return filenames, written
@@ -4,7 +4,7 @@ Incident Weight Calculation Utility
 This module calculates the weight/impact of incidents on region safety scores.
 """
 
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from datetime import datetime
 import math
 
@@ -12,6 +12,8 @@ import math
 ALPHA = 0.5 # Range for audit multiplier [1-alpha, 1+alpha]
 DECAY_RATE = 0.01 # Exponential decay rate per day
 MAX_SCORE_CEILING = 100.0 # For normalization
+SECONDS_PER_DAY = 86400.0
+SEVERITY_WEIGHTS = {"low": 1.0, "medium": 1.5, "high": 2.5, "critical": 4.0} # Initial weight by severity
 
 def calculate_auditor_credibility(verified_count: int, flagged_count: int) -> float:
     """
@@ -30,15 +32,100 @@ def calculate_audit_multiplier(s_env: float, c_a: float) -> float:
     adjustment = (s_env - 0.5) * 2 * ALPHA * c_a
     return 1.0 + adjustment
 
-def calculate_time_decay(created_at: datetime) -> float:
+def calculate_time_decay(created_at: datetime, now: Optional[datetime] = None) -> float:
     """
     Calculate time-decay factor D(age).
     D(age) = e^(-lambda * age_in_days)
+    Age is continuous (fractional days) so that decay factors compose:
+    D(t2 - c) = D(t1 - c) * decay_between(t1, t2).
     """
-    age = (datetime.utcnow() - created_at).days
+    now = now or datetime.utcnow()
+    age = (now - created_at).total_seconds() / SECONDS_PER_DAY
     if age < 0: age = 0
     return math.exp(-DECAY_RATE * age)
 
+def decay_between(start: datetime, end: datetime) -> float:
+    """
+    Factor that carries an already-decayed value from `start` to `end`.
+    e^(-lambda * (end - start) in days); above 1 if end is before start.
+    """
+    return math.exp(-DECAY_RATE * (end - start).total_seconds() / SECONDS_PER_DAY)
+
+def calculate_incident_contribution(incident, now: Optional[datetime] = None) -> float:
+    """
+    Current contribution of an incident.
+    contrib = initial_weight * effective_multiplier * D(age)
+    """
+    w_initial = getattr(incident, 'initial_weight', 1.0)
+    m_effective = getattr(incident, 'effective_multiplier', 1.0)
+    return w_initial * m_effective * calculate_time_decay(incident.created_at, now)
+
+def apply_incident_weights(incident, now: Optional[datetime] = None) -> None:
+    """
+    Recalculate an incident's weight fields in place (does not save).
+    contribution = initial_weight * effective_multiplier * time_decay_factor
+    incident_weight_stages is the same computation as an update pipeline.
+    """
+    # 1. Initial Weight: base weight boosted by severity
+    incident.initial_weight = SEVERITY_WEIGHTS.get(incident.severity, 1.0)
+
+    # 2. Effective Multiplier: average of audit multipliers
+    if not incident.audits:
+        incident.effective_multiplier = 1.0
+    else:
+        incident.effective_multiplier = sum(
+            a.multiplier for a in incident.audits
+        ) / len(incident.audits)
+
+    # 3. Time Decay
+    incident.time_decay_factor = calculate_time_decay(incident.created_at, now)
+
+    # 4. Final Contribution
+    incident.contribution_score = (
+        incident.initial_weight
+        * incident.effective_multiplier
+        * incident.time_decay_factor
+    )
+
+def incident_weight_stages(now: datetime) -> List[dict]:
+    """
+    Update-pipeline stages recomputing an incident's weight fields
+    server-side from its severity, audits and age, like apply_incident_weights.
+    """
+    age_days = {
+        "$max": [0, {"$divide": [{"$subtract": [now, "$created_at"]}, SECONDS_PER_DAY * 1000]}]
+    }
+    return [
+        {
+            "$set": {
+                "initial_weight": {
+                    "$switch": {
+                        "branches": [
+                            {"case": {"$eq": ["$severity", severity]}, "then": weight}
+                            for severity, weight in SEVERITY_WEIGHTS.items()
+                        ],
+                        "default": 1.0,
+                    }
+                },
+                "effective_multiplier": {
+                    "$cond": [
+                        {"$gt": [{"$size": {"$ifNull": ["$audits", []]}}, 0]},
+                        {"$avg": "$audits.multiplier"},
+                        1.0,
+                    ]
+                },
+                "time_decay_factor": {"$exp": {"$multiply": [-DECAY_RATE, age_days]}},
+            }
+        },
+        {
+            "$set": {
+                "contribution_score": {
+                    "$multiply": ["$initial_weight", "$effective_multiplier", "$time_decay_factor"]
+                }
+            }
+        },
+    ]
+
 def calculate_region_score(incidents: List, cluster_factor: float) -> Tuple[float, float]:
     """
     Calculate region raw score and normalized score.
@@ -66,8 +153,27 @@ def calculate_region_score(incidents: List, cluster_factor: float) -> Tuple[floa
         
     r_raw = cluster_factor * total_contribution
     
-    # Normalize (0-100)
-    # Using a ceiling approach
-    r_norm = min((r_raw / MAX_SCORE_CEILING) * 100.0, 100.0)
-    
-    return r_raw, r_norm
+    return r_raw, normalize_region_score(r_raw)
+
+def normalize_region_score(r_raw: float) -> float:
+    """
+    Normalize a raw region score to 0-100.
+    Using a ceiling approach.
+    """
+    return min((r_raw / MAX_SCORE_CEILING) * 100.0, 100.0)
+
+def region_scores_at(
+    cluster_factor: float,
+    contribution_sum: float,
+    reference_time: datetime,
+    incident_count: int,
+    now: datetime,
+) -> Tuple[float, float, float]:
+    """
+    (raw, normalized, safety) scores of a region at `now` from its stored
+    contribution sum, which is decayed as of reference_time.
+    """
+    r_raw = cluster_factor * contribution_sum * decay_between(reference_time, now)
+    r_norm = normalize_region_score(r_raw)
+    safety = max(0.0, 10.0 - r_norm / 10.0) if incident_count else 10.0
+    return r_raw, r_norm, safety
@@ -0,0 +1,38 @@
+"""
+Pagination Utility
+
+Opaque continuation tokens for keyset pagination on (created_at, _id),
+newest first.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from bson import ObjectId
+
+
+def encode_cursor(created_at: datetime, doc_id: ObjectId) -> str:
+    """Encode the sort key of the last document on a page"""
+    payload = json.dumps({"t": created_at.isoformat(), "id": str(doc_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[datetime, ObjectId]]:
+    """Decode a token from encode_cursor. Returns None if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["t"]), ObjectId(payload["id"])
+    except Exception:
+        return None
+
+
+def after_cursor(created_at: datetime, doc_id: ObjectId) -> dict:
+    """Query condition for documents that sort after the cursor (created_at desc, _id desc)"""
+    return {
+        "$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": doc_id}},
+        ]
+    }
@@ -0,0 +1,61 @@
+"""
+Vectorized Scoring Engine
+
+NumPy versions of the incident weight and region score formulas in
+app/utils/incident_weight.py, for rescoring the whole database at once
+(see app/scripts/rescore.py). Uses the same configuration constants.
+"""
+
+from typing import Tuple
+import numpy as np
+
+from app.utils.incident_weight import (
+    DECAY_RATE,
+    MAX_SCORE_CEILING,
+    SECONDS_PER_DAY,
+    SEVERITY_WEIGHTS,
+)
+
+
+def initial_weights(severities: np.ndarray) -> np.ndarray:
+    """W_initial per incident from an array of severity strings"""
+    values, inverse = np.unique(severities.astype(str), return_inverse=True)
+    table = np.array([SEVERITY_WEIGHTS.get(v, 1.0) for v in values], dtype=np.float64)
+    return table[inverse] if len(values) else np.zeros(0)
+
+
+def effective_multipliers(audit_counts: np.ndarray, multipliers: np.ndarray) -> np.ndarray:
+    """
+    M_effective per incident: average of its audit multipliers, 1.0 if none.
+    multipliers holds every incident's audit multipliers back to back,
+    audit_counts[i] of them for incident i.
+    """
+    n = len(audit_counts)
+    owner = np.repeat(np.arange(n), audit_counts)
+    sums = np.bincount(owner, weights=multipliers, minlength=n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(audit_counts > 0, sums / audit_counts, 1.0)
+
+
+def time_decay(created_at_s: np.ndarray, now_s: float) -> np.ndarray:
+    """D(age) = e^(-lambda * age_in_days), created_at/now as epoch seconds"""
+    age_days = np.maximum((now_s - created_at_s) / SECONDS_PER_DAY, 0.0)
+    return np.exp(-DECAY_RATE * age_days)
+
+
+def region_scores(
+    region_codes: np.ndarray,
+    contributions: np.ndarray,
+    cluster_factors: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Grouped per-region reduction.
+    region_codes[i] is the index into cluster_factors of incident i's region.
+    Returns (incident_count, contribution_sum, R_raw, R_norm) per region.
+    """
+    n_regions = len(cluster_factors)
+    counts = np.bincount(region_codes, minlength=n_regions)
+    contribution_sum = np.bincount(region_codes, weights=contributions, minlength=n_regions)
+    r_raw = cluster_factors * contribution_sum
+    r_norm = np.minimum(r_raw / MAX_SCORE_CEILING * 100.0, 100.0)
+    return counts, contribution_sum, r_raw, r_norm
@@ -0,0 +1,333 @@
+"""
+Serializer Utility
+
+Fast path from raw MongoDB documents to JSON response bytes for the read
+endpoints. The payloads have the same shape as IncidentResponse and
+RegionResponse but skip building and re-validating pydantic models;
+orjson encodes the plain dicts directly.
+
+List endpoints also accept sparse fieldsets (`fields=` and `include=`):
+INCIDENT_FIELDS and REGION_FIELDS map each response field to the stored
+fields it reads and a function computing it, so both the Mongo projection
+and the serialized output only cover what the client asked for.
+"""
+
+from datetime import datetime
+from typing import Callable, Dict, FrozenSet, Optional, Tuple
+import orjson
+from fastapi import Response
+
+from app.models.incident_model import IncidentSummary
+from app.utils.etag import CACHE_CONTROL
+from app.utils.incident_weight import calculate_time_decay, region_scores_at
+
+# Stored fields the incident payload reads
+INCIDENT_PROJECTION = {(field.alias or name): 1 for name, field in IncidentSummary.model_fields.items()}
+
+# Region fields the payload doesn't read
+REGION_EXCLUDED_FIELDS = {"geometry": 0, "geometry_hash": 0, "simplified": 0}
+
+# Response field -> (stored fields it reads, getter(doc, now))
+FieldTable = Dict[str, Tuple[Tuple[str, ...], Callable[[dict, datetime], object]]]
+
+
+def incident_payload(
+    doc: dict, now: Optional[datetime] = None, fields: Optional[FrozenSet[str]] = None
+) -> dict:
+    """
+    IncidentResponse-shaped dict from a stored incident document.
+    fields (from parse_fieldset) limits it to those response fields.
+    """
+    if fields is not None:
+        return select_fields(INCIDENT_FIELDS, doc, now or datetime.utcnow(), fields)
+
+    initial_weight = float(doc.get("initial_weight", 1.0))
+    effective_multiplier = float(doc.get("effective_multiplier", 1.0))
+    # Decay is evaluated at read time so it never goes stale between writes
+    time_decay_factor = calculate_time_decay(doc["created_at"], now)
+    contribution_score = initial_weight * effective_multiplier * time_decay_factor
+
+    return {
+        "id": str(doc["_id"]),
+        "user_id": doc["user_id"],
+        "user_email": doc["user_email"],
+        "area_type": doc["area_type"],
+        "coordinates": doc["coordinates"],
+        "incident_type": doc["incident_type"],
+        "description": doc["description"],
+        "severity": doc.get("severity", "medium"),
+        "status": doc.get("status", "pending"),
+        "images": doc.get("images") or [],
+        "image_variants": doc.get("image_variants") or [],
+        "comments": incident_comments(doc),
+        "alert_level": doc.get("alert_level", "normal"),
+        "region_id": doc.get("region_id"),
+        "created_at": doc["created_at"],
+        "updated_at": doc["updated_at"],
+        "initial_weight": initial_weight,
+        "effective_multiplier": effective_multiplier,
+        "time_decay_factor": time_decay_factor,
+        "contribution_score": contribution_score,
+        "audits": incident_audits(doc),
+        # Legacy fields
+        "comment_count": doc.get("comment_count", 0),
+        "has_sufficient_description": doc.get("has_sufficient_description", False),
+        "image_count": doc.get("image_count", 0),
+        "engagement_score": float(doc.get("engagement_score", 0.0)),
+        "base_weight": initial_weight,
+        "final_weight": contribution_score,
+        "admin_validated": doc.get("admin_validated", False),
+        "admin_validated_by": doc.get("admin_validated_by"),
+        "ngo_validated": doc.get("ngo_validated", False),
+        "ngo_validated_by": doc.get("ngo_validated_by"),
+        "validation_score": float(doc.get("validation_score", 0.0)),
+        "validation_notes": doc.get("validation_notes"),
+    }
+
+
+def incident_comments(doc: dict) -> list:
+    incident_id = str(doc["_id"])
+    return [
+        {
+            # Very old comments were stored without an id
+            "id": c.get("id") or f"{incident_id}-{i}",
+            "user_id": c["user_id"],
+            "user_email": c["user_email"],
+            "text": c["text"],
+            "created_at": c["created_at"],
+        }
+        for i, c in enumerate(doc.get("comments") or [])
+    ]
+
+
+def incident_audits(doc: dict) -> list:
+    return [
+        {
+            "auditor_id": a["auditor_id"],
+            "auditor_email": a["auditor_email"],
+            "s_env": float(a["s_env"]),
+            "notes": a.get("notes"),
+            "created_at": a["created_at"],
+            "multiplier": float(a.get("multiplier", 1.0)),
+        }
+        for a in doc.get("audits") or []
+    ]
+
+
+def incident_contribution(doc: dict, now: datetime) -> float:
+    return (
+        float(doc.get("initial_weight", 1.0))
+        * float(doc.get("effective_multiplier", 1.0))
+        * calculate_time_decay(doc["created_at"], now)
+    )
+
+
+def region_payload(
+    doc: dict, now: Optional[datetime] = None, fields: Optional[FrozenSet[str]] = None
+) -> dict:
+    """
+    RegionResponse-shaped dict from a stored region document.
+    fields (from parse_fieldset) limits it to those response fields.
+    """
+    now = now or datetime.utcnow()
+    if fields is not None:
+        return select_fields(REGION_FIELDS, doc, now, fields)
+
+    cluster_factor = float(doc.get("cluster_factor", 1.0))
+    incident_count = doc.get("incident_count", 0)
+    raw_score, normalized_score, safety_score = region_scores(doc, now)
+
+    return {
+        "id": str(doc["_id"]),
+        "name": doc.get("name", "Unnamed Region"),
+        "area_type": doc["area_type"],
+        "coordinates": doc["coordinates"],
+        "incident_count": incident_count,
+        "safety_score": safety_score,
+        "average_severity": doc.get("average_severity"),
+        "high_severity_count": doc.get("high_severity_count", 0),
+        "incident_types": doc.get("incident_types") or {},
+        "comments": region_comments(doc),
+        "comment_count": doc.get("comment_count", 0),
+        "created_at": doc["created_at"],
+        "updated_at": doc["updated_at"],
+        "cluster_factor": cluster_factor,
+        "raw_score": raw_score,
+        "normalized_score": normalized_score,
+        # Legacy fields
+        "incident_weighted_score": float(doc.get("incident_weighted_score", 10.0)),
+        "validation_weighted_score": float(doc.get("validation_weighted_score", 10.0)),
+        "total_incident_weight": float(doc.get("total_incident_weight", 0.0)),
+        "total_validation_weight": float(doc.get("total_validation_weight", 0.0)),
+        "validated_incident_count": doc.get("validated_incident_count", 0),
+        "incident_weightage_percent": float(doc.get("incident_weightage_percent", 30.0)),
+        "validation_weightage_percent": float(doc.get("validation_weightage_percent", 70.0)),
+    }
+
+
+def region_comments(doc: dict) -> list:
+    return [
+        {
+            "id": c["id"],
+            "user_id": c["user_id"],
+            "user_email": c["user_email"],
+            "text": c["text"],
+            "created_at": c["created_at"],
+        }
+        for c in doc.get("comments") or []
+    ]
+
+
+def comment_payload(doc: dict) -> dict:
+    """CommentResponse-shaped dict from a stored comments-collection document"""
+    return {
+        "id": str(doc["_id"]),
+        "user_id": doc["user_id"],
+        "user_email": doc["user_email"],
+        "text": doc["text"],
+        "created_at": doc["created_at"],
+    }
+
+
+def region_scores(doc: dict, now: datetime) -> Tuple[float, float, float]:
+    """(raw, normalized, safety) scores of a stored region at `now`"""
+    # Scores are stored as of score_reference_time and decayed to now here
+    return region_scores_at(
+        float(doc.get("cluster_factor", 1.0)),
+        doc.get("contribution_sum", 0.0),
+        doc.get("score_reference_time") or now,
+        doc.get("incident_count", 0),
+        now,
+    )
+
+
+def _stored(name: str, default=None, cast=None):
+    """Table entry for a response field read straight from the stored field"""
+    if cast is None:
+        return (name,), lambda doc, now: doc.get(name, default)
+    return (name,), lambda doc, now: cast(doc.get(name, default))
+
+
+_WEIGHT_FIELDS = ("initial_weight", "effective_multiplier", "created_at")
+_SCORE_FIELDS = ("cluster_factor", "contribution_sum", "score_reference_time", "incident_count")
+
+INCIDENT_FIELDS: FieldTable = {
+    "id": (("_id",), lambda doc, now: str(doc["_id"])),
+    "user_id": _stored("user_id"),
+    "user_email": _stored("user_email"),
+    "area_type": _stored("area_type"),
+    "coordinates": _stored("coordinates"),
+    "incident_type": _stored("incident_type"),
+    "description": _stored("description"),
+    "severity": _stored("severity", "medium"),
+    "status": _stored("status", "pending"),
+    "images": (("images",), lambda doc, now: doc.get("images") or []),
+    "image_variants": (("image_variants",), lambda doc, now: doc.get("image_variants") or []),
+    "comments": (("comments",), lambda doc, now: incident_comments(doc)),
+    "alert_level": _stored("alert_level", "normal"),
+    "region_id": _stored("region_id"),
+    "created_at": _stored("created_at"),
+    "updated_at": _stored("updated_at"),
+    "initial_weight": _stored("initial_weight", 1.0, float),
+    "effective_multiplier": _stored("effective_multiplier", 1.0, float),
+    "time_decay_factor": (("created_at",), lambda doc, now: calculate_time_decay(doc["created_at"], now)),
+    "contribution_score": (_WEIGHT_FIELDS, incident_contribution),
+    "audits": (("audits",), lambda doc, now: incident_audits(doc)),
+    # Legacy fields
+    "comment_count": _stored("comment_count", 0),
+    "has_sufficient_description": _stored("has_sufficient_description", False),
+    "image_count": _stored("image_count", 0),
+    "engagement_score": _stored("engagement_score", 0.0, float),
+    "base_weight": _stored("initial_weight", 1.0, float),
+    "final_weight": (_WEIGHT_FIELDS, incident_contribution),
+    "admin_validated": _stored("admin_validated", False),
+    "admin_validated_by": _stored("admin_validated_by"),
+    "ngo_validated": _stored("ngo_validated", False),
+    "ngo_validated_by": _stored("ngo_validated_by"),
+    "validation_score": _stored("validation_score", 0.0, float),
+    "validation_notes": _stored("validation_notes"),
+}
+INCIDENT_EMBEDS = ("comments", "audits")
+
+REGION_FIELDS: FieldTable = {
+    "id": (("_id",), lambda doc, now: str(doc["_id"])),
+    "name": _stored("name", "Unnamed Region"),
+    "area_type": _stored("area_type"),
+    "coordinates": _stored("coordinates"),
+    "incident_count": _stored("incident_count", 0),
+    "safety_score": (_SCORE_FIELDS, lambda doc, now: region_scores(doc, now)[2]),
+    "average_severity": _stored("average_severity"),
+    "high_severity_count": _stored("high_severity_count", 0),
+    "incident_types": (("incident_types",), lambda doc, now: doc.get("incident_types") or {}),
+    "comments": (("comments",), lambda doc, now: region_comments(doc)),
+    "comment_count": _stored("comment_count", 0),
+    "created_at": _stored("created_at"),
+    "updated_at": _stored("updated_at"),
+    "cluster_factor": _stored("cluster_factor", 1.0, float),
+    "raw_score": (_SCORE_FIELDS, lambda doc, now: region_scores(doc, now)[0]),
+    "normalized_score": (_SCORE_FIELDS, lambda doc, now: region_scores(doc, now)[1]),
+    # Legacy fields
+    "incident_weighted_score": _stored("incident_weighted_score", 10.0, float),
+    "validation_weighted_score": _stored("validation_weighted_score", 10.0, float),
+    "total_incident_weight": _stored("total_incident_weight", 0.0, float),
+    "total_validation_weight": _stored("total_validation_weight", 0.0, float),
+    "validated_incident_count": _stored("validated_incident_count", 0),
+    "incident_weightage_percent": _stored("incident_weightage_percent", 30.0, float),
+    "validation_weightage_percent": _stored("validation_weightage_percent", 70.0, float),
+}
+REGION_EMBEDS = ("comments",)
+
+
+def _split(value: str) -> set:
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+def parse_fieldset(
+    fields: Optional[str], include: Optional[str], table: FieldTable, embeds: Tuple[str, ...]
+) -> Optional[FrozenSet[str]]:
+    """
+    Response fields selected by the `fields` and `include` query parameters,
+    or None for the full payload. `fields` picks response fields (default:
+    every non-embedded one); `include` picks the embedded arrays (default:
+    all of them, or those named in `fields`). `id` is always returned.
+    Raises ValueError on unknown names.
+    """
+    if fields is None and include is None:
+        return None
+
+    selected = set(table) - set(embeds) if fields is None else _split(fields)
+    unknown = selected - set(table)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    if include is not None:
+        included = _split(include)
+        unknown = included - set(embeds)
+        if unknown:
+            raise ValueError(f"include must be a subset of {', '.join(embeds)}")
+        selected = (selected - set(embeds)) | included
+    elif fields is None:
+        selected |= set(embeds)
+
+    selected.add("id")
+    return frozenset(selected)
+
+
+def fieldset_projection(table: FieldTable, fields: FrozenSet[str]) -> dict:
+    """Mongo inclusion projection for the stored fields a fieldset reads"""
+    return {stored: 1 for name in fields for stored in table[name][0]}
+
+
+def select_fields(table: FieldTable, doc: dict, now: datetime, fields: FrozenSet[str]) -> dict:
+    # Table order keeps the response field order stable
+    return {name: get(doc, now) for name, (_, get) in table.items() if name in fields}
+
+
+def json_response(payload, etag: Optional[str] = None) -> Response:
+    """
+    Already-encoded JSON response; FastAPI doesn't validate it again.
+    payload may also be JSON bytes, e.g. from the response cache.
+    """
+    content = payload if isinstance(payload, bytes) else orjson.dumps(payload)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL} if etag else None
+    return Response(content=content, media_type="application/json", headers=headers)
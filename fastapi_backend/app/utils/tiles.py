@@ -0,0 +1,50 @@
+"""
+Tile Utility
+
+Web Mercator (EPSG:3857) math for XYZ map tiles.
+"""
+
+import math
+from typing import Tuple
+import numpy as np
+import shapely
+from shapely.geometry.base import BaseGeometry
+
+EARTH_RADIUS = 6378137.0
+ORIGIN_SHIFT = math.pi * EARTH_RADIUS  # Half the width of the world in meters
+MAX_LATITUDE = 85.0511287798  # Web Mercator cuts off here
+
+
+def is_valid_tile(z: int, x: int, y: int) -> bool:
+    return 0 <= z and 0 <= x < 2 ** z and 0 <= y < 2 ** z
+
+
+def tile_bounds_lonlat(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """(min_lon, min_lat, max_lon, max_lat) of a tile"""
+    n = 2 ** z
+    min_lon = x / n * 360.0 - 180.0
+    max_lon = (x + 1) / n * 360.0 - 180.0
+    max_lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+    min_lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * (y + 1) / n))))
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def tile_bounds_mercator(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """(min_x, min_y, max_x, max_y) of a tile in meters"""
+    size = 2 * ORIGIN_SHIFT / 2 ** z
+    min_x = -ORIGIN_SHIFT + x * size
+    max_y = ORIGIN_SHIFT - y * size
+    return min_x, max_y - size, min_x + size, max_y
+
+
+def to_mercator(geom: BaseGeometry) -> BaseGeometry:
+    """Project a lon/lat geometry to Web Mercator meters"""
+
+    def project(coords: np.ndarray) -> np.ndarray:
+        lon = coords[:, 0]
+        lat = np.clip(coords[:, 1], -MAX_LATITUDE, MAX_LATITUDE)
+        x = np.radians(lon) * EARTH_RADIUS
+        y = np.log(np.tan(np.pi / 4 + np.radians(lat) / 2)) * EARTH_RADIUS
+        return np.column_stack([x, y])
+
+    return shapely.transform(geom, project)
@@ -14,6 +14,9 @@ export default function IncidentDetailsPanel({
   const [submittingComment, setSubmittingComment] = useState(false);
   const [showAuditForm, setShowAuditForm] = useState(false);
   const [userRole, setUserRole] = useState(null);
+  const [comments, setComments] = useState([]);
+  const [commentsCursor, setCommentsCursor] = useState(null);
+  const [loadingComments, setLoadingComments] = useState(false);
 
   useEffect(() => {
     const role = authAPI.getUserRole();
@@ -29,6 +32,41 @@ export default function IncidentDetailsPanel({
     }
   }, [incidents]);
 
+  // The incident only carries its latest comments; the thread is paginated
+  useEffect(() => {
+    if (!activeIncident) {
+      setComments([]);
+      setCommentsCursor(null);
+      return;
+    }
+    let cancelled = false;
+    incidentAPI
+      .getComments(activeIncident.id)
+      .then((page) => {
+        if (cancelled) return;
+        setComments(page.comments);
+        setCommentsCursor(page.next_cursor);
+      })
+      .catch((err) => console.error(err));
+    return () => {
+      cancelled = true;
+    };
+  }, [activeIncident]);
+
+  const loadOlderComments = async () => {
+    if (!commentsCursor || loadingComments) return;
+    setLoadingComments(true);
+    try {
+      const page = await incidentAPI.getComments(activeIncident.id, { cursor: commentsCursor });
+      setComments((prev) => [...prev, ...page.comments]);
+      setCommentsCursor(page.next_cursor);
+    } catch (err) {
+      console.error(err);
+    } finally {
+      setLoadingComments(false);
+    }
+  };
+
   const handleIncidentClick = (incident) => {
     setActiveIncident(incident);
   };
@@ -284,20 +322,28 @@ export default function IncidentDetailsPanel({
                 </h3>
                 <div className="flex gap-2 overflow-x-auto pb-4 snap-x">
                   {activeIncident.images.map((imgUrl, index) => {
-                    const fullUrl = imgUrl.startsWith("http")
-                      ? imgUrl
-                      : `${
-                          import.meta.env.VITE_API_URL?.replace("/api", "") ||
-                          "http://localhost:8000"
-                        }${imgUrl}`;
+                    const toFullUrl = (url) =>
+                      url.startsWith("http")
+                        ? url
+                        : `${
+                            import.meta.env.VITE_API_URL?.replace("/api", "") ||
+                            "http://localhost:8000"
+                          }${url}`;
+                    // Downscaled copies, once the server has rendered them
+                    const variants = (activeIncident.image_variants || []).find(
+                      (v) => v.original === imgUrl
+                    );
+                    const fullUrl = toFullUrl(variants ? variants.medium : imgUrl);
+                    const previewUrl = toFullUrl(variants ? variants.thumb : imgUrl);
                     return (
                       <div
                         key={index}
                         className="flex-shrink-0 relative w-32 h-32 rounded-lg overflow-hidden border border-gray-200 snap-start"
                       >
                         <img
-                          src={fullUrl}
+                          src={previewUrl}
                           alt="Evidence"
+                          loading="lazy"
                           className="w-full h-full object-cover"
                           onClick={() => window.open(fullUrl, "_blank")}
                         />
@@ -384,10 +430,10 @@ export default function IncidentDetailsPanel({
             {/* Comments Section */}
             <div className="mt-8 pt-6 border-t border-gray-200">
               <h3 className="text-lg font-bold text-gray-900 mb-4 flex items-center gap-2">
-                Discussion ({activeIncident.comments?.length || 0})
+                Discussion ({activeIncident.comment_count || 0})
               </h3>
               <div className="space-y-3 mb-5 max-h-72 overflow-y-auto">
-                {activeIncident.comments?.map((comment) => (
+                {comments.map((comment) => (
                   <div
                     key={comment.id}
                     className="bg-gray-50 rounded-lg p-4 border border-gray-100"
@@ -403,7 +449,16 @@ export default function IncidentDetailsPanel({
                     <p className="text-sm text-gray-900">{comment.text}</p>
                   </div>
                 ))}
-                {!activeIncident.comments?.length && (
+                {commentsCursor && (
+                  <button
+                    onClick={loadOlderComments}
+                    disabled={loadingComments}
+                    className="w-full text-sm text-blue-600 hover:underline disabled:opacity-50"
+                  >
+                    {loadingComments ? "Loading..." : "Load older comments"}
+                  </button>
+                )}
+                {!comments.length && (
                   <div className="text-center py-4 text-gray-500 italic">
                     No comments
                   </div>
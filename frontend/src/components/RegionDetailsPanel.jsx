@@ -12,16 +12,21 @@ export default function RegionDetailsPanel({ regionId, onClose }) {
   const [newComment, setNewComment] = useState('');
   const [newIncidentComment, setNewIncidentComment] = useState('');
   const [submittingComment, setSubmittingComment] = useState(false);
+  const [regionComments, setRegionComments] = useState([]);
+  const [regionCommentsCursor, setRegionCommentsCursor] = useState(null);
 
   const loadRegion = useCallback(async () => {
     try {
       setLoading(true);
-      const [regionData, incidentsData] = await Promise.all([
+      const [regionData, incidentsData, commentsPage] = await Promise.all([
         regionAPI.getById(regionId),
-        regionAPI.getIncidents(regionId)
+        regionAPI.getIncidents(regionId),
+        regionAPI.getComments(regionId)
       ]);
       setRegion(regionData);
       setIncidents(incidentsData.incidents || []);
+      setRegionComments(commentsPage.comments);
+      setRegionCommentsCursor(commentsPage.next_cursor);
     } catch (err) {
       setError(err.message);
     } finally {
@@ -59,6 +64,9 @@ export default function RegionDetailsPanel({ regionId, onClose }) {
       const updatedRegion = await regionAPI.addComment(regionId, newComment);
       setRegion(updatedRegion);
       setNewComment('');
+      const commentsPage = await regionAPI.getComments(regionId);
+      setRegionComments(commentsPage.comments);
+      setRegionCommentsCursor(commentsPage.next_cursor);
     } catch (err) {
       alert('Failed to add comment: ' + err.message);
     } finally {
@@ -66,6 +74,17 @@ export default function RegionDetailsPanel({ regionId, onClose }) {
     }
   };
 
+  const loadOlderRegionComments = async () => {
+    if (!regionCommentsCursor) return;
+    try {
+      const commentsPage = await regionAPI.getComments(regionId, { cursor: regionCommentsCursor });
+      setRegionComments((prev) => [...prev, ...commentsPage.comments]);
+      setRegionCommentsCursor(commentsPage.next_cursor);
+    } catch (err) {
+      alert('Failed to load comments: ' + err.message);
+    }
+  };
+
   const handleAddIncidentComment = async (e, incidentId) => {
     e.preventDefault();
     if (!newIncidentComment.trim() || submittingComment) return;
@@ -220,14 +239,18 @@ export default function RegionDetailsPanel({ regionId, onClose }) {
                     <div className="bg-gray-50 p-4 rounded-xl border border-gray-200">
                       <h3 className="text-sm font-semibold text-gray-700 mb-3">Evidence Photos</h3>
                       <div className="grid grid-cols-2 gap-3">
-                        {incident.images.map((img, idx) => (
-                          <img
-                            key={idx}
-                            src={`http://localhost:8000${img}`}
-                            alt={`Evidence ${idx + 1}`}
-                            className="w-full h-32 object-cover rounded-lg border border-gray-200"
-                          />
-                        ))}
+                        {incident.images.map((img, idx) => {
+                          const variants = (incident.image_variants || []).find((v) => v.original === img);
+                          return (
+                            <img
+                              key={idx}
+                              src={`http://localhost:8000${variants ? variants.thumb : img}`}
+                              alt={`Evidence ${idx + 1}`}
+                              loading="lazy"
+                              className="w-full h-32 object-cover rounded-lg border border-gray-200"
+                            />
+                          );
+                        })}
                       </div>
                     </div>
                   )}
@@ -235,7 +258,7 @@ export default function RegionDetailsPanel({ regionId, onClose }) {
                   {/* Discussion Section */}
                   <div className="bg-gray-50 p-4 rounded-xl border border-gray-200">
                     <h3 className="text-sm font-semibold text-gray-900 mb-3">
-                      Discussion ({incident.comments?.length || 0})
+                      Discussion ({incident.comment_count || 0})
                     </h3>
                     
                     {/* Comments List */}
@@ -374,7 +397,7 @@ export default function RegionDetailsPanel({ regionId, onClose }) {
                     : 'border-transparent text-gray-500 hover:text-gray-700'
                 }`}
               >
-                Discussion ({region.comments?.length || 0})
+                Discussion ({region.comment_count || 0})
               </button>
             </div>
 
@@ -427,7 +450,7 @@ export default function RegionDetailsPanel({ regionId, onClose }) {
                             <svg className="w-3.5 h-3.5" fill="none" stroke="currentColor" viewBox="0 0 24 24">
                               <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M8 12h.01M12 12h.01M16 12h.01M21 12c0 4.418-4.03 8-9 8a9.863 9.863 0 01-4.255-.949L3 20l1.395-3.72C3.512 15.042 3 13.574 3 12c0-4.418 4.03-8 9-8s9 3.582 9 8z" />
                             </svg>
-                            {incident.comments?.length || 0}
+                            {incident.comment_count || 0}
                           </span>
                         </div>
                       </div>
@@ -465,8 +488,8 @@ export default function RegionDetailsPanel({ regionId, onClose }) {
 
                 {/* Comments List */}
                 <div className="space-y-3">
-                  {region.comments && region.comments.length > 0 ? (
-                    region.comments.map((comment) => (
+                  {regionComments.length > 0 ? (
+                    regionComments.map((comment) => (
                       <div key={comment.id} className="bg-white border border-gray-200 rounded-lg p-4">
                         <div className="flex items-start justify-between mb-2">
                           <div className="flex items-center gap-2">
@@ -500,6 +523,14 @@ export default function RegionDetailsPanel({ regionId, onClose }) {
                       <p className="text-sm text-gray-500">No discussion yet. Start the conversation!</p>
                     </div>
                   )}
+                  {regionCommentsCursor && (
+                    <button
+                      onClick={loadOlderRegionComments}
+                      className="w-full text-sm text-blue-600 hover:underline"
+                    >
+                      Load older comments
+                    </button>
+                  )}
                 </div>
               </div>
             )}
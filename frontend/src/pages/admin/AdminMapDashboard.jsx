@@ -2,7 +2,7 @@ import { useEffect, useRef, useState } from "react";
 import { useNavigate } from "react-router-dom";
 import mapboxgl from "mapbox-gl";
 import "mapbox-gl/dist/mapbox-gl.css";
-import { regionAPI, authAPI, incidentAPI } from "../../utils/api";
+import { regionAPI, authAPI, incidentAPI, changesAPI } from "../../utils/api";
 import IncidentDetailsPanel from "../../components/IncidentDetailsPanel";
 import {
   Shield,
@@ -249,6 +249,50 @@ function AdminMapDashboard() {
     };
   }, []);
 
+  // Refetch on writes instead of polling; bursts are coalesced into one reload
+  const selectedRegionRef = useRef(null);
+  useEffect(() => {
+    selectedRegionRef.current = selectedRegion;
+  }, [selectedRegion]);
+
+  useEffect(() => {
+    let timer = null;
+    let changedRegions = new Set();
+    let reloadAll = false;
+
+    const scheduleReload = () => {
+      if (timer) return;
+      timer = setTimeout(async () => {
+        const selected = selectedRegionRef.current;
+        const reloadSelected = selected && (reloadAll || changedRegions.has(selected.id));
+        timer = null;
+        changedRegions = new Set();
+        reloadAll = false;
+        await Promise.all([loadRegions(), loadIncidentStats()]);
+        if (reloadSelected) {
+          await loadRegionIncidents(selected.id);
+        }
+      }, 1000);
+    };
+
+    const unsubscribe = changesAPI.subscribe(
+      {},
+      (change) => {
+        if (change.region_id) changedRegions.add(change.region_id);
+        scheduleReload();
+      },
+      () => {
+        reloadAll = true;
+        scheduleReload();
+      }
+    );
+
+    return () => {
+      clearTimeout(timer);
+      unsubscribe();
+    };
+  }, []);
+
   const handleIncidentUpdate = async () => {
     if (selectedRegion) {
       await loadRegionIncidents(selectedRegion.id);
@@ -1,5 +1,5 @@
 import { useState, useEffect } from 'react';
-import { incidentAPI, authAPI } from '../../utils/api';
+import { incidentAPI, authAPI, changesAPI } from '../../utils/api';
 import { 
   CheckCircle, 
   Clock, 
@@ -34,6 +34,24 @@ export default function NGOValidations() {
     fetchValidations();
   }, []);
 
+  // Keep the queue current as incidents are reported and validated
+  useEffect(() => {
+    let timer = null;
+    const scheduleFetch = () => {
+      if (timer) return;
+      timer = setTimeout(() => {
+        timer = null;
+        fetchValidations();
+      }, 1000);
+    };
+
+    const unsubscribe = changesAPI.subscribe({ kind: 'incident' }, scheduleFetch, scheduleFetch);
+    return () => {
+      clearTimeout(timer);
+      unsubscribe();
+    };
+  }, []);
+
   useEffect(() => {
     applyFilters();
   }, [validations, searchTerm, statusFilter, timeFilter]);
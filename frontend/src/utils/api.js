@@ -137,16 +137,17 @@ export const incidentAPI = {
     return response.json();
   },
 
+  // Sends the file as the raw request body so the server can stream it to disk
   uploadImage: async (file) => {
     const token = authAPI.getToken();
-    const formData = new FormData();
-    formData.append("file", file);
     const response = await fetch(`${API_BASE_URL}/incidents/upload`, {
       method: 'POST',
       headers: {
         'Authorization': `Bearer ${token}`,
+        'Content-Type': file.type || 'application/octet-stream',
+        'X-Filename': encodeURIComponent(file.name || ''),
       },
-      body: formData,
+      body: file,
     });
 
     if (!response.ok) {
@@ -157,6 +158,18 @@ export const incidentAPI = {
     return response.json();
   },
 
+  getComments: async (id, params = {}) => {
+    const queryParams = new URLSearchParams(params).toString();
+    const url = queryParams ? `${API_BASE_URL}/incidents/${id}/comments?${queryParams}` : `${API_BASE_URL}/incidents/${id}/comments`;
+    const response = await fetch(url);
+    
+    if (!response.ok) {
+      throw new Error('Failed to fetch comments');
+    }
+    
+    return response.json();
+  },
+
   addComment: async (id, text) => {
     const token = authAPI.getToken();
     const response = await fetch(`${API_BASE_URL}/incidents/${id}/comments`, {
@@ -275,8 +288,11 @@ export const incidentAPI = {
 
 // Region APIs
 export const regionAPI = {
-  getAll: async () => {
-    const response = await fetch(`${API_BASE_URL}/incidents/regions`);
+  // params: { bbox: "minLon,minLat,maxLon,maxLat", zoom } to load only the visible regions
+  getAll: async (params = {}) => {
+    const queryParams = new URLSearchParams(params).toString();
+    const url = queryParams ? `${API_BASE_URL}/incidents/regions?${queryParams}` : `${API_BASE_URL}/incidents/regions`;
+    const response = await fetch(url);
     
     if (!response.ok) {
       throw new Error('Failed to fetch regions');
@@ -305,6 +321,18 @@ export const regionAPI = {
     return response.json();
   },
 
+  getComments: async (id, params = {}) => {
+    const queryParams = new URLSearchParams(params).toString();
+    const url = queryParams ? `${API_BASE_URL}/incidents/regions/${id}/comments?${queryParams}` : `${API_BASE_URL}/incidents/regions/${id}/comments`;
+    const response = await fetch(url);
+    
+    if (!response.ok) {
+      throw new Error('Failed to fetch region comments');
+    }
+    
+    return response.json();
+  },
+
   addComment: async (id, text) => {
     const token = authAPI.getToken();
     const response = await fetch(`${API_BASE_URL}/incidents/regions/${id}/comments`, {
@@ -324,3 +352,21 @@ export const regionAPI = {
     return response.json();
   },
 };
+
+// Change feed (server-sent events)
+export const changesAPI = {
+  // params: { bbox, region_id, kind } narrow the feed. onChange gets
+  // { kind, action, id, region_id, bounds, at }; onResync is called when
+  // events were missed and everything shown should be reloaded.
+  // Returns a function that closes the stream.
+  subscribe: (params = {}, onChange, onResync = () => {}) => {
+    const queryParams = new URLSearchParams(params).toString();
+    const url = queryParams ? `${API_BASE_URL}/events/?${queryParams}` : `${API_BASE_URL}/events/`;
+    const source = new EventSource(url);
+
+    source.addEventListener('change', (e) => onChange(JSON.parse(e.data)));
+    source.addEventListener('resync', () => onResync());
+
+    return () => source.close();
+  },
+};